@@ -0,0 +1,104 @@
+'''
+@desc    The CPU-versus-bytes benchmark of the compression codecs.
+@author  arthuchaut <arthuchaut@gmail.com>
+@version 0.1.0
+@date    2026-10-18
+@note    0.1.0 (2026-10-18): Writed the first drafts.
+
+Run from the repository root:
+
+    python -m benchmarks.compression_benchmark
+'''
+
+from typing import Any, Dict
+from time import perf_counter
+import json
+import random
+
+from middlewares.compressor_middleware import CODECS, DEFAULT_LEVELS
+
+
+def make_payload(records: int) -> bytes:
+    '''Build a JSON body looking like a list of business events.
+
+    Args:
+        records (int): The number of events in the body.
+
+    Returns:
+        bytes: The serialized body.
+    '''
+
+    rand: random.Random = random.Random(42)
+
+    return json.dumps(
+        [
+            {
+                'id': i,
+                'user': f'user-{rand.randint(0, 5000)}',
+                'action': rand.choice(['create', 'update', 'delete']),
+                'score': rand.random(),
+                'tags': rand.sample(['a', 'b', 'c', 'd', 'e', 'f'], 3),
+            }
+            for i in range(records)
+        ]
+    ).encode()
+
+
+def measure(codec: str, body: bytes, rounds: int) -> Dict[str, Any]:
+    '''Measure the ratio and the throughputs of a codec.
+
+    Args:
+        codec (str): The codec name.
+        body (bytes): The body to compress.
+        rounds (int): The number of compressions to average.
+
+    Returns:
+        Dict[str, Any]: The measures.
+    '''
+
+    compress, decompress = CODECS[codec]
+    level: int = DEFAULT_LEVELS[codec]
+
+    start: float = perf_counter()
+    for _ in range(rounds):
+        compressed: bytes = compress(body, level)
+    compress_time: float = (perf_counter() - start) / rounds
+
+    start = perf_counter()
+    for _ in range(rounds):
+        decompress(compressed)
+    decompress_time: float = (perf_counter() - start) / rounds
+
+    return {
+        'codec': codec,
+        'size': len(body),
+        'ratio': len(compressed) / len(body),
+        'compress_mbps': len(body) / compress_time / 1e6,
+        'decompress_mbps': len(body) / decompress_time / 1e6,
+    }
+
+
+def main() -> None:
+    '''Print the measures of each available codec by body size.
+    '''
+
+    print(
+        f'{"codec":<8}{"body":>10}{"ratio":>8}'
+        f'{"comp MB/s":>12}{"decomp MB/s":>13}'
+    )
+
+    for records in [10, 100, 1000, 10000]:
+        body: bytes = make_payload(records)
+        rounds: int = max(3, 2000 // records)
+
+        for codec in CODECS:
+            res: Dict[str, Any] = measure(codec, body, rounds)
+            print(
+                f'{res["codec"]:<8}{res["size"]:>10}{res["ratio"]:>8.3f}'
+                f'{res["compress_mbps"]:>12.1f}'
+                f'{res["decompress_mbps"]:>13.1f}'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,303 @@
+'''
+@desc    The claim-check middleware for Symbios, with its blob stores.
+@author  arthuchaut <arthuchaut@gmail.com>
+@version 0.1.0
+@date    2026-10-18
+@note    0.1.0 (2026-10-18): Writed the first drafts.
+'''
+
+from abc import ABC, abstractmethod
+from typing import Union
+from uuid import uuid4
+import asyncio
+import json
+import mmap
+import os
+import tempfile
+import time
+
+from symbios.middleware import MiddlewareABC
+from symbios.message import SendingMessage
+
+
+class BlobStoreABC(ABC):
+    '''The BlobStoreABC declaration.
+
+    Abstract class for defining a store of the claim-checked bodies.
+    '''
+
+    @abstractmethod
+    async def put(self, body: Union[bytes, memoryview]) -> str:
+        '''Store a body.
+
+        Args:
+            body (Union[bytes, memoryview]): The body to store.
+
+        Returns:
+            str: The key of the stored body.
+        '''
+
+        pass
+
+    @abstractmethod
+    async def get(self, key: str) -> Union[bytes, memoryview]:
+        '''Retrieve a stored body.
+
+        Args:
+            key (str): The key of the body.
+
+        Raises:
+            KeyError: If no body is stored with the key.
+
+        Returns:
+            Union[bytes, memoryview]: The stored body.
+        '''
+
+        pass
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        '''Delete a stored body, if it still exists.
+
+        Args:
+            key (str): The key of the body.
+        '''
+
+        pass
+
+
+class FileBlobStore(BlobStoreABC):
+    '''The FileBlobStore class declaration.
+
+    Store the bodies as files of a directory shared by co-located
+    services. Point it at /dev/shm to keep them in shared memory.
+    The bodies are retrieved as views of a read-only memory map, so
+    they are paged in lazily and never copied.
+
+    Attributes:
+        _DEFAULT_DIRECTORY (str): The default directory of the blobs.
+
+        directory (str): The directory of the blobs.
+    '''
+
+    _DEFAULT_DIRECTORY: str = os.path.join(
+        tempfile.gettempdir(), 'symbios-blobs'
+    )
+
+    def __init__(self, directory: str = _DEFAULT_DIRECTORY):
+        '''The FileBlobStore initializer.
+
+        Args:
+            directory (str): The directory of the blobs, created if it
+                doesn't exist. Default to _DEFAULT_DIRECTORY.
+        '''
+
+        self.directory: str = directory
+        os.makedirs(directory, exist_ok=True)
+
+    async def put(self, body: Union[bytes, memoryview]) -> str:
+        '''Write a body to a new file, out of the event loop.
+
+        The file is renamed once written, so it is never read partially.
+
+        Args:
+            body (Union[bytes, memoryview]): The body to store.
+
+        Returns:
+            str: The key of the stored body.
+        '''
+
+        key: str = uuid4().hex
+        await asyncio.get_event_loop().run_in_executor(
+            None, self._write, self._path(key), body
+        )
+
+        return key
+
+    async def get(self, key: str) -> Union[bytes, memoryview]:
+        '''Map a stored body into memory.
+
+        Args:
+            key (str): The key of the body.
+
+        Raises:
+            KeyError: If no body is stored with the key.
+
+        Returns:
+            Union[bytes, memoryview]: A read-only view of the body.
+        '''
+
+        try:
+            with open(self._path(key), 'rb') as blob:
+                if os.fstat(blob.fileno()).st_size == 0:
+                    return b''
+
+                return memoryview(
+                    mmap.mmap(blob.fileno(), 0, access=mmap.ACCESS_READ)
+                )
+        except FileNotFoundError:
+            raise KeyError(key)
+
+    async def delete(self, key: str) -> None:
+        '''Delete a stored body, if it still exists.
+
+        The memory maps already opened stay readable.
+
+        Args:
+            key (str): The key of the body.
+        '''
+
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def sweep(self, max_age: float) -> int:
+        '''Delete the bodies stored for more than max_age seconds.
+
+        Collects the bodies of the messages never processed,
+        e.g. dead-lettered or consumed by a fanout.
+
+        Args:
+            max_age (float): The maximum age (in seconds) of a body.
+
+        Returns:
+            int: The number of deleted bodies.
+        '''
+
+        deadline: float = time.time() - max_age
+        count: int = 0
+
+        for entry in os.scandir(self.directory):
+            if entry.name.startswith('.'):
+                continue
+
+            try:
+                if entry.stat().st_mtime < deadline:
+                    os.remove(entry.path)
+                    count += 1
+            except FileNotFoundError:
+                pass
+
+        return count
+
+    def _path(self, key: str) -> str:
+        '''The path of the file of a body.
+
+        Args:
+            key (str): The key of the body.
+
+        Raises:
+            KeyError: If the key isn't a key of the store.
+
+        Returns:
+            str: The file path.
+        '''
+
+        if not key.isalnum():
+            raise KeyError(key)
+
+        return os.path.join(self.directory, key)
+
+    def _write(self, path: str, body: Union[bytes, memoryview]) -> None:
+        '''Write a body through a temporary file.
+
+        Args:
+            path (str): The final path of the file.
+            body (Union[bytes, memoryview]): The body to write.
+        '''
+
+        temp: str = os.path.join(
+            self.directory, f'.{os.path.basename(path)}.tmp'
+        )
+
+        with open(temp, 'wb') as blob:
+            blob.write(body)
+
+        os.replace(temp, path)
+
+
+class ClaimCheckMiddleware(MiddlewareABC):
+    '''The ClaimCheckMiddleware class declaration.
+
+    Store the serialized bodies above a threshold in a blob store,
+    and emit a small reference instead. Must be registered after
+    the SerializerMiddleware and the CompressorMiddleware, which is
+    the default for Symbios.use().
+
+    The reference is a JSON body of the CONTENT_TYPE content-type,
+    holding the key of the blob and the content-type and
+    content-encoding of the stored body. It survives the batching.
+
+    Attributes:
+        CONTENT_TYPE (str): The content-type of a reference.
+        _DEFAULT_THRESHOLD (int): The default size (in bytes) under
+            which the bodies are emitted as they are.
+
+        store (BlobStoreABC): The blob store.
+        threshold (int): The size (in bytes) under which the bodies
+            are emitted as they are.
+    '''
+
+    CONTENT_TYPE: str = 'application/x-symbios-claim-check'
+    _DEFAULT_THRESHOLD: int = 1024 * 1024
+
+    def __init__(
+        self,
+        event: int,
+        *,
+        store: BlobStoreABC,
+        threshold: int = _DEFAULT_THRESHOLD,
+    ):
+        '''The ClaimCheckMiddleware initializer.
+
+        Args:
+            event (int): The event associated with middleware.
+            store (BlobStoreABC): The blob store.
+            threshold (int): The size (in bytes) under which the bodies
+                are emitted as they are. Default to _DEFAULT_THRESHOLD.
+
+        Raises:
+            ClaimCheckMiddlewareError: If the threshold is lower than 1.
+        '''
+
+        super().__init__(event)
+
+        if threshold < 1:
+            raise ClaimCheckMiddlewareError(
+                f'The threshold must be greater than 0, {threshold} given.'
+            )
+
+        self.store: BlobStoreABC = store
+        self.threshold: int = threshold
+
+    async def execute(self, symbios: object, message: SendingMessage) -> None:
+        '''Replace a large serialized body with its reference.
+
+        Args:
+            symbios (Symbios): The symbios instance.
+            message (SendingMessage): The message to send.
+        '''
+
+        if len(message.serialized) < self.threshold:
+            return
+
+        key: str = await self.store.put(message.serialized)
+
+        message.serialized = json.dumps(
+            {
+                'key': key,
+                'content_type': message.props.content_type or '',
+                'content_encoding': message.props.content_encoding or '',
+            }
+        ).encode()
+        message.props.content_type = ClaimCheckMiddleware.CONTENT_TYPE
+        message.props.content_encoding = None
+
+
+class ClaimCheckMiddlewareError(Exception):
+    '''The ClaimCheckMiddlewareError Exception class.
+    '''
+
+    def __init__(self, message: str):
+        super().__init__(message)
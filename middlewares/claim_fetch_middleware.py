@@ -0,0 +1,90 @@
+'''
+@desc    The claim-check redeeming middleware for Symbios.
+@author  arthuchaut <arthuchaut@gmail.com>
+@version 0.1.0
+@date    2026-10-18
+@note    0.1.0 (2026-10-18): Writed the first drafts.
+'''
+
+from typing import Any, Dict
+import json
+
+from symbios.middleware import MiddlewareABC
+from symbios.message import IncomingMessage
+
+from middlewares.claim_check_middleware import (
+    BlobStoreABC,
+    ClaimCheckMiddleware,
+)
+
+
+class ClaimFetchMiddleware(MiddlewareABC):
+    '''The ClaimFetchMiddleware class declaration.
+
+    Replace a claim-check reference with the stored body, and restore
+    its content-type and content-encoding. Must be called before
+    the other listening middlewares, so register it last with
+    Symbios.use(ClaimFetchMiddleware(...), index=0).
+
+    Attributes:
+        store (BlobStoreABC): The blob store.
+        collect (bool): Delete the blob once the message was processed.
+            Disable it if several queues receive the reference.
+    '''
+
+    def __init__(
+        self, event: int, *, store: BlobStoreABC, collect: bool = True
+    ):
+        '''The ClaimFetchMiddleware initializer.
+
+        Args:
+            event (int): The event associated with middleware.
+            store (BlobStoreABC): The blob store.
+            collect (bool): Delete the blob once the message was
+                processed. Default to True.
+        '''
+
+        super().__init__(event)
+
+        self.store: BlobStoreABC = store
+        self.collect: bool = collect
+
+    async def execute(self, symbios: object, message: IncomingMessage) -> None:
+        '''Fetch the stored body of a reference.
+
+        Args:
+            symbios (Symbios): The symbios instance.
+            message (IncomingMessage): The received message.
+
+        Raises:
+            ClaimFetchMiddlewareError: If the reference is malformed
+                or if its blob doesn't exist.
+        '''
+
+        if message.props.content_type != ClaimCheckMiddleware.CONTENT_TYPE:
+            return
+
+        try:
+            reference: Dict[str, Any] = json.loads(bytes(message.body))
+            key: str = reference['key']
+            message.body = await self.store.get(key)
+        except KeyError as e:
+            raise ClaimFetchMiddlewareError(f'Blob not found: {e}')
+        except ValueError as e:
+            raise ClaimFetchMiddlewareError(f'Malformed reference: {e}')
+
+        message.props.content_type = reference.get('content_type') or None
+        message.props.content_encoding = (
+            reference.get('content_encoding') or None
+        )
+
+        if self.collect:
+            message.finalize_with(lambda: self.store.delete(key))
+
+
+class ClaimFetchMiddlewareError(Exception):
+    '''The ClaimFetchMiddlewareError Exception class.
+    '''
+
+    def __init__(self, message: str):
+        super().__init__(message)
@@ -0,0 +1,152 @@
+'''
+@desc    The body compressor middleware for Symbios.
+@author  arthuchaut <arthuchaut@gmail.com>
+@version 0.1.0
+@date    2026-10-18
+@note    0.1.0 (2026-10-18): Writed the first drafts.
+'''
+
+from typing import Callable, Dict, Tuple
+import gzip
+import lzma
+import zlib
+
+from symbios.middleware import MiddlewareABC
+from symbios.message import SendingMessage
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame
+except ImportError:
+    lz4 = None
+
+
+CODECS: Dict[str, Tuple[Callable, Callable]] = {
+    'deflate': (
+        lambda body, level: zlib.compress(body, level),
+        zlib.decompress,
+    ),
+    'gzip': (
+        lambda body, level: gzip.compress(body, compresslevel=level),
+        gzip.decompress,
+    ),
+    'xz': (
+        lambda body, level: lzma.compress(body, preset=level),
+        lzma.decompress,
+    ),
+}
+
+DEFAULT_LEVELS: Dict[str, int] = {'deflate': 6, 'gzip': 6, 'xz': 6}
+
+if zstandard is not None:
+    CODECS['zstd'] = (
+        lambda body, level: zstandard.ZstdCompressor(level=level).compress(
+            body
+        ),
+        lambda body: zstandard.ZstdDecompressor().decompress(body),
+    )
+    DEFAULT_LEVELS['zstd'] = 3
+
+if lz4 is not None:
+    CODECS['lz4'] = (
+        lambda body, level: lz4.frame.compress(
+            body, compression_level=level
+        ),
+        lz4.frame.decompress,
+    )
+    DEFAULT_LEVELS['lz4'] = 0
+
+
+class CompressorMiddleware(MiddlewareABC):
+    '''The CompressorMiddleware class declaration.
+
+    Compress the serialized body and set the content_encoding property.
+    Must be registered after the SerializerMiddleware, which is
+    the default for Symbios.use().
+
+    The stdlib codecs deflate (zlib), gzip and xz (lzma) are always
+    available. The faster zstd and lz4 codecs are available when
+    the zstandard and lz4 packages are installed.
+
+    Attributes:
+        _DEFAULT_THRESHOLD (int): The default size (in bytes) under
+            which the bodies aren't compressed.
+
+        codec (str): The content-encoding of the compressed bodies.
+        threshold (int): The size (in bytes) under which the bodies
+            aren't compressed.
+        level (int): The compression level of the codec.
+    '''
+
+    _DEFAULT_THRESHOLD: int = 1024
+
+    def __init__(
+        self,
+        event: int,
+        *,
+        codec: str = 'deflate',
+        threshold: int = _DEFAULT_THRESHOLD,
+        level: int = None,
+    ):
+        '''The CompressorMiddleware initializer.
+
+        Args:
+            event (int): The event associated with middleware.
+            codec (str): The content-encoding of the compressed bodies.
+                Default to 'deflate'.
+            threshold (int): The size (in bytes) under which the bodies
+                aren't compressed. Default to _DEFAULT_THRESHOLD.
+            level (int): The compression level of the codec.
+                Default to the codec default level.
+
+        Raises:
+            CompressorMiddlewareError: If the codec isn't available.
+        '''
+
+        super().__init__(event)
+
+        if not codec in CODECS:
+            raise CompressorMiddlewareError(
+                f'Codec {codec} is not available.'
+            )
+
+        self.codec: str = codec
+        self.threshold: int = threshold
+        self.level: int = DEFAULT_LEVELS[codec] if level is None else level
+
+    async def execute(self, symbios: object, message: SendingMessage) -> None:
+        '''Compress the serialized message.
+
+        The message is left untouched if it is smaller than the threshold,
+        if it is already encoded or if the compression doesn't shrink it.
+
+        Args:
+            symbios (Symbios): The symbios instance.
+            message (SendingMessage): The message to send.
+        '''
+
+        if (
+            len(message.serialized) < self.threshold
+            or message.props.content_encoding
+        ):
+            return
+
+        compressed: bytes = CODECS[self.codec][0](
+            message.serialized, self.level
+        )
+
+        if len(compressed) < len(message.serialized):
+            message.serialized = compressed
+            message.props.content_encoding = self.codec
+
+
+class CompressorMiddlewareError(Exception):
+    '''The CompressorMiddlewareError Exception class.
+    '''
+
+    def __init__(self, message: str):
+        super().__init__(message)
@@ -0,0 +1,56 @@
+'''
+@desc    The body decompressor middleware for Symbios.
+@author  arthuchaut <arthuchaut@gmail.com>
+@version 0.1.0
+@date    2026-10-18
+@note    0.1.0 (2026-10-18): Writed the first drafts.
+'''
+
+from symbios.middleware import MiddlewareABC
+from symbios.message import IncomingMessage
+
+from middlewares.compressor_middleware import CODECS
+
+
+class DecompressorMiddleware(MiddlewareABC):
+    '''The DecompressorMiddleware class declaration.
+
+    Decompress the body according to its content_encoding property.
+    Must be called before the DeserializerMiddleware, so register it
+    with Symbios.use(DecompressorMiddleware(Event.ON_LISTEN), index=0).
+    The bodies with an unknown content-encoding are left untouched.
+    '''
+
+    async def execute(self, symbios: object, message: IncomingMessage) -> None:
+        '''Decompress the message body.
+
+        Args:
+            symbios (Symbios): The symbios instance.
+            message (IncomingMessage): The received message.
+
+        Raises:
+            DecompressorMiddlewareError: If the body couldn't be
+                decompressed.
+        '''
+
+        codec: str = message.props.content_encoding
+
+        if not codec in CODECS:
+            return
+
+        try:
+            message.body = CODECS[codec][1](message.body)
+        except Exception as e:
+            raise DecompressorMiddlewareError(
+                f'Body is not a valid {codec} content: {e}'
+            )
+
+        message.props.content_encoding = None
+
+
+class DecompressorMiddlewareError(Exception):
+    '''The DecompressorMiddlewareError Exception class.
+    '''
+
+    def __init__(self, message: str):
+        super().__init__(message)
@@ -1,14 +1,15 @@
 '''
 @desc    The body deserializer middleware for Symbios.
 @author  arthuchaut <arthuchaut@gmail.com>
-@version 0.1.0
+@version 0.3.0
 @date    2019-09-22
 @note    0.1.0 (2019-09-22): Writed the first drafts.
+@note    0.2.0 (2026-10-18): Delegated the deserialization to the
+                             Symbios codec registry.
+@note    0.3.0 (2026-10-18): Made it optional, the incoming messages
+                             being deserialized lazily.
 '''
 
-from typing import Union, Dict, Any
-import json
-
 from symbios.middleware import MiddlewareABC
 from symbios.message import IncomingMessage
 
@@ -16,60 +17,22 @@ from symbios.message import IncomingMessage
 class DeserializerMiddleware(MiddlewareABC):
     '''The DeserializerMiddleware class declaration.
 
-    Attributes:
-        _content_type_corr (Dict[str, Any]): The content-type
-            correlation dictionnary.
-    '''
-
-    def __init__(self, event: int):
-        '''The DeserializerMiddleware initializer.
-
-        Args:
-            event (int): The event associated with middleware.
-        '''
-
-        super().__init__(event)
+    Deserialize the message body with the codec of its content-type.
+    The bodies with an unknown content-type are decoded as text.
+    See Symbios.codecs.
 
-        self._content_type_corr: Dict[str, Any] = {
-            'text/plain': self._bytes_to_str,
-            'application/json': self._bytes_to_dict,
-        }
+    The incoming messages are deserialized lazily on the first access
+    to IncomingMessage.deserialized. Register this middleware to
+    deserialize them eagerly, e.g. to reject the malformed bodies
+    before the task.
+    '''
 
     async def execute(self, symbios: object, message: IncomingMessage) -> None:
         '''Implement to the message the deserialized format.
         '''
 
-        content: Union[str, Dict[str, Any]] = None
-
-        try:
-            content = self._content_type_corr[message.props.content_type](
-                message.body
-            )
-        except KeyError as e:
-            content = self._bytes_to_str(message.body)
-
-        setattr(message, 'deserialized', content)
-
-    def _bytes_to_str(self, body: bytes) -> str:
-        '''Parse the body to string.
-
-        Args:
-            body (bytes): The message body to parse.
-
-        Returns:
-            str: The body parsed.
-        '''
-
-        return body.decode()
-
-    def _bytes_to_dict(self, body: bytes) -> Dict[str, Any]:
-        '''Parse the body to Dict[str, Any].
-
-        Args:
-            body (bytes): The message body to parse.
-
-        Returns:
-            Dict[str, Any]: The body parsed.
-        '''
-
-        return json.loads(self._bytes_to_str(body))
+        setattr(
+            message,
+            'deserialized',
+            symbios.codecs.decode(message.body, message.props.content_type),
+        )
@@ -1,41 +1,25 @@
 '''
 @desc    The serializer middleware for Symbios.
 @author  arthuchaut <arthuchaut@gmail.com>
-@version 0.1.0
+@version 0.2.0
 @date    2019-09-22
 @note    0.1.0 (2019-09-22): Writed the first drafts.
+@note    0.2.0 (2026-10-18): Delegated the serialization to the
+                             Symbios codec registry.
 '''
 
-from typing import Union, Dict, Any
-import json
-
 from symbios.middleware import MiddlewareABC
 from symbios.message import SendingMessage
+from symbios.codec import CodecError
 
 
 class SerializerMiddleware(MiddlewareABC):
     '''The SerializerMiddleware class declaration.
 
-    Attributes:
-        _type_corr (Dict[str, Any]): The typing converter dictionnary.
+    Serialize the message body with the codec of its content-type,
+    or with the codec of its type. See Symbios.codecs.
     '''
 
-    def __init__(self, event: int):
-        '''The SerializerMiddleware initializer.
-
-        Args:
-            event (int): The event associated with middleware.
-        '''
-
-        super().__init__(event)
-
-        self._type_corr: Dict[str, Any] = {
-            str: self._str_to_bytes,
-            int: self._str_to_bytes,
-            float: self._str_to_bytes,
-            dict: self._dict_to_bytes,
-        }
-
     async def execute(self, symbios: object, message: SendingMessage) -> None:
         '''Serialize the message.
 
@@ -50,40 +34,19 @@ class SerializerMiddleware(MiddlewareABC):
                 not serializable.
         '''
 
+        content_type: str = None
+
+        if not message.props is None:
+            content_type = message.props.content_type
+
         try:
             setattr(
                 message,
                 'serialized',
-                self._type_corr[type(message.body)](message.body),
+                symbios.codecs.encode(message.body, content_type),
             )
-        except KeyError as e:
-            raise SerializerMiddlewareError(
-                f'Type {type(message.body).__name__} is not serializable.'
-            )
-
-    def _str_to_bytes(self, body: Union[str, int, float]) -> bytes:
-        '''Parse the body string to bytes.
-
-        Args:
-            body (Union[str, int, float]): The message body to parse.
-
-        Returns:
-            bytes: The body parsed.
-        '''
-
-        return str(body).encode()
-
-    def _dict_to_bytes(self, body: Dict[Any, Any]) -> bytes:
-        '''Parse the Dict[Any, Any] body to a stringify JSON bytes.
-
-        Args:
-            body (Dict[Any, Any]): The message body to parse.
-
-        Returns:
-            bytes: The body parsed.
-        '''
-
-        return json.dumps(body).encode()
+        except CodecError as e:
+            raise SerializerMiddlewareError(str(e))
 
 
 class SerializerMiddlewareError(Exception):
@@ -0,0 +1,284 @@
+'''
+@desc    The coalescing of the message acknowledgments.
+@author  arthuchaut <arthuchaut@gmail.com>
+@version 0.1.0
+@date    2026-10-18
+@note    0.1.0 (2026-10-18): Writed the first drafts.
+'''
+
+import asyncio
+from asyncio import Lock, TimerHandle
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, List, Set
+
+from .utils import Channel
+
+
+class AckCoalescer:
+    '''The AckCoalescer class declaration.
+
+    Coalesces the acknowledgments of a channel into multiple acks.
+    The delivery tags are tracked in the order of delivery. An ack only
+    marks its tag, then the flush acknowledges at once the longest run
+    of settled tags from the oldest one, with a single multiple ack.
+    So a message completed before an older one waits for it.
+    The negative acknowledgments are sent immediately.
+
+    The pending acks are flushed every interval seconds, or as soon
+    as max_pending of them are waiting. The acks still waiting for
+    an older delivery after two flushes are sent one by one, so that
+    a slow message doesn't hold the prefetch window of the channel.
+
+    Attributes:
+        _DEFAULT_MAX_PENDING (int): The default number of pending acks
+            that triggers a flush.
+        _DEFAULT_INTERVAL (float): The default time (in seconds) between
+            two flushes.
+
+        max_pending (int): The number of pending acks that triggers
+            a flush.
+        interval (float): The time (in seconds) between two flushes.
+        _channel (Channel): The channel of the deliveries.
+        _order (Deque[int]): The tracked delivery tags, in the order
+            of delivery, until they are flushed.
+        _states (Dict[int, bool]): The settlement of the tracked tags.
+            None while unsettled, True once acked and not sent yet, False
+            once negatively acknowledged or acked one by one.
+        _callbacks (Dict[int, Callable[[], Awaitable[None]]]): The
+            callbacks to run once an ack was sent, by tag.
+        _pending (int): The number of acks not sent yet.
+        _blocked (Set[int]): The acks that were waiting for an older
+            delivery at the last flush.
+        _timer (TimerHandle): The timer of the next flush.
+        _lock (Lock): Runs the flushes one after the other.
+    '''
+
+    _DEFAULT_MAX_PENDING: int = 256
+    _DEFAULT_INTERVAL: float = 0.01
+
+    def __init__(
+        self,
+        channel: Channel,
+        *,
+        max_pending: int = _DEFAULT_MAX_PENDING,
+        interval: float = _DEFAULT_INTERVAL,
+    ):
+        '''The AckCoalescer initializer.
+
+        Args:
+            channel (Channel): The channel of the deliveries.
+            max_pending (int): The number of pending acks that triggers
+                a flush. Default to _DEFAULT_MAX_PENDING.
+            interval (float): The time (in seconds) between two flushes.
+                Default to _DEFAULT_INTERVAL.
+        '''
+
+        self.max_pending: int = max_pending
+        self.interval: float = interval
+        self._channel: Channel = channel
+        self._order: Deque[int] = deque()
+        self._states: Dict[int, bool] = {}
+        self._callbacks: Dict[int, Callable[[], Awaitable[None]]] = {}
+        self._pending: int = 0
+        self._blocked: Set[int] = set()
+        self._timer: TimerHandle = None
+        self._lock: Lock = None
+
+    def track(self, delivery_tag: int) -> None:
+        '''Track a delivery. Must be called in the order of delivery.
+
+        Args:
+            delivery_tag (int): The delivery tag.
+        '''
+
+        self._order.append(delivery_tag)
+        self._states[delivery_tag] = None
+
+    async def ack(
+        self,
+        delivery_tag: int,
+        callback: Callable[[], Awaitable[None]] = None,
+    ) -> None:
+        '''Acknowledge a delivery at the next flush.
+
+        An untracked delivery is acknowledged immediately.
+
+        Args:
+            delivery_tag (int): The delivery tag.
+            callback (Callable[[], Awaitable[None]]): The coroutine
+                function to call once the ack was sent. Default to None.
+        '''
+
+        if not delivery_tag in self._states:
+            await self._channel.basic_ack(delivery_tag)
+
+            if not callback is None:
+                await callback()
+
+            return
+
+        self._states[delivery_tag] = True
+        self._pending += 1
+
+        if not callback is None:
+            self._callbacks[delivery_tag] = callback
+
+        if self._pending >= self.max_pending:
+            await self.flush()
+        else:
+            self._schedule()
+
+    async def nack(self, delivery_tag: int, requeue: bool = True) -> None:
+        '''Negatively acknowledge a delivery immediately.
+
+        Args:
+            delivery_tag (int): The delivery tag.
+            requeue (bool): Requeue the message. Default to True.
+        '''
+
+        self._settle(delivery_tag)
+        await self._channel.basic_nack(
+            delivery_tag, multiple=False, requeue=requeue
+        )
+
+    async def reject(self, delivery_tag: int, requeue: bool = False) -> None:
+        '''Reject a delivery immediately.
+
+        Args:
+            delivery_tag (int): The delivery tag.
+            requeue (bool): Requeue the message. Default to False.
+        '''
+
+        self._settle(delivery_tag)
+        await self._channel.basic_reject(delivery_tag, requeue=requeue)
+
+    async def nack_many(
+        self, delivery_tags: List[int], requeue: bool = True
+    ) -> None:
+        '''Negatively acknowledge several deliveries.
+
+        A single multiple nack is sent if no other unsettled delivery
+        is older than the last one, else one nack per delivery.
+
+        Args:
+            delivery_tags (List[int]): The delivery tags.
+            requeue (bool): Requeue the messages. Default to True.
+        '''
+
+        if not delivery_tags:
+            return
+
+        await self.flush()
+
+        last_tag: int = max(delivery_tags)
+        group: set = set(delivery_tags)
+
+        if not all(
+            tag in group or self._states[tag] is False
+            for tag in self._order
+            if tag <= last_tag
+        ) or not group.issubset(self._states):
+            for tag in delivery_tags:
+                await self.nack(tag, requeue)
+
+            return
+
+        for tag in delivery_tags:
+            self._settle(tag)
+
+        await self._channel.basic_nack(
+            last_tag, multiple=True, requeue=requeue
+        )
+
+    async def flush(self) -> None:
+        '''Send a single multiple ack for the longest run of settled
+        deliveries, and one ack per delivery for the acks blocked since
+        the last flush. Then call the callbacks of the acknowledged ones.
+
+        The flushes run one after the other, since the timer and
+        the max_pending trigger could start them at the same time.
+        '''
+
+        if self._lock is None:
+            self._lock = Lock()
+
+        async with self._lock:
+            callbacks: List[Callable[[], Awaitable[None]]] = await self._send()
+
+        for callback in callbacks:
+            await callback()
+
+    async def _send(self) -> List[Callable[[], Awaitable[None]]]:
+        '''Send the acks of a flush.
+
+        Returns:
+            List[Callable[[], Awaitable[None]]]: The callbacks of
+                the acknowledged deliveries.
+        '''
+
+        if not self._timer is None:
+            self._timer.cancel()
+            self._timer = None
+
+        last_tag: int = None
+        callbacks: List[Callable[[], Awaitable[None]]] = []
+
+        while self._order and not self._states[self._order[0]] is None:
+            tag: int = self._order.popleft()
+
+            if self._states.pop(tag):
+                last_tag = tag
+                self._pending -= 1
+
+                if tag in self._callbacks:
+                    callbacks.append(self._callbacks.pop(tag))
+
+        if not last_tag is None:
+            await self._channel.basic_ack(last_tag, multiple=True)
+
+        blocked: Set[int] = set()
+
+        for tag in list(self._order) if self._pending else []:
+            if not self._states[tag]:
+                continue
+
+            if not tag in self._blocked:
+                blocked.add(tag)
+                continue
+
+            self._states[tag] = False
+            self._pending -= 1
+            await self._channel.basic_ack(tag)
+
+            if tag in self._callbacks:
+                callbacks.append(self._callbacks.pop(tag))
+
+        self._blocked = blocked
+
+        if blocked:
+            self._schedule()
+
+        return callbacks
+
+    def _settle(self, delivery_tag: int) -> None:
+        '''Mark a delivery as negatively acknowledged, and flush
+        the acks waiting behind it.
+
+        Args:
+            delivery_tag (int): The delivery tag.
+        '''
+
+        if delivery_tag in self._states:
+            self._states[delivery_tag] = False
+
+            if self._pending:
+                self._schedule()
+
+    def _schedule(self) -> None:
+        '''Arm the timer of the next flush, if it isn't armed yet.
+        '''
+
+        if self._timer is None:
+            self._timer = asyncio.get_event_loop().call_later(
+                self.interval, lambda: asyncio.ensure_future(self.flush())
+            )
@@ -0,0 +1,338 @@
+'''
+@desc    The client-side micro-batching of the messages.
+@author  arthuchaut <arthuchaut@gmail.com>
+@version 0.1.0
+@date    2026-10-18
+@note    0.1.0 (2026-10-18): Writed the first drafts.
+'''
+
+import asyncio
+from asyncio import Future, Lock, TimerHandle
+from copy import copy
+from struct import Struct
+from typing import Callable, Awaitable, List, Tuple
+
+from .utils import Props
+from .message import IncomingMessage
+
+
+class BatchEnvelope:
+    '''The BatchEnvelope class declaration.
+
+    Packs several serialized messages into the body of a single AMQP
+    message, and unpacks them on the listener side.
+
+    The envelope is flagged by the HEADER header, valued with the
+    number of records, and by the CONTENT_TYPE content-type.
+    Its body is the concatenation of the records, each one made of:
+
+        >H  The length of the record content-type.
+        ... The record content-type, utf-8 encoded.
+        >H  The length of the record content-encoding.
+        ... The record content-encoding, utf-8 encoded.
+        >I  The length of the record body.
+        ... The record body.
+
+    Attributes:
+        HEADER (str): The header that flags an envelope.
+        CONTENT_TYPE (str): The content-type of an envelope.
+        _SHORT (Struct): The length prefix of the record properties.
+        _LONG (Struct): The length prefix of the record body.
+    '''
+
+    HEADER: str = 'x-symbios-batch'
+    CONTENT_TYPE: str = 'application/x-symbios-batch'
+
+    _SHORT: Struct = Struct('>H')
+    _LONG: Struct = Struct('>I')
+
+    @staticmethod
+    def pack(records: List[Tuple[str, str, bytes]]) -> bytes:
+        '''Pack the records into an envelope body.
+
+        Args:
+            records (List[Tuple[str, str, bytes]]): The content-type,
+                the content-encoding and the body of each message.
+
+        Returns:
+            bytes: The envelope body.
+        '''
+
+        chunks: List[bytes] = []
+
+        for content_type, content_encoding, body in records:
+            for prop in [content_type, content_encoding]:
+                prop = (prop or '').encode()
+                chunks.append(BatchEnvelope._SHORT.pack(len(prop)))
+                chunks.append(prop)
+
+            chunks.append(BatchEnvelope._LONG.pack(len(body)))
+            chunks.append(body)
+
+        return b''.join(chunks)
+
+    @staticmethod
+    def unpack(body: bytes) -> List[Tuple[str, str, bytes]]:
+        '''Unpack the records of an envelope body.
+
+        Args:
+            body (bytes): The envelope body.
+
+        Raises:
+            BatchEnvelopeError: If the body is truncated.
+
+        Returns:
+            List[Tuple[str, str, bytes]]: The content-type, the
+                content-encoding and the body of each message.
+        '''
+
+        records: List[Tuple[str, str, bytes]] = []
+        view: memoryview = memoryview(body)
+        offset: int = 0
+
+        try:
+            while offset < len(view):
+                props: List[str] = []
+
+                for _ in range(2):
+                    (size,) = BatchEnvelope._SHORT.unpack_from(view, offset)
+                    offset += BatchEnvelope._SHORT.size
+                    props.append(bytes(view[offset : offset + size]).decode())
+                    offset += size
+
+                (size,) = BatchEnvelope._LONG.unpack_from(view, offset)
+                offset += BatchEnvelope._LONG.size
+
+                if offset + size > len(view):
+                    raise BatchEnvelopeError('Truncated envelope body.')
+
+                records.append(
+                    (props[0], props[1], bytes(view[offset : offset + size]))
+                )
+                offset += size
+        except Exception as e:
+            raise BatchEnvelopeError(f'Malformed envelope body: {e}')
+
+        return records
+
+    @staticmethod
+    def is_envelope(message: IncomingMessage) -> bool:
+        '''Tell if an incoming message is an envelope.
+
+        Args:
+            message (IncomingMessage): The incoming message.
+
+        Returns:
+            bool: True if the message is an envelope.
+        '''
+
+        return bool(message.props.headers) and (
+            BatchEnvelope.HEADER in message.props.headers
+        )
+
+    @staticmethod
+    def open(message: IncomingMessage) -> List[IncomingMessage]:
+        '''Split an incoming envelope into its messages.
+
+        The messages share the delivery of the envelope, so
+        the acknowledgment applies to the whole envelope. They can't be
+        settled by themselves: the consumer settles the envelope.
+
+        Args:
+            message (IncomingMessage): The incoming envelope.
+
+        Returns:
+            List[IncomingMessage]: The incoming messages.
+        '''
+
+        messages: List[IncomingMessage] = []
+
+        for content_type, content_encoding, body in BatchEnvelope.unpack(
+            message.body
+        ):
+            record: IncomingMessage = copy(message)
+            record.props = copy(message.props)
+            record.props.content_type = content_type or None
+            record.props.content_encoding = content_encoding or None
+            record.body = body
+            record._acker = None
+            messages.append(record)
+
+        return messages
+
+
+class Batching:
+    '''The Batching class declaration.
+
+    The flushing policy of a batched Producer.
+
+    Attributes:
+        _DEFAULT_MAX_BYTES (int): The default envelope body size limit.
+        _DEFAULT_MAX_MESSAGES (int): The default number of messages limit.
+        _DEFAULT_LINGER (float): The default lingering time (in seconds).
+
+        max_bytes (int): Flush once the envelope body reaches this size.
+        max_messages (int): Flush once the envelope holds this number
+            of messages.
+        linger (float): Flush this time (in seconds) after the first
+            message of the envelope was added.
+    '''
+
+    _DEFAULT_MAX_BYTES: int = 64 * 1024
+    _DEFAULT_MAX_MESSAGES: int = 1000
+    _DEFAULT_LINGER: float = 0.005
+
+    def __init__(
+        self,
+        *,
+        max_bytes: int = _DEFAULT_MAX_BYTES,
+        max_messages: int = _DEFAULT_MAX_MESSAGES,
+        linger: float = _DEFAULT_LINGER,
+    ):
+        '''The Batching initializer.
+
+        Args:
+            max_bytes (int): Flush once the envelope body reaches this
+                size. Default to _DEFAULT_MAX_BYTES.
+            max_messages (int): Flush once the envelope holds this number
+                of messages. Default to _DEFAULT_MAX_MESSAGES.
+            linger (float): Flush this time (in seconds) after the first
+                message of the envelope was added.
+                Default to _DEFAULT_LINGER.
+        '''
+
+        self.max_bytes: int = max_bytes
+        self.max_messages: int = max_messages
+        self.linger: float = linger
+
+
+class Batcher:
+    '''The Batcher class declaration.
+
+    Coalesces the serialized messages of a Producer into envelopes.
+
+    Attributes:
+        policy (Batching): The flushing policy.
+        _publish (Callable[[bytes, int], Awaitable[Future]]): The
+            coroutine function that emits an envelope body and
+            returns the future of its confirmation.
+        _records (List[Tuple[str, str, bytes]]): The pending records.
+        _futures (List[Future]): The pending futures, one per record.
+        _size (int): The pending envelope body size.
+        _timer (TimerHandle): The lingering timer of the pending envelope.
+        _lock (Lock): Keeps the envelopes in order.
+    '''
+
+    def __init__(
+        self,
+        policy: Batching,
+        publish: Callable[[bytes, int], Awaitable[Future]],
+    ):
+        '''The Batcher initializer.
+
+        Args:
+            policy (Batching): The flushing policy.
+            publish (Callable[[bytes, int], Awaitable[Future]]): The
+                coroutine function that emits an envelope body with its
+                number of records, and returns the future of its
+                confirmation.
+        '''
+
+        self.policy: Batching = policy
+        self._publish: Callable[[bytes, int], Awaitable[Future]] = publish
+        self._records: List[Tuple[str, str, bytes]] = []
+        self._futures: List[Future] = []
+        self._size: int = 0
+        self._timer: TimerHandle = None
+        self._lock: Lock = None
+
+    async def add(self, props: Props, body: bytes) -> Future:
+        '''Add a serialized message to the pending envelope.
+
+        Args:
+            props (Props): The message properties.
+            body (bytes): The serialized message.
+
+        Returns:
+            Future: The future resolved with the EmitACK
+                of the envelope.
+        '''
+
+        loop: asyncio.AbstractEventLoop = asyncio.get_event_loop()
+        future: Future = loop.create_future()
+
+        self._records.append(
+            (props.content_type, props.content_encoding, body)
+        )
+        self._futures.append(future)
+        self._size += len(body)
+
+        if (
+            self._size >= self.policy.max_bytes
+            or len(self._records) >= self.policy.max_messages
+        ):
+            await self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(
+                self.policy.linger,
+                lambda: asyncio.ensure_future(self.flush()),
+            )
+
+        return future
+
+    async def flush(self) -> None:
+        '''Emit the pending envelope, if any.
+        '''
+
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if not self._records:
+            return
+
+        records, futures = self._records, self._futures
+        self._records, self._futures, self._size = [], [], 0
+
+        if self._lock is None:
+            self._lock = Lock()
+
+        try:
+            async with self._lock:
+                produce_ok: Future = await self._publish(
+                    BatchEnvelope.pack(records), len(records)
+                )
+        except Exception as e:
+            for future in futures:
+                future.set_exception(e)
+
+            return
+
+        produce_ok.add_done_callback(
+            lambda produce_ok: self._resolve(futures, produce_ok)
+        )
+
+    @staticmethod
+    def _resolve(futures: List[Future], produce_ok: Future) -> None:
+        '''Resolve the futures of the records with the envelope one.
+
+        Args:
+            futures (List[Future]): The futures of the records.
+            produce_ok (Future): The future of the envelope.
+        '''
+
+        for future in futures:
+            if future.done():
+                continue
+
+            if produce_ok.cancelled():
+                future.cancel()
+            elif not produce_ok.exception() is None:
+                future.set_exception(produce_ok.exception())
+            else:
+                future.set_result(produce_ok.result())
+
+
+class BatchEnvelopeError(Exception):
+    '''The BatchEnvelopeError exception class.
+    '''
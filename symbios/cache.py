@@ -0,0 +1,238 @@
+'''
+@desc    The RPC response cache.
+@author  arthuchaut <arthuchaut@gmail.com>
+@version 0.1.0
+@date    2026-10-18
+@note    0.1.0 (2026-10-18): Writed the first drafts.
+'''
+
+import hashlib
+from collections import OrderedDict
+from time import monotonic
+from typing import Dict, Tuple, Union
+
+from .message import IncomingMessage
+
+
+class CacheStats:
+    '''The CacheStats class declaration.
+
+    The counters of an RPCCache.
+
+    Attributes:
+        hits (int): The number of calls answered by the cache.
+        negative_hits (int): The number of hits on a cached error.
+        misses (int): The number of calls sent to the broker.
+        evictions (int): The number of entries evicted by the size bound.
+        expirations (int): The number of entries dropped by their TTL.
+    '''
+
+    def __init__(self):
+        '''The CacheStats initializer.
+        '''
+
+        self.hits: int = 0
+        self.negative_hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.expirations: int = 0
+
+    @property
+    def ratio(self) -> float:
+        '''The share of the calls answered by the cache.
+        '''
+
+        total: int = self.hits + self.misses
+
+        return self.hits / total if total else 0.0
+
+
+class RPCCache:
+    '''The RPCCache class declaration.
+
+    Remember the responses of idempotent calls, so that a call with
+    the same routing key, the same content-type and the same serialized
+    body is answered without reaching the broker.
+    The entries expire after the TTL of their route, and the least
+    recently used ones are evicted beyond max_size. With negative_ttl,
+    the error replies of the servers are cached as well and raised
+    again on a hit. The timeouts and the refused requests are never
+    cached.
+    The cached response is shared by all the hits: it must not be
+    modified.
+
+    Attributes:
+        _DEFAULT_MAX_SIZE (int): The default maximum number of entries.
+        _DEFAULT_TTL (float): The default lifetime (in seconds)
+            of an entry.
+
+        max_size (int): The maximum number of entries.
+        ttl (float): The lifetime (in seconds) of the entries of
+            the routes not listed in routes.
+        routes (Dict[str, float]): The lifetime (in seconds) of the
+            entries by routing key. A route with a lifetime of 0 is not
+            cached.
+        negative_ttl (float): The lifetime (in seconds) of the cached
+            errors. The errors are not cached if None.
+        stats (CacheStats): The counters.
+        _entries (OrderedDict): The response or the error, and the
+            expiry time, by key, from the least recently used.
+    '''
+
+    _DEFAULT_MAX_SIZE: int = 1024
+    _DEFAULT_TTL: float = 60.0
+
+    def __init__(
+        self,
+        *,
+        max_size: int = _DEFAULT_MAX_SIZE,
+        ttl: float = _DEFAULT_TTL,
+        routes: Dict[str, float] = None,
+        negative_ttl: float = None,
+    ):
+        '''The RPCCache initializer.
+
+        Args:
+            max_size (int): The maximum number of entries.
+                Default to _DEFAULT_MAX_SIZE.
+            ttl (float): The lifetime (in seconds) of the entries of
+                the routes not listed in routes. Default to _DEFAULT_TTL.
+            routes (Dict[str, float]): The lifetime (in seconds) of the
+                entries by routing key. Default to None.
+            negative_ttl (float): The lifetime (in seconds) of the
+                cached errors. Default to None.
+
+        Raises:
+            RPCCacheError: If max_size is lower than 1.
+        '''
+
+        if max_size < 1:
+            raise RPCCacheError(
+                f'Expected max_size >= 1, {max_size} given.'
+            )
+
+        self.max_size: int = max_size
+        self.ttl: float = ttl
+        self.routes: Dict[str, float] = routes or {}
+        self.negative_ttl: float = negative_ttl
+        self.stats: CacheStats = CacheStats()
+        self._entries: OrderedDict = OrderedDict()
+
+    def __len__(self) -> int:
+        '''The number of entries, including the expired ones not
+        dropped yet.
+        '''
+
+        return len(self._entries)
+
+    def key(
+        self, routing_key: str, body: bytes, content_type: str = None
+    ) -> Tuple[str, str, bytes]:
+        '''The key of a call, or None if its route is not cached.
+
+        Args:
+            routing_key (str): The routing key of the call.
+            body (bytes): The serialized body of the request.
+            content_type (str): The content-type of the request.
+                Default to None.
+
+        Returns:
+            Tuple[str, str, bytes]: The routing key, the content-type
+                and the body digest.
+        '''
+
+        if not self.routes.get(routing_key, self.ttl):
+            return None
+
+        return (
+            routing_key,
+            content_type or '',
+            hashlib.blake2b(body, digest_size=16).digest(),
+        )
+
+    def get(
+        self, key: Tuple[str, str, bytes]
+    ) -> Union[IncomingMessage, Exception]:
+        '''Look up a call and count a hit or a miss.
+
+        Args:
+            key (Tuple[str, str, bytes]): The key of the call.
+
+        Returns:
+            Union[IncomingMessage, Exception]: The cached response or
+                error, or None if missing or expired.
+        '''
+
+        entry: Tuple[Union[IncomingMessage, Exception], float] = (
+            self._entries.get(key)
+        )
+
+        if not entry is None and entry[1] <= monotonic():
+            del self._entries[key]
+            self.stats.expirations += 1
+            entry = None
+
+        if entry is None:
+            self.stats.misses += 1
+
+            return None
+
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+
+        if isinstance(entry[0], Exception):
+            self.stats.negative_hits += 1
+
+        return entry[0]
+
+    def put(
+        self,
+        key: Tuple[str, str, bytes],
+        reply: Union[IncomingMessage, Exception],
+    ) -> None:
+        '''Store the response or the error of a call.
+
+        The errors are dropped unless negative_ttl is set.
+
+        Args:
+            key (Tuple[str, str, bytes]): The key of the call.
+            reply (Union[IncomingMessage, Exception]): The response
+                or the error.
+        '''
+
+        if isinstance(reply, Exception):
+            ttl: float = self.negative_ttl
+        else:
+            ttl = self.routes.get(key[0], self.ttl)
+
+        if not ttl:
+            return
+
+        self._entries[key] = (reply, monotonic() + ttl)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def invalidate(self, routing_key: str = None) -> None:
+        '''Drop the entries of a route, or all of them.
+
+        Args:
+            routing_key (str): The route to drop. All the routes if None.
+                Default to None.
+        '''
+
+        if routing_key is None:
+            self._entries.clear()
+        else:
+            for key in [key for key in self._entries if key[0] == routing_key]:
+                del self._entries[key]
+
+
+class RPCCacheError(Exception):
+    '''The RPCCacheError Exception class.
+    '''
+
+    def __init__(self, message: str):
+        super().__init__(message)
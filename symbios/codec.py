@@ -0,0 +1,396 @@
+'''
+@desc    The codec registry of the message bodies.
+@author  arthuchaut <arthuchaut@gmail.com>
+@version 0.1.0
+@date    2026-10-18
+@note    0.1.0 (2026-10-18): Writed the first drafts.
+'''
+
+from typing import Any, Dict, Tuple, Union
+from abc import ABC, abstractmethod
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+class CodecABC(ABC):
+    '''The CodecABC declaration.
+
+    Abstract class for defining a body codec.
+
+    Attributes:
+        content_type (str): The content-type handled by the codec.
+        types (Tuple[type, ...]): The Python types serialized by default
+            with the codec.
+    '''
+
+    content_type: str = None
+    types: Tuple[type, ...] = ()
+
+    @abstractmethod
+    def encode(self, body: Any) -> bytes:
+        '''Serialize a body.
+
+        Args:
+            body (Any): The body to serialize.
+
+        Returns:
+            bytes: The serialized body.
+        '''
+
+        pass
+
+    def accepts(self, body: Any) -> bool:
+        '''Tell if the codec could serialize a body.
+
+        By default, a codec serializes the bodies of its types, or any
+        body if it has no type.
+
+        Args:
+            body (Any): The body to serialize.
+
+        Returns:
+            bool: True if the body could be serialized.
+        '''
+
+        return not self.types or isinstance(body, self.types)
+
+    @abstractmethod
+    def decode(self, body: bytes) -> Any:
+        '''Deserialize a body.
+
+        Args:
+            body (bytes): The body to deserialize.
+
+        Returns:
+            Any: The deserialized body.
+        '''
+
+        pass
+
+
+class TextCodec(CodecABC):
+    '''The TextCodec class declaration.
+
+    Serialize the scalars to their utf-8 string representation.
+    '''
+
+    content_type: str = 'text/plain'
+    types: Tuple[type, ...] = (str, bool, int, float)
+
+    def encode(self, body: Any) -> bytes:
+        '''Serialize a scalar to utf-8.
+
+        Args:
+            body (Any): The body to serialize.
+
+        Returns:
+            bytes: The serialized body.
+        '''
+
+        return str(body).encode()
+
+    def decode(self, body: bytes) -> str:
+        '''Deserialize an utf-8 body.
+
+        Args:
+            body (bytes): The body to deserialize.
+
+        Returns:
+            str: The deserialized body.
+        '''
+
+        return str(body, 'utf-8')
+
+
+class JsonCodec(CodecABC):
+    '''The JsonCodec class declaration.
+
+    Use orjson if it is installed, else the stdlib json module.
+    The bodies orjson refuses, e.g. the dicts with non-str keys,
+    are serialized with the stdlib json module.
+    '''
+
+    content_type: str = 'application/json'
+    types: Tuple[type, ...] = (dict, list)
+
+    def encode(self, body: Any) -> bytes:
+        '''Serialize a body to JSON.
+
+        Args:
+            body (Any): The body to serialize.
+
+        Returns:
+            bytes: The serialized body.
+        '''
+
+        if not orjson is None:
+            try:
+                return orjson.dumps(body)
+            except TypeError:
+                pass
+
+        return json.dumps(body).encode()
+
+    def decode(self, body: bytes) -> Any:
+        '''Deserialize a JSON body.
+
+        Args:
+            body (bytes): The body to deserialize.
+
+        Returns:
+            Any: The deserialized body.
+        '''
+
+        if not orjson is None:
+            return orjson.loads(body)
+
+        return json.loads(str(body, 'utf-8'))
+
+
+class BytesCodec(CodecABC):
+    '''The BytesCodec class declaration.
+
+    Pass the raw buffers through without re-encoding nor copying them.
+    '''
+
+    content_type: str = 'application/octet-stream'
+    types: Tuple[type, ...] = (bytes, bytearray, memoryview)
+
+    def encode(
+        self, body: Union[bytes, bytearray, memoryview]
+    ) -> Union[bytes, bytearray, memoryview]:
+        '''Return the buffer itself.
+
+        A memoryview of multi-bytes items is cast to a bytes view,
+        so that its length is its size in bytes.
+
+        Args:
+            body (Union[bytes, bytearray, memoryview]): The raw body.
+
+        Returns:
+            Union[bytes, bytearray, memoryview]: The same buffer.
+        '''
+
+        if isinstance(body, memoryview) and body.format != 'B':
+            return body.cast('B')
+
+        return body
+
+    def decode(self, body: bytes) -> bytes:
+        '''Return the buffer itself.
+
+        Args:
+            body (bytes): The raw body.
+
+        Returns:
+            bytes: The same buffer.
+        '''
+
+        return body
+
+
+class MsgpackCodec(CodecABC):
+    '''The MsgpackCodec class declaration.
+
+    Only registered if msgpack is installed. It isn't associated with
+    any Python type, so set the content-type of the emitted messages
+    to use it.
+    '''
+
+    content_type: str = 'application/msgpack'
+
+    def accepts(self, body: Any) -> bool:
+        '''Tell if the codec could serialize a body.
+
+        The raw buffers are not serialized: they are already packed.
+
+        Args:
+            body (Any): The body to serialize.
+
+        Returns:
+            bool: True if the body is not a raw buffer.
+        '''
+
+        return not isinstance(body, (bytes, bytearray, memoryview))
+
+    def encode(self, body: Any) -> bytes:
+        '''Serialize a body to msgpack.
+
+        Args:
+            body (Any): The body to serialize.
+
+        Returns:
+            bytes: The serialized body.
+        '''
+
+        return msgpack.packb(body)
+
+    def decode(self, body: bytes) -> Any:
+        '''Deserialize a msgpack body.
+
+        Args:
+            body (bytes): The body to deserialize.
+
+        Returns:
+            Any: The deserialized body.
+        '''
+
+        return msgpack.unpackb(body)
+
+
+class CodecRegistry:
+    '''The CodecRegistry class declaration.
+
+    Associate the codecs with their content-type and their Python types.
+
+    Attributes:
+        _by_content_type (Dict[str, CodecABC]): The codecs
+            by content-type.
+        _by_type (Dict[type, CodecABC]): The codecs by Python type.
+    '''
+
+    def __init__(self):
+        '''The CodecRegistry initializer.
+
+        Register the standard codecs.
+        '''
+
+        self._by_content_type: Dict[str, CodecABC] = {}
+        self._by_type: Dict[type, CodecABC] = {}
+
+        self.register(TextCodec())
+        self.register(JsonCodec())
+        self.register(BytesCodec())
+
+        if not msgpack is None:
+            self.register(MsgpackCodec())
+
+    def register(self, codec: CodecABC) -> None:
+        '''Register a codec, replacing the one of the same content-type
+        and the ones of the same Python types.
+
+        Args:
+            codec (CodecABC): The codec instance to register.
+
+        Raises:
+            CodecError: If the codec is not an instance of CodecABC.
+        '''
+
+        if not isinstance(codec, CodecABC):
+            raise CodecError(
+                f'Expected an instance of CodecABC, {type(codec)} given.'
+            )
+
+        self._by_content_type[codec.content_type] = codec
+
+        for body_type in codec.types:
+            self._by_type[body_type] = codec
+
+    def get(self, content_type: str) -> CodecABC:
+        '''Retrieve the codec of a content-type.
+
+        Args:
+            content_type (str): The content-type.
+
+        Returns:
+            CodecABC: The codec or None.
+        '''
+
+        return self._by_content_type.get(content_type)
+
+    def content_type_of(self, body: Any) -> str:
+        '''Determine the content-type via the body type.
+
+        Args:
+            body (Any): The message body.
+
+        Returns:
+            str: The content-type retrieved or ''.
+        '''
+
+        codec: CodecABC = self._codec_of(body)
+
+        return '' if codec is None else codec.content_type
+
+    def encode(self, body: Any, content_type: str = None) -> bytes:
+        '''Serialize a body with the codec of the content-type if it
+        accepts the body type, else with the codec of the body type.
+
+        E.g. a dict emitted as text/plain is serialized to JSON, and
+        a str emitted as application/json is taken as already JSON.
+
+        Args:
+            body (Any): The body to serialize.
+            content_type (str): The content-type. Default to None.
+
+        Raises:
+            CodecError: If no codec could serialize the body.
+
+        Returns:
+            bytes: The serialized body.
+        '''
+
+        codec: CodecABC = self.get(content_type)
+
+        if codec is None or not codec.accepts(body):
+            codec = self._codec_of(body)
+
+        if codec is None:
+            raise CodecError(
+                f'Type {type(body).__name__} is not serializable.'
+            )
+
+        try:
+            return codec.encode(body)
+        except (TypeError, ValueError, OverflowError) as e:
+            raise CodecError(
+                f'Type {type(body).__name__} is not serializable: {e}'
+            )
+
+    def decode(self, body: bytes, content_type: str = None) -> Any:
+        '''Deserialize a body with the codec of the content-type,
+        or as text if the content-type is unknown.
+
+        Args:
+            body (bytes): The body to deserialize.
+            content_type (str): The content-type. Default to None.
+
+        Returns:
+            Any: The deserialized body.
+        '''
+
+        codec: CodecABC = self.get(content_type) or self.get(
+            TextCodec.content_type
+        )
+
+        return codec.decode(body)
+
+    def _codec_of(self, body: Any) -> CodecABC:
+        '''Retrieve the codec of the body type or of its parent classes.
+
+        Args:
+            body (Any): The message body.
+
+        Returns:
+            CodecABC: The codec or None.
+        '''
+
+        for body_type in type(body).__mro__:
+            if body_type in self._by_type:
+                return self._by_type[body_type]
+
+        return None
+
+
+class CodecError(Exception):
+    '''The CodecError exception class.
+    '''
@@ -1,3 +1,8 @@
+import asyncio
+from asyncio import Future, Semaphore
+from functools import partial
+from typing import Awaitable
+
 import pamqp
 
 from pamqp.specification import Basic
@@ -16,10 +21,18 @@ class EmitACK:
 
 class ListenACK:
     '''The consumer frame confirmation class.
+
+    Attributes:
+        confirmation (Basic.ConsumeOk): The confirmation frame.
+        prefetch (PrefetchStats): The measurements of an adaptive
+            prefetch, or None.
     '''
 
-    def __init__(self, confirmation: Basic.ConsumeOk):
+    def __init__(
+        self, confirmation: Basic.ConsumeOk, prefetch: object = None
+    ):
         self.confirmation: Basic.ConsumeOk = confirmation
+        self.prefetch: object = prefetch
 
 
 class ExchangeACK:
@@ -36,3 +49,82 @@ class QueueACK:
 
     def __init__(self, confirmation: Queue.DeclareOk):
         self.confirmation: Queue.DeclareOk = confirmation
+
+
+class ConfirmWindow:
+    '''The ConfirmWindow class declaration.
+
+    Bounds the number of messages published on a channel and not yet
+    confirmed by the broker. The channel resolves the confirmations,
+    including the ones acknowledging multiple delivery tags at once.
+
+    Attributes:
+        max_in_flight (int): The maximum number of unconfirmed messages.
+        in_flight (int): The current number of unconfirmed messages.
+        _semaphore (Semaphore): Holds a slot per unconfirmed message.
+            Created on the first push to be bound to the running loop.
+    '''
+
+    def __init__(self, max_in_flight: int):
+        '''The ConfirmWindow initializer.
+
+        Args:
+            max_in_flight (int): The maximum number of unconfirmed messages.
+        '''
+
+        self.max_in_flight: int = max_in_flight
+        self.in_flight: int = 0
+        self._semaphore: Semaphore = None
+
+    async def push(self, publish: Awaitable) -> Future:
+        '''Start a publication once a slot of the window is free.
+
+        Args:
+            publish (Awaitable): The channel publication, that returns
+                the confirmation frame.
+
+        Returns:
+            Future: The future resolved with the EmitACK, or with the
+                delivery error if the broker nacked the message.
+        '''
+
+        if self._semaphore is None:
+            self._semaphore = Semaphore(self.max_in_flight)
+
+        try:
+            await self._semaphore.acquire()
+        except BaseException:
+            if asyncio.iscoroutine(publish):
+                publish.close()
+
+            raise
+
+        self.in_flight += 1
+
+        produce_ok: Future = asyncio.get_event_loop().create_future()
+        asyncio.ensure_future(publish).add_done_callback(
+            partial(self._on_confirm, produce_ok)
+        )
+
+        return produce_ok
+
+    def _on_confirm(self, produce_ok: Future, confirmation: Future) -> None:
+        '''Free the slot and resolve the future of the message.
+
+        Args:
+            produce_ok (Future): The future returned by push().
+            confirmation (Future): The finished publication.
+        '''
+
+        self.in_flight -= 1
+        self._semaphore.release()
+
+        if produce_ok.done():
+            return
+
+        if confirmation.cancelled():
+            produce_ok.cancel()
+        elif not confirmation.exception() is None:
+            produce_ok.set_exception(confirmation.exception())
+        else:
+            produce_ok.set_result(EmitACK(confirmation.result()))
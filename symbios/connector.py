@@ -1,29 +1,372 @@
 '''
 @desc    The broker connector class.
 @author  arthuchaut <arthuchaut@gmail.com>
-@version 0.1.0
+@version 0.3.0
 @date    2019-09-20
 @note    0.1.0 (2019-09-20): Writed the first drafts.
+@note    0.2.0 (2026-10-18): Implemented the channel pools.
+@note    0.3.0 (2026-10-18): Implemented the multi-connection pool.
 '''
 
 import asyncio
+from asyncio import Lock, Semaphore
 from asyncio.events import AbstractEventLoop
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Callable, Awaitable, AsyncIterator, Deque, List
+from weakref import WeakKeyDictionary
+from zlib import crc32
 
 import aiormq
 from aiormq import Connection, Channel
 from aiormq.exceptions import ProbableAuthenticationError
 
+from .topology import TopologyCache
+from .confirmation import ConfirmWindow
+from .ack import AckCoalescer
+
+
+class ChannelPool:
+    '''The ChannelPool class declaration.
+
+    A bounded pool of reusable channels opened on the same connection.
+    A channel is leased with acquire() and given back with release().
+    Closed channels are discarded instead of being handed out again.
+
+    Attributes:
+        size (int): The maximum number of channels owned by the pool.
+        _opener (Callable[[], Awaitable[Channel]]): The coroutine function
+            that opens a new channel.
+        _on_discard (Callable[[Channel], None]): The callback called
+            when a closed channel is discarded.
+        _idle (Deque[Channel]): The released channels ready to be reused.
+        _semaphore (Semaphore): Bounds the number of leased channels.
+            Created on the first lease to be bound to the running loop.
+    '''
+
+    def __init__(
+        self,
+        opener: Callable[[], Awaitable[Channel]],
+        size: int,
+        *,
+        on_discard: Callable[[Channel], None] = None,
+    ):
+        '''The ChannelPool initializer.
+
+        Args:
+            opener (Callable[[], Awaitable[Channel]]): The coroutine
+                function that opens a new channel.
+            size (int): The maximum number of channels owned by the pool.
+            on_discard (Callable[[Channel], None]): The callback called
+                when a closed channel is discarded. Default to None.
+
+        Raises:
+            ChannelPoolError: If the size is lower than 1.
+        '''
+
+        if size < 1:
+            raise ChannelPoolError(f'Expected a pool size >= 1, {size} given.')
+
+        self.size: int = size
+        self._opener: Callable[[], Awaitable[Channel]] = opener
+        self._on_discard: Callable[[Channel], None] = on_discard
+        self._idle: Deque[Channel] = deque()
+        self._semaphore: Semaphore = None
+
+    async def acquire(self) -> Channel:
+        '''Lease a channel from the pool.
+
+        Reuse an idle channel if one is still open, else open a new one.
+        Wait for a release if all the channels are already leased.
+
+        Returns:
+            Channel: The leased channel.
+        '''
+
+        if self._semaphore is None:
+            self._semaphore = Semaphore(self.size)
+
+        await self._semaphore.acquire()
+
+        try:
+            while self._idle:
+                chann: Channel = self._idle.popleft()
+
+                if not chann.is_closed:
+                    return chann
+
+                self._discard(chann)
+
+            return await self._opener()
+        except BaseException:
+            self._semaphore.release()
+            raise
+
+    def release(self, chann: Channel) -> None:
+        '''Give a leased channel back to the pool.
+
+        Args:
+            chann (Channel): The channel returned by acquire().
+        '''
+
+        if not chann.is_closed:
+            self._idle.append(chann)
+        else:
+            self._discard(chann)
+
+        self._semaphore.release()
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[Channel]:
+        '''Lease a channel for the duration of an async with block.
+
+        Yields:
+            Channel: The leased channel.
+        '''
+
+        chann: Channel = await self.acquire()
+
+        try:
+            yield chann
+        finally:
+            self.release(chann)
+
+    def clear(self) -> None:
+        '''Forget all the idle channels.
+        '''
+
+        self._idle.clear()
+
+    def _discard(self, chann: Channel) -> None:
+        '''Notify that a closed channel has left the pool.
+
+        Args:
+            chann (Channel): The closed channel.
+        '''
+
+        if not self._on_discard is None:
+            self._on_discard(chann)
+
+
+class ConnectionStats:
+    '''The ConnectionStats class declaration.
+
+    The traffic counters of one broker connection.
+
+    Attributes:
+        index (int): The connection index in the Connector.
+        channels (int): The number of channels opened.
+        published (int): The number of messages emitted.
+        consumers (int): The number of consumers registered.
+    '''
+
+    def __init__(self, index: int):
+        '''The ConnectionStats initializer.
+
+        Args:
+            index (int): The connection index in the Connector.
+        '''
+
+        self.index: int = index
+        self.channels: int = 0
+        self.published: int = 0
+        self.consumers: int = 0
+
+
+class Link:
+    '''The Link class declaration.
+
+    One broker connection with its own channel pools and its own
+    declaration cache.
+
+    Attributes:
+        _connector (Connector): The Connector owning the link.
+        _connection (Connection): The broker established connection.
+        publish_pool (ChannelPool): The channels used to emit messages.
+        consume_pool (ChannelPool): The channels used for the short
+            operations of the listeners, as the queue declarations.
+            The listeners consume on their own channel.
+        topology (TopologyCache): The exchanges and queues already
+            declared on the connection.
+        _max_in_flight (int): The maximum number of unconfirmed messages
+            per channel.
+        _windows (WeakKeyDictionary): The confirmation window 
+            of each channel.
+        _ackers (WeakKeyDictionary): The acknowledgment coalescer
+            of each channel.
+        stats (ConnectionStats): The traffic counters of the connection.
+        _lock (Lock): Establishes and closes the connection once at
+            a time, so that the concurrent first leases share it.
+        connection (Connection): The broker established connection.
+            Create a connection if isn't exists or if it was closed.
+    '''
+
+    def __init__(
+        self,
+        connector: object,
+        index: int,
+        pool_size: int,
+        max_in_flight: int,
+    ):
+        '''The Link initializer.
+
+        Args:
+            connector (Connector): The Connector owning the link.
+            index (int): The link index in the Connector.
+            pool_size (int): The maximum number of channels of each
+                channel pool.
+            max_in_flight (int): The maximum number of unconfirmed
+                messages per channel.
+        '''
+
+        self._connector: object = connector
+        self._connection: Connection = None
+        self.publish_pool: ChannelPool = ChannelPool(
+            self.open_channel, pool_size, on_discard=self._on_discard
+        )
+        self.consume_pool: ChannelPool = ChannelPool(
+            self.open_channel, pool_size, on_discard=self._on_discard
+        )
+        self.topology: TopologyCache = TopologyCache()
+        self._max_in_flight: int = max_in_flight
+        self._windows: WeakKeyDictionary = WeakKeyDictionary()
+        self._ackers: WeakKeyDictionary = WeakKeyDictionary()
+        self.stats: ConnectionStats = ConnectionStats(index)
+        self._lock: Lock = None
+
+    @property
+    async def connection(self) -> Connection:
+        '''The broker connection.
+        Create a connection if it isn't created yet.
+        Reconnect and forget the pooled channels and the declarations
+        if the connection was closed.
+
+        Raises:
+            ConnectorError: If the connection couldn't be established.
+
+        Returns:
+            Connection: The broker connection.
+        '''
+
+        if self._lock is None:
+            self._lock = Lock()
+
+        async with self._lock:
+            if not self._connection is None and self._connection.is_closed:
+                self._reset()
+
+            if self._connection is None:
+                try:
+                    self._connection = await aiormq.connect(
+                        self._connector._url,
+                        loop=self._connector.event_loop,
+                    )
+                except Exception as e:
+                    raise ConnectorError(e)
+
+            return self._connection
+
+    async def open_channel(self) -> Channel:
+        '''Open a new channel on the broker connection.
+
+        The channel isn't pooled: the caller owns it, as the consumers
+        that need their own QoS.
+
+        Returns:
+            Channel: The opened channel.
+        '''
+
+        chann: Channel = await (await self.connection).channel()
+        self.stats.channels += 1
+
+        return chann
+
+    def window(self, chann: Channel) -> ConfirmWindow:
+        '''The confirmation window of a channel.
+
+        Args:
+            chann (Channel): A channel of the connection.
+
+        Returns:
+            ConfirmWindow: The window, created on the first call.
+        '''
+
+        if not chann in self._windows:
+            self._windows[chann] = ConfirmWindow(self._max_in_flight)
+
+        return self._windows[chann]
+
+    def acker(self, chann: Channel) -> AckCoalescer:
+        '''The acknowledgment coalescer of a channel.
+
+        Shared by all the consumers of the channel, since the multiple
+        acks cover all its deliveries.
+
+        Args:
+            chann (Channel): A channel of the connection.
+
+        Returns:
+            AckCoalescer: The coalescer, created on the first call.
+        '''
+
+        if not chann in self._ackers:
+            self._ackers[chann] = AckCoalescer(chann)
+
+        return self._ackers[chann]
+
+    async def close(self) -> None:
+        '''Close the broker connection if it is established.
+        '''
+
+        if self._lock is None:
+            self._lock = Lock()
+
+        async with self._lock:
+            if self._connection is not None:
+                connection: Connection = self._connection
+                self._reset()
+                await connection.close()
+
+    def _reset(self) -> None:
+        '''Forget the connection, its pooled channels and declarations.
+        '''
+
+        self._connection = None
+        self.publish_pool.clear()
+        self.consume_pool.clear()
+        self.topology.clear()
+
+    def _on_discard(self, chann: Channel) -> None:
+        '''Forget the declarations when a pooled channel was closed.
+
+        A channel is closed by the broker on a declaration error,
+        so the cached declarations could be wrong.
+
+        Args:
+            chann (Channel): The closed channel.
+        '''
+
+        self.topology.clear()
+
 
 class Connector:
-    '''Class allowing to create a connection to the broker.
+    '''Class allowing to create connections to the broker.
 
     Attributes:
+        ROUND_ROBIN (str): Spread the emitted messages over the
+            connections one after the other.
+        ROUTING_KEY (str): Send the messages of a same routing_key
+            through the same connection.
         _DEFAULT_PROTOCOL (str): The broker communication protocol.
         _DEFAULT_HOST (str): The broker hostname or ip address.
         _DEFAULT_VHOST (str): The connection virtual host.
         _DEFAULT_PORT (int): The broker listening port.
         _DEFAULT_USER (str): The username to connect.
         _DEFAULT_PASSWORD (str): The password to connect.
+        _DEFAULT_POOL_SIZE (int): The maximum number of channels per pool.
+        _DEFAULT_CONNECTIONS (int): The number of broker connections.
+        _DEFAULT_MAX_IN_FLIGHT (int): The maximum number of unconfirmed
+            messages per channel.
 
         _protocol (str): The broker communication protocol. 
         _host (str): The broker hostname or ip address.
@@ -31,21 +374,35 @@ class Connector:
         _port (int): The broker listening port.
         _user (str): The username to connect.
         _password (str): The password to connect.
-        _connection (Connection): The broker established connection.
+        _sharding (str): The strategy to spread the emitted messages.
+        links (List[Link]): The broker connections.
+        _publish_cursor (int): The round-robin cursor of the emitters.
+        _consume_cursor (int): The round-robin cursor of the listeners.
         event_loop (AbstractEventLoop): The asyncio event loop.
             Try to get the running event loop, else create a new instance.
         _url (str): The built url for establishing the broker connection.
-        connection (Connection): The broker established connection.
+        connection (Connection): The first broker connection.
             Create a connection if isn't exists.
-        channel (Channel): The connection channel.
+        publish_pool (ChannelPool): The publishing pool of the 
+            first connection.
+        consume_pool (ChannelPool): The consuming pool of the
+            first connection.
+        channel (Channel): A channel of the publishing pool.
+        stats (List[ConnectionStats]): The counters of each connection.
     '''
 
+    ROUND_ROBIN: str = 'round_robin'
+    ROUTING_KEY: str = 'routing_key'
+
     _DEFAULT_PROTOCOL: str = 'amqp'
     _DEFAULT_HOST: str = 'localhost'
     _DEFAULT_VHOST: str = '/'
     _DEFAULT_PORT: int = 5672
     _DEFAULT_USER: str = 'guest'
     _DEFAULT_PASSWORD: str = 'guest'
+    _DEFAULT_POOL_SIZE: int = 10
+    _DEFAULT_CONNECTIONS: int = 1
+    _DEFAULT_MAX_IN_FLIGHT: int = 256
 
     def __init__(
         self,
@@ -56,6 +413,10 @@ class Connector:
         port: int = _DEFAULT_PORT,
         user: str = _DEFAULT_USER,
         password: str = _DEFAULT_PASSWORD,
+        pool_size: int = _DEFAULT_POOL_SIZE,
+        connections: int = _DEFAULT_CONNECTIONS,
+        sharding: str = ROUND_ROBIN,
+        max_in_flight: int = _DEFAULT_MAX_IN_FLIGHT,
     ):
         '''The Connector initializer.
 
@@ -72,20 +433,43 @@ class Connector:
                 Default to _DEFAULT_USER.
             _password (str): The password to connect.
                 Default to _DEFAULT_PASSWORD.
-            _connection (Connection): The broker established connection.
-            _url (str): The built url for establishing the broker connection.
-            connection (Connection): The broker established connection.
-                Create a connection if isn't exists.
-            channel (Channel): The connection channel.
+            pool_size (int): The maximum number of channels of each
+                channel pool. Default to _DEFAULT_POOL_SIZE.
+            connections (int): The number of broker connections.
+                Default to _DEFAULT_CONNECTIONS.
+            sharding (str): The strategy to spread the emitted messages
+                over the connections. ROUND_ROBIN or ROUTING_KEY.
+                Default to ROUND_ROBIN.
+            max_in_flight (int): The maximum number of messages emitted
+                on a channel and not yet confirmed by the broker.
+                Default to _DEFAULT_MAX_IN_FLIGHT.
+
+        Raises:
+            ConnectorError: If the number of connections is lower than 1
+                or if the sharding strategy is unknown.
         '''
 
+        if connections < 1:
+            raise ConnectorError(
+                f'Expected at least 1 connection, {connections} given.'
+            )
+
+        if not sharding in [Connector.ROUND_ROBIN, Connector.ROUTING_KEY]:
+            raise ConnectorError(f'Unknown sharding strategy {sharding}.')
+
         self._protocol: str = protocol
         self._host: str = host
         self._vhost: str = Connector._DEFAULT_VHOST + vhost
         self._port: int = port
         self._user: str = user
         self._password: str = password
-        self._connection: Connection = None
+        self._sharding: str = sharding
+        self.links: List[Link] = [
+            Link(self, index, pool_size, max_in_flight)
+            for index in range(connections)
+        ]
+        self._publish_cursor: int = 0
+        self._consume_cursor: int = 0
 
     @property
     def event_loop(self) -> AbstractEventLoop:
@@ -123,7 +507,7 @@ class Connector:
 
     @property
     async def connection(self) -> Connection:
-        '''The broker connection.
+        '''The first broker connection.
         Create a connection if it isn't created yet.
 
         Raises:
@@ -133,27 +517,109 @@ class Connector:
             Connection: The broker connection.
         '''
 
-        if self._connection is None:
-            try:
-                self._connection = await aiormq.connect(
-                    self._url, loop=self.event_loop
-                )
-            except Exception as e:
-                raise ConnectorError(e)
+        return await self.links[0].connection
+
+    @property
+    def publish_pool(self) -> ChannelPool:
+        '''The publishing pool of the first connection.
+
+        Returns:
+            ChannelPool: The channel pool.
+        '''
 
-        return self._connection
+        return self.links[0].publish_pool
+
+    @property
+    def consume_pool(self) -> ChannelPool:
+        '''The consuming pool of the first connection.
+
+        Returns:
+            ChannelPool: The channel pool.
+        '''
+
+        return self.links[0].consume_pool
 
     @property
     async def channel(self) -> Channel:
-        '''The connection channel.
+        '''A channel of the publishing pool.
+
+        The channel is released at once, so it could be shared with
+        the other publishers of the pool.
 
         Returns:
             Channel: The connection channel.
         '''
 
-        return await (await self.connection).channel()
+        async with self.publish_pool.lease() as chann:
+            return chann
+
+    @property
+    def stats(self) -> List[ConnectionStats]:
+        '''The traffic counters of each connection.
+
+        Returns:
+            List[ConnectionStats]: The counters, by connection index.
+        '''
+
+        return [link.stats for link in self.links]
+
+    def publish_link(self, routing_key: str = None) -> Link:
+        '''Pick the connection to emit a message.
+
+        Args:
+            routing_key (str): The message routing key. Default to None.
+
+        Returns:
+            Link: The picked connection.
+        '''
+
+        if self._sharding == Connector.ROUTING_KEY and routing_key:
+            return self.links[
+                crc32(routing_key.encode()) % len(self.links)
+            ]
+
+        link: Link = self.links[self._publish_cursor % len(self.links)]
+        self._publish_cursor += 1
+
+        return link
+
+    def consume_link(self, connection: int = None) -> Link:
+        '''Pick the connection to listen a queue.
+
+        Args:
+            connection (int): The index of the connection to pin the
+                listener on. Picked by round-robin if None.
+                Default to None.
+
+        Raises:
+            ConnectorError: If the connection index doesn't exist.
+
+        Returns:
+            Link: The picked connection.
+        '''
+
+        if connection is None:
+            connection = self._consume_cursor % len(self.links)
+            self._consume_cursor += 1
+
+        if not 0 <= connection < len(self.links):
+            raise ConnectorError(f'No connection at index {connection}.')
+
+        return self.links[connection]
+
+    async def close(self) -> None:
+        '''Close all the broker connections.
+        '''
+
+        for link in self.links:
+            await link.close()
 
 
 class ConnectorError(Exception):
     '''The ConnectorError exception class.
     '''
+
+
+class ChannelPoolError(Exception):
+    '''The ChannelPoolError exception class.
+    '''
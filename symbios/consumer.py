@@ -1,20 +1,109 @@
 '''
 @desc    The consumer class for listen message from the broker.
 @author  arthuchaut <arthuchaut@gmail.com>
-@version 0.1.0
+@version 0.7.0
 @date    2019-09-20
 @note    0.1.0 (2019-09-20): Writed the first drafts.
+@note    0.2.0 (2026-10-18): Added the QoS, the bounded concurrency and
+                             the settlement of the messages.
+@note    0.3.0 (2026-10-18): Added the batch consumer.
+@note    0.4.0 (2026-10-18): Added the thread and process executions.
+@note    0.5.0 (2026-10-18): Added the pull consumer.
+@note    0.6.0 (2026-10-18): Added the partitioned dispatch.
+@note    0.7.0 (2026-10-18): Added the adaptive prefetch.
 '''
 
+import os
+import pickle
 import asyncio
+from asyncio import Semaphore, Lock, TimerHandle, Future
+from concurrent.futures import Executor, ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor
+from enum import Enum
+from collections import deque
 
-from typing import Callable, Awaitable, Any
+from typing import Callable, Any, List, Tuple, Deque, Hashable
 
-from .utils import Channel, DeliveredMessage, ArgumentsType
+from pamqp.specification import Basic
+
+from .utils import Channel, DeliveredMessage, ArgumentsType, Props
+from .connector import Link
 from .message import IncomingMessage
 from .queue import Queue
 from .middleware import MiddlewareLibrary, Event
-from .confirmation import ListenACK, QueueACK
+from .confirmation import ListenACK
+from .batch import BatchEnvelope, BatchEnvelopeError
+from .ack import AckCoalescer
+from .codec import CodecRegistry
+from .prefetch import AdaptivePrefetch, PrefetchTuner
+
+from middlewares.deserializer_middleware import DeserializerMiddleware
+
+
+class Execution(Enum):
+    '''The Execution enumeration declaration.
+
+    Defines where the task of a consumer runs.
+
+    Attributes:
+        LOOP (int): The task is a coroutine function awaited on
+            the event loop.
+        THREAD (int): The task is a blocking function called in
+            a thread pool.
+        PROCESS (int): The task is a picklable function called in
+            a process pool. Use it for the CPU-bound tasks.
+    '''
+
+    LOOP: int = 0
+    THREAD: int = 1
+    PROCESS: int = 2
+
+
+def _call_task(
+    task: Callable[[Any, Props], None],
+    codecs: CodecRegistry,
+    body: bytes,
+    props: Props,
+) -> None:
+    '''Deserialize a body and call the task with it, in a worker.
+
+    Args:
+        task (Callable[[Any, Props], None]): The task to call.
+        codecs (CodecRegistry): The codecs of the Symbios instance.
+        body (bytes): The raw body.
+        props (Props): The message properties.
+    '''
+
+    task(codecs.decode(body, props.content_type), props)
+
+
+_worker: Tuple[Callable[[Any, Props], None], CodecRegistry] = None
+
+
+def _bind_worker(
+    task: Callable[[Any, Props], None], codecs: CodecRegistry
+) -> None:
+    '''Bind the task and the codecs to a worker process, once at its
+    start, so that they aren't sent with each message.
+
+    Args:
+        task (Callable[[Any, Props], None]): The task to call.
+        codecs (CodecRegistry): The codecs of the Symbios instance.
+    '''
+
+    global _worker
+    _worker = (task, codecs)
+
+
+def _call_bound_task(body: bytes, props: Props) -> None:
+    '''Deserialize a body and call the task bound to the worker process.
+
+    Args:
+        body (bytes): The raw body.
+        props (Props): The message properties.
+    '''
+
+    _call_task(*_worker, body, props)
 
 
 class Consumer:
@@ -23,19 +112,52 @@ class Consumer:
     Listen message from the broker.
 
     Attributes:
+        _DEFAULT_LANES (int): The default number of lanes of
+            the partitioned messages.
+        _DEFAULT_LANE_DEPTH (int): The default number of messages per
+            lane held by the QoS.
+
         symbios (Symbios): The Symbios instance.
         queue (str): The queue to consume.
         no_ack (bool): If deliver an aknowlegment or not.
         exclusive (bool): Only one consumer registered to the targeted queue.
         arguments (ArgumentsType): Some properties to the consumer.
         consumer_tag (str): The consumer identity.
+        connection (int): The index of the connection to listen on.
+        prefetch_count (int): The maximum number of unacknowledged
+            messages delivered to the consumer.
+        prefetch_size (int): The maximum size (in bytes) of the
+            unacknowledged messages delivered to the consumer.
+        concurrency (int): The maximum number of tasks running
+            at once.
+        execution (Execution): Where the task runs.
+        workers (int): The number of workers of the pool.
+        partition (Callable[[IncomingMessage], Hashable]): The key
+            of the messages processed in order.
+        lanes (int): The number of lanes of the partitioned messages.
+        lane_depth (int): The number of messages per lane held
+            by the QoS.
+        adaptive (AdaptivePrefetch): The tuning policy of the prefetch.
+        tuner (PrefetchTuner): The tuner of the prefetch and its
+            measurements, with an adaptive prefetch.
         task (Callable[[Symbios, IncomingMessage], None]): 
             The task to call when a message arrives.
         declare_ok (Any): The future of the declared queue.
         consume_ok (Any): The future of the consumed queue.
         _midd_library (MiddlewareLibrary): The Symbios middleware library.
+        _channel (Channel): The channel delivering the messages.
+        _acker (AckCoalescer): The acknowledgments of the channel.
+        _semaphore (Semaphore): Holds a slot per running task.
+            Created on the first delivery to be bound to the running loop.
+        _executor (Executor): The pool of workers running the task,
+            unless it runs on the loop.
+        _tails (List[Future]): The completion of the last message
+            of each lane, or None once the lane is idle.
     '''
 
+    _DEFAULT_LANES: int = 16
+    _DEFAULT_LANE_DEPTH: int = 4
+
     def __init__(
         self,
         *,
@@ -45,10 +167,26 @@ class Consumer:
         exclusive: bool = False,
         arguments: ArgumentsType = None,
         consumer_tag: str = None,
+        connection: int = None,
+        prefetch_count: int = None,
+        prefetch_size: int = None,
+        concurrency: int = None,
+        execution: Execution = Execution.LOOP,
+        workers: int = None,
+        partition: Callable[[IncomingMessage], Hashable] = None,
+        lanes: int = _DEFAULT_LANES,
+        lane_depth: int = _DEFAULT_LANE_DEPTH,
+        adaptive: AdaptivePrefetch = None,
         midd_library: MiddlewareLibrary,
     ):
         '''The Consumer initializer.
 
+        With the THREAD or PROCESS execution, the task is called in
+        a pool of workers as task(body, props), with the deserialized
+        body and the message properties. The listening middlewares
+        still run on the loop, but the body is deserialized in the
+        worker, and the message is settled back on the loop.
+
         Args:
             symbios (Symbios): The Symbios instance.
             queue (str): The queue to consume. Default to Queue().
@@ -59,40 +197,221 @@ class Consumer:
             arguments (ArgumentsType): Some properties to the consumer.
                 Default to None.
             consumer_tag (str): The consumer identity. Default to None.
+            connection (int): The index of the connection to listen on.
+                Picked by round-robin if None. Default to None.
+            prefetch_count (int): The maximum number of unacknowledged
+                messages delivered to the consumer. Default to twice
+                the concurrency, or unlimited if None.
+            prefetch_size (int): The maximum size (in bytes) of the
+                unacknowledged messages delivered to the consumer.
+                Not supported by RabbitMQ. Default to None.
+            concurrency (int): The maximum number of tasks running
+                at once. Unlimited if None, or the number of workers
+                of the pool. Default to None.
+            execution (Execution): Where the task runs.
+                Default to Execution.LOOP.
+            workers (int): The number of workers of the pool. Default to
+                the number of CPUs for the processes, and to four more
+                for the threads.
+            partition (Callable[[IncomingMessage], Hashable]): The key
+                of the messages processed in order, e.g. a header,
+                the routing key or a body field. Default to None.
+            lanes (int): The number of lanes of the partitioned
+                messages. Default to _DEFAULT_LANES.
+            lane_depth (int): The number of messages per lane held by
+                the QoS, which defaults to lanes * lane_depth with
+                a partition function. Default to _DEFAULT_LANE_DEPTH.
+            adaptive (AdaptivePrefetch): The tuning policy of
+                the prefetch, which replaces prefetch_count.
+                Default to None.
             midd_library (MiddlewareLibrary): The Symbios middleware library.
+
+        Raises:
+            ConsumerError: If the concurrency, the number of workers,
+                the number of lanes or their depth is lower than 1.
         '''
 
+        if lanes < 1 or lane_depth < 1:
+            raise ConsumerError(
+                f'The lanes and their depth must be greater than 0, '
+                f'{lanes} and {lane_depth} given.'
+            )
+
+        if not adaptive is None:
+            prefetch_count = adaptive.initial
+        elif prefetch_count is None and not partition is None:
+            prefetch_count = lanes * lane_depth
+
+        if not workers is None and workers < 1:
+            raise ConsumerError(
+                f'The workers must be greater than 0, {workers} given.'
+            )
+
+        if execution is Execution.PROCESS:
+            workers = workers or os.cpu_count() or 1
+        elif execution is Execution.THREAD:
+            workers = workers or min(32, (os.cpu_count() or 1) + 4)
+
+        if concurrency is None:
+            concurrency = workers
+
+        if not concurrency is None and concurrency < 1:
+            raise ConsumerError(
+                f'The concurrency must be greater than 0, {concurrency} given.'
+            )
+
+        if prefetch_count is None and not concurrency is None:
+            prefetch_count = 2 * concurrency
+
         self.symbios: object = symbios
         self.queue: Queue = queue
         self.no_ack: bool = no_ack
         self.exclusive: bool = exclusive
         self.arguments: ArgumentsType = arguments
         self.consumer_tag: str = consumer_tag
+        self.connection: int = connection
+        self.prefetch_count: int = prefetch_count
+        self.prefetch_size: int = prefetch_size
+        self.concurrency: int = concurrency
+        self.execution: Execution = execution
+        self.workers: int = workers
+        self.partition: Callable[[IncomingMessage], Hashable] = partition
+        self.lanes: int = lanes
+        self.lane_depth: int = lane_depth
+        self.adaptive: AdaptivePrefetch = adaptive
+        self.tuner: PrefetchTuner = None
         self.task: Callable[[object, IncomingMessage], None] = None
         self.declare_ok: Any = None
         self.consume_ok: Any = None
         self._midd_library = midd_library
+        self._channel: Channel = None
+        self._acker: AckCoalescer = None
+        self._semaphore: Semaphore = None
+        self._executor: Executor = None
+        self._tails: List[Future] = [None] * lanes
 
     async def listen(
         self, task: Callable[[object, IncomingMessage], None]
     ) -> ListenACK:
         '''Listen a queue.
 
+        The consumer opens its own channel on the pinned connection,
+        so that the failure of an operation on another channel can't
+        close it, and that its QoS applies to it alone. The queue is
+        declared only once per connection.
+
+        The pool of workers is created here, and shut down with
+        the Symbios instance. The consumer is closed with it as well.
+
         Args:
             task (Callable[[Symbios, IncomingMessage], None]): 
                 The task to call when a message arrives.
 
+        Raises:
+            ConsumerError: If the task of a PROCESS execution
+                is not picklable.
+
         Returns:
             ListenACK: The consumer confirmation.
         '''
 
+        if self.execution is Execution.PROCESS:
+            try:
+                pickle.dumps(task)
+            except Exception as e:
+                raise ConsumerError(f'The task is not picklable: {e}')
+
+            self._executor = ProcessPoolExecutor(
+                self.workers,
+                initializer=_bind_worker,
+                initargs=(task, self.symbios.codecs),
+            )
+        elif self.execution is Execution.THREAD:
+            self._executor = ThreadPoolExecutor(
+                self.workers, thread_name_prefix='symbios'
+            )
+
+        if not self._executor is None:
+            self.symbios.executors.append(self._executor)
+
         self.task = task
-        chann: Channel = await self.symbios.channel
+        link: Link = self.symbios.consume_link(self.connection)
+
+        chann: Channel = await link.open_channel()
+
+        if not (self.prefetch_count is None and self.prefetch_size is None):
+            await self._qos(chann, self.prefetch_count)
+
+        consume_ok = await self._consume(link, chann)
+
+        if not self.adaptive is None:
+            self.tuner = PrefetchTuner(
+                self.adaptive, lambda count: self._qos(chann, count)
+            )
+            self.tuner.start()
+
+        link.stats.consumers += 1
+        self.symbios.consumers.append(self)
+        self.consume_ok = ListenACK(
+            consume_ok, None if self.tuner is None else self.tuner.stats
+        )
+
+        return self.consume_ok
+
+    async def close(self) -> None:
+        '''Stop the adjustments of the prefetch, then close the channel.
+        The broker requeues the unacknowledged messages.
+        '''
 
-        declare_ok = await chann.queue_declare(**self.queue.__dict__)
-        self.declare_ok = QueueACK(declare_ok)
+        if not self.tuner is None:
+            self.tuner.stop()
 
-        consume_ok = await chann.basic_consume(
+        if not self._channel is None and not self._channel.is_closed:
+            await self._acker.flush()
+            await self._channel.close()
+
+    async def _qos(self, chann: Channel, prefetch_count: int) -> None:
+        '''Set the prefetch of the consumer channel.
+
+        An adaptive prefetch is set for the whole channel, since
+        RabbitMQ applies a new prefetch per consumer to the next
+        consumers only.
+
+        Args:
+            chann (Channel): The channel of the consumer.
+            prefetch_count (int): The prefetch.
+        '''
+
+        self.prefetch_count = prefetch_count
+
+        if self.adaptive is None:
+            await chann.basic_qos(
+                prefetch_count=prefetch_count or 0,
+                prefetch_size=self.prefetch_size or 0,
+            )
+        else:
+            await chann.rpc(
+                Basic.Qos(
+                    prefetch_count=prefetch_count,
+                    prefetch_size=self.prefetch_size or 0,
+                    global_=True,
+                )
+            )
+
+    async def _consume(self, link: Link, chann: Channel) -> Any:
+        '''Declare the queue and start consuming it.
+
+        Args:
+            link (Link): The connection to listen on.
+            chann (Channel): The channel delivering the messages.
+
+        Returns:
+            Any: The consumption confirmation frame.
+        '''
+
+        await self._declare(link, chann)
+
+        return await chann.basic_consume(
             self.declare_ok.confirmation.queue,
             self._embed,
             no_ack=self.no_ack,
@@ -101,24 +420,726 @@ class Consumer:
             consumer_tag=self.consumer_tag,
         )
 
-        self.consume_ok = ListenACK(consume_ok)
+    async def _declare(self, link: Link, chann: Channel) -> None:
+        '''Bind the consumer to its channel and declare the queue.
 
-        return self.consume_ok
+        Args:
+            link (Link): The connection to listen on.
+            chann (Channel): The channel delivering the messages.
+        '''
+
+        self._channel = chann
+        self._acker = link.acker(chann)
+        self.declare_ok = await link.topology.declare_queue(chann, self.queue)
 
     async def _embed(self, message: DeliveredMessage) -> None:
         '''Embed the task with the Symbios parameters.
-        
-        Call the associated middlewares and then call the task.
+
+        Count the message in flight until it leaves the consumer if
+        the prefetch is adaptive, then dispatch it.
 
         Args:
             message (DeliveredMessage): The aiormq message model.
         '''
 
-        message: IncomingMessage = IncomingMessage(message)
+        message: IncomingMessage = self._receive(message)
+
+        if self.tuner is None:
+            return await self._dispatch(message)
+
+        received: float = self.tuner.received()
+
+        try:
+            await self._dispatch(message, received)
+        finally:
+            self.tuner.released()
+
+    async def _dispatch(
+        self, message: IncomingMessage, received: float = None
+    ) -> None:
+        '''Wait for the previous message of the lane if the messages are
+        partitioned, then process the message.
+
+        Args:
+            message (IncomingMessage): The incoming message.
+            received (float): The loop time of the reception, measured
+                by the tuner. Default to None.
+        '''
+
+        if self.partition is None:
+            return await self._run(message, received)
+
+        try:
+            lane: int = hash(self.partition(message)) % self.lanes
+        except Exception:
+            await self._settle(message, False)
+            raise
+
+        previous: Future = self._tails[lane]
+        done: Future = asyncio.get_event_loop().create_future()
+        self._tails[lane] = done
+
+        try:
+            if not previous is None:
+                await previous
+
+            await self._run(message, received)
+        finally:
+            done.set_result(None)
+
+            if self._tails[lane] is done:
+                self._tails[lane] = None
+
+    async def _run(
+        self, message: IncomingMessage, received: float = None
+    ) -> None:
+        '''Wait for a free slot if the concurrency is bounded, then
+        process the message.
+
+        Args:
+            message (IncomingMessage): The incoming message.
+            received (float): The loop time of the reception, measured
+                by the tuner. Default to None.
+        '''
+
+        if self.concurrency is None:
+            return await self._measure(message, received)
+
+        if self._semaphore is None:
+            self._semaphore = Semaphore(self.concurrency)
+
+        async with self._semaphore:
+            await self._measure(message, received)
+
+    async def _measure(
+        self, message: IncomingMessage, received: float
+    ) -> None:
+        '''Process the message, measured by the tuner if the prefetch
+        is adaptive.
+
+        Args:
+            message (IncomingMessage): The incoming message.
+            received (float): The loop time of the reception.
+        '''
+
+        if self.tuner is None:
+            return await self._process(message)
+
+        started: float = self.tuner.started(received)
+
+        try:
+            await self._process(message)
+        finally:
+            self.tuner.finished(started)
+
+    def _receive(self, message: DeliveredMessage) -> IncomingMessage:
+        '''Wrap a delivery, tracked by the acknowledgment coalescer
+        of the channel unless no_ack is set. Its body is deserialized
+        with the codecs of the Symbios instance.
+
+        Must be called before any await, to track the deliveries
+        in their order.
+
+        Args:
+            message (DeliveredMessage): The aiormq message model.
+
+        Returns:
+            IncomingMessage: The incoming message.
+        '''
+
+        if self.no_ack:
+            return IncomingMessage(message, codecs=self.symbios.codecs)
+
+        self._acker.track(message.delivery.delivery_tag)
+
+        return IncomingMessage(
+            message, self._acker, codecs=self.symbios.codecs
+        )
+
+    async def _process(self, message: IncomingMessage) -> None:
+        '''Call the associated middlewares, then call the task.
+
+        An envelope of batched messages is split, and the task is called
+        for each of its messages. Unless no_ack is set or the task has
+        settled the message itself, the message is acknowledged once all
+        the tasks succeeded, and the finalizers are run once the ack was
+        sent. If a middleware or a task fails, the message is negatively
+        acknowledged and the exception is raised again. A malformed
+        envelope is rejected without requeue.
+
+        Args:
+            message (IncomingMessage): The incoming message.
+        '''
+
+        messages: List[IncomingMessage] = [message]
+
+        try:
+            if BatchEnvelope.is_envelope(message):
+                messages = BatchEnvelope.open(message)
+
+                for record in messages:
+                    message.finalize_with(record.finalize)
+
+            for record in messages:
+                if self._executor is None:
+                    if not self._midd_library is None:
+                        await self._midd_library.run_until_end(
+                            self.symbios, record, Event.ON_LISTEN
+                        )
+
+                    await self.task(self.symbios, record)
+                else:
+                    await self._offload(record)
+        except BatchEnvelopeError:
+            await self._discard(message)
+            raise
+        except Exception:
+            await self._settle(message, False)
+            raise
+
+        await self._settle(message, True)
+
+    async def _offload(self, message: IncomingMessage) -> None:
+        '''Call the listening middlewares but the deserializer, then
+        deserialize the body and call the task in the pool of workers.
+
+        Only the raw body and the properties are sent to the workers.
+        The body is copied to bytes for the processes only, whose task
+        and codecs are bound once per worker.
+
+        Args:
+            message (IncomingMessage): The incoming message.
+        '''
 
         if not self._midd_library is None:
             await self._midd_library.run_until_end(
-                self.symbios, message, Event.ON_LISTEN
+                self.symbios,
+                message,
+                Event.ON_LISTEN,
+                exclude=(DeserializerMiddleware,),
             )
 
-        await self.task(self.symbios, message)
+        loop: asyncio.AbstractEventLoop = asyncio.get_event_loop()
+
+        if self.execution is Execution.PROCESS:
+            await loop.run_in_executor(
+                self._executor,
+                _call_bound_task,
+                bytes(message.body),
+                message.props,
+            )
+        else:
+            await loop.run_in_executor(
+                self._executor,
+                _call_task,
+                self.task,
+                self.symbios.codecs,
+                message.body,
+                message.props,
+            )
+
+    async def _settle(self, message: IncomingMessage, success: bool) -> None:
+        '''Acknowledge a processed message, or negatively acknowledge
+        a failed one, unless it is already settled.
+
+        A failed message is requeued, unless it was already redelivered.
+        It is then discarded, or dead-lettered if the queue has
+        a dead-letter exchange.
+
+        Args:
+            message (IncomingMessage): The incoming message.
+            success (bool): If the message was processed.
+        '''
+
+        if self.no_ack:
+            if success:
+                await message.finalize()
+        elif message.settled:
+            return
+        elif success:
+            await message.ack()
+        else:
+            await message.nack(requeue=not message.delivery.redelivered)
+
+    async def _discard(self, message: IncomingMessage) -> None:
+        '''Reject a message that could never be processed, e.g.
+        a malformed envelope, unless it is already settled.
+
+        It is discarded, or dead-lettered if the queue has
+        a dead-letter exchange.
+
+        Args:
+            message (IncomingMessage): The incoming message.
+        '''
+
+        if not self.no_ack and not message.settled:
+            await message.reject(requeue=False)
+
+
+class BatchConsumer(Consumer):
+    '''The BatchConsumer class declaration.
+
+    Buffer the incoming messages and call the task with a list of them.
+    A batch is acknowledged at once, with a single multiple ack.
+    The batches are processed one after the other, so that the multiple
+    ack only covers the messages of the batch.
+
+    Attributes:
+        _DEFAULT_MAX_BATCH (int): The default maximum number of messages
+            of a batch.
+        _DEFAULT_MAX_WAIT (float): The default time (in seconds) waited
+            for a batch to fill.
+
+        max_batch (int): The maximum number of messages of a batch.
+        max_wait (float): The time (in seconds) waited for a batch
+            to fill after its first message.
+        task (Callable[[Symbios, List[IncomingMessage]], None]): The
+            task to call with a batch.
+        _buffer (List[Tuple[IncomingMessage, List[IncomingMessage]]]):
+            The deliveries not yet processed with their messages,
+            in the order of delivery.
+        _size (int): The number of messages of the buffer.
+        _timer (TimerHandle): The waiting timer of the pending batch.
+        _receive_lock (Lock): Keeps the buffer in the order of delivery.
+        _batch_lock (Lock): Processes the batches one after the other.
+    '''
+
+    _DEFAULT_MAX_BATCH: int = 500
+    _DEFAULT_MAX_WAIT: float = 0.05
+
+    def __init__(
+        self,
+        *,
+        symbios: object,
+        queue: Queue = Queue(),
+        exclusive: bool = False,
+        arguments: ArgumentsType = None,
+        consumer_tag: str = None,
+        connection: int = None,
+        prefetch_count: int = None,
+        max_batch: int = _DEFAULT_MAX_BATCH,
+        max_wait: float = _DEFAULT_MAX_WAIT,
+        midd_library: MiddlewareLibrary,
+    ):
+        '''The BatchConsumer initializer.
+
+        Args:
+            symbios (Symbios): The Symbios instance.
+            queue (str): The queue to consume. Default to Queue().
+            exclusive (bool): Only one consumer registered to
+                the targeted queue. Default to False.
+            arguments (ArgumentsType): Some properties to the consumer.
+                Default to None.
+            consumer_tag (str): The consumer identity. Default to None.
+            connection (int): The index of the connection to listen on.
+                Picked by round-robin if None. Default to None.
+            prefetch_count (int): The maximum number of unacknowledged
+                messages delivered to the consumer.
+                Default to twice max_batch.
+            max_batch (int): The maximum number of messages of a batch.
+                Default to _DEFAULT_MAX_BATCH.
+            max_wait (float): The time (in seconds) waited for a batch
+                to fill after its first message.
+                Default to _DEFAULT_MAX_WAIT.
+            midd_library (MiddlewareLibrary): The Symbios middleware library.
+
+        Raises:
+            ConsumerError: If max_batch is lower than 1.
+        '''
+
+        if max_batch < 1:
+            raise ConsumerError(
+                f'The batch size must be greater than 0, {max_batch} given.'
+            )
+
+        super().__init__(
+            symbios=symbios,
+            queue=queue,
+            no_ack=False,
+            exclusive=exclusive,
+            arguments=arguments,
+            consumer_tag=consumer_tag,
+            connection=connection,
+            prefetch_count=(
+                2 * max_batch if prefetch_count is None else prefetch_count
+            ),
+            midd_library=midd_library,
+        )
+
+        self.max_batch: int = max_batch
+        self.max_wait: float = max_wait
+        self._buffer: List[Tuple[IncomingMessage, List[IncomingMessage]]] = []
+        self._size: int = 0
+        self._timer: TimerHandle = None
+        self._receive_lock: Lock = None
+        self._batch_lock: Lock = None
+
+    async def _embed(self, message: DeliveredMessage) -> None:
+        '''Call the associated middlewares, then buffer the message.
+
+        Process a batch if the buffer is full, or arm the waiting timer.
+        If a middleware fails, the message alone is negatively
+        acknowledged and the exception is raised again. A malformed
+        envelope is rejected without requeue.
+
+        Args:
+            message (DeliveredMessage): The aiormq message model.
+        '''
+
+        message: IncomingMessage = self._receive(message)
+        messages: List[IncomingMessage] = [message]
+
+        if self._receive_lock is None:
+            self._receive_lock = Lock()
+            self._batch_lock = Lock()
+
+        async with self._receive_lock:
+            try:
+                if BatchEnvelope.is_envelope(message):
+                    messages = BatchEnvelope.open(message)
+
+                    for record in messages:
+                        message.finalize_with(record.finalize)
+
+                for record in messages:
+                    if not self._midd_library is None:
+                        await self._midd_library.run_until_end(
+                            self.symbios, record, Event.ON_LISTEN
+                        )
+            except BatchEnvelopeError:
+                await self._discard(message)
+                raise
+            except Exception:
+                await self._settle(message, False)
+                raise
+
+            self._buffer.append((message, messages))
+            self._size += len(messages)
+
+        if self._size >= self.max_batch:
+            await self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_event_loop().call_later(
+                self.max_wait, lambda: asyncio.ensure_future(self._flush())
+            )
+
+    async def _flush(self) -> None:
+        '''Call the task with the pending batch, then settle it.
+
+        A batch is never split across the messages of an envelope.
+        On success, the deliveries of the batch not settled by the task
+        are acknowledged with a single multiple ack, then the finalizers
+        are run. On failure, they are negatively acknowledged with
+        a single multiple nack and the exception is raised again.
+        The batch is requeued, unless all its messages were already
+        redelivered.
+        '''
+
+        async with self._batch_lock:
+            if not self._timer is None:
+                self._timer.cancel()
+                self._timer = None
+
+            deliveries: List[IncomingMessage] = []
+            batch: List[IncomingMessage] = []
+
+            while self._buffer and len(batch) < self.max_batch:
+                message, messages = self._buffer.pop(0)
+                deliveries.append(message)
+                batch.extend(messages)
+
+            self._size -= len(batch)
+
+            if not batch:
+                return
+
+            if self._buffer:
+                self._timer = asyncio.get_event_loop().call_later(
+                    self.max_wait,
+                    lambda: asyncio.ensure_future(self._flush()),
+                )
+
+            try:
+                await self.task(self.symbios, batch)
+            except Exception:
+                unsettled: List[IncomingMessage] = [
+                    m for m in deliveries if not m.settled
+                ]
+
+                for message in unsettled:
+                    message.settled = True
+
+                await self._acker.nack_many(
+                    [m.delivery.delivery_tag for m in unsettled],
+                    requeue=not all(m.delivery.redelivered for m in batch),
+                )
+                raise
+
+            for message in deliveries:
+                if not message.settled:
+                    await message.ack()
+
+            await self._acker.flush()
+
+
+class PullConsumer(Consumer):
+    '''The PullConsumer class declaration.
+
+    An async iterator over the messages of a queue, for the pipelines
+    pacing their own consumption:
+
+        async with symbios.consume(Queue('tasks'), batch=50) as messages:
+            async for message in messages:
+                ...
+
+    By default, the messages are consumed into a buffer, bounded by
+    a QoS of batch unacknowledged messages: the broker stops
+    delivering while the iteration doesn't move on. With polling,
+    they are fetched by bulks of up to batch messages with basic_get
+    once the buffer is empty, and the queue is polled every polling
+    seconds while it is empty. It fits the sparse queues, which would
+    hold a consumer for nothing.
+
+    A message is acknowledged when the iteration moves to the next one,
+    unless it was settled meanwhile. The listening middlewares are run
+    before yielding it, and an envelope of batched messages yields its
+    messages one after the other. Closing the consumer closes its
+    channel, so that the broker requeues the buffered messages.
+
+    Attributes:
+        _DEFAULT_BATCH (int): The default number of messages buffered.
+
+        batch (int): The number of messages buffered, and fetched
+            by bulk while polling.
+        polling (float): The time (in seconds) waited before polling
+            again an empty queue. None to consume the queue.
+        _buffer (asyncio.Queue): The received deliveries not yet
+            yielded. Created on start, to be bound to the running loop.
+        _current (IncomingMessage): The delivery being iterated.
+        _records (Deque[IncomingMessage]): The messages of the current
+            delivery not yet yielded.
+        _closed (bool): If the consumer was closed.
+    '''
+
+    _DEFAULT_BATCH: int = 100
+
+    def __init__(
+        self,
+        *,
+        symbios: object,
+        queue: Queue = Queue(),
+        exclusive: bool = False,
+        arguments: ArgumentsType = None,
+        consumer_tag: str = None,
+        connection: int = None,
+        batch: int = _DEFAULT_BATCH,
+        polling: float = None,
+        midd_library: MiddlewareLibrary,
+    ):
+        '''The PullConsumer initializer.
+
+        Args:
+            symbios (Symbios): The Symbios instance.
+            queue (str): The queue to consume. Default to Queue().
+            exclusive (bool): Only one consumer registered to
+                the targeted queue. Default to False.
+            arguments (ArgumentsType): Some properties to the consumer.
+                Default to None.
+            consumer_tag (str): The consumer identity. Default to None.
+            connection (int): The index of the connection to listen on.
+                Picked by round-robin if None. Default to None.
+            batch (int): The number of messages buffered, and fetched
+                by bulk while polling. Default to _DEFAULT_BATCH.
+            polling (float): The time (in seconds) waited before polling
+                again an empty queue. Consume the queue if None.
+                Default to None.
+            midd_library (MiddlewareLibrary): The Symbios middleware library.
+
+        Raises:
+            ConsumerError: If batch is lower than 1.
+        '''
+
+        if batch < 1:
+            raise ConsumerError(
+                f'The batch size must be greater than 0, {batch} given.'
+            )
+
+        super().__init__(
+            symbios=symbios,
+            queue=queue,
+            no_ack=False,
+            exclusive=exclusive,
+            arguments=arguments,
+            consumer_tag=consumer_tag,
+            connection=connection,
+            prefetch_count=batch,
+            midd_library=midd_library,
+        )
+
+        self.batch: int = batch
+        self.polling: float = polling
+        self._buffer: asyncio.Queue = None
+        self._current: IncomingMessage = None
+        self._records: Deque[IncomingMessage] = deque()
+        self._closed: bool = False
+
+    async def start(self) -> None:
+        '''Declare the queue on a dedicated channel and start consuming
+        it, unless polling. Called by the first iteration if needed.
+        '''
+
+        if not self._buffer is None:
+            return
+
+        self._buffer = asyncio.Queue()
+
+        if self.polling is None:
+            await self.listen(None)
+        else:
+            link: Link = self.symbios.consume_link(self.connection)
+            await self._declare(link, await link.open_channel())
+
+    async def close(self) -> None:
+        '''Acknowledge the current message unless it was settled,
+        then close the channel. The broker requeues the other
+        unacknowledged messages.
+        '''
+
+        if self._closed:
+            return
+
+        await self._release(True)
+        self._closed = True
+        await super().close()
+
+    def __aiter__(self) -> 'PullConsumer':
+        return self
+
+    async def __anext__(self) -> IncomingMessage:
+        '''Settle the previous message and yield the next one.
+
+        Raises:
+            StopAsyncIteration: If the consumer was closed.
+            Exception: If a middleware failed. The message is
+                negatively acknowledged.
+            BatchEnvelopeError: If an envelope is malformed. It is
+                rejected without requeue.
+
+        Returns:
+            IncomingMessage: The next message.
+        '''
+
+        while not self._records:
+            await self._release(True)
+
+            if self._closed:
+                raise StopAsyncIteration
+
+            await self.start()
+            message: IncomingMessage = await self._next_delivery()
+            records: List[IncomingMessage] = [message]
+            self._current = message
+
+            try:
+                if BatchEnvelope.is_envelope(message):
+                    records = BatchEnvelope.open(message)
+
+                    for record in records:
+                        message.finalize_with(record.finalize)
+
+                for record in records:
+                    if not self._midd_library is None:
+                        await self._midd_library.run_until_end(
+                            self.symbios, record, Event.ON_LISTEN
+                        )
+            except BatchEnvelopeError:
+                self._current = None
+                await self._discard(message)
+                raise
+            except Exception:
+                await self._release(False)
+                raise
+
+            self._records.extend(records)
+
+        return self._records.popleft()
+
+    async def __aenter__(self) -> 'PullConsumer':
+        await self.start()
+
+        return self
+
+    async def __aexit__(self, exc_type: type, *args: Any) -> None:
+        '''Negatively acknowledge the current message if the iteration
+        failed, then close the consumer.
+        '''
+
+        if not exc_type is None:
+            await self._release(False)
+
+        await self.close()
+
+    async def _embed(self, message: DeliveredMessage) -> None:
+        '''Buffer a delivery, or requeue it if the consumer was closed.
+
+        Args:
+            message (DeliveredMessage): The aiormq message model.
+        '''
+
+        message: IncomingMessage = self._receive(message)
+
+        if self._closed:
+            await message.nack()
+        else:
+            self._buffer.put_nowait(message)
+
+    async def _next_delivery(self) -> IncomingMessage:
+        '''Wait for the next delivery, fetching a bulk of them
+        while polling.
+
+        Returns:
+            IncomingMessage: The next delivery.
+        '''
+
+        if self.polling is None:
+            return await self._buffer.get()
+
+        queue: str = self.declare_ok.confirmation.queue
+
+        while self._buffer.empty():
+            for _ in range(self.batch):
+                delivered: DeliveredMessage = await self._channel.basic_get(
+                    queue
+                )
+
+                if delivered is None:
+                    break
+
+                self._buffer.put_nowait(self._receive(delivered))
+
+            if self._buffer.empty():
+                await asyncio.sleep(self.polling)
+
+        return self._buffer.get_nowait()
+
+    async def _release(self, success: bool) -> None:
+        '''Settle the current delivery and forget its pending messages.
+
+        Args:
+            success (bool): If the delivery was processed.
+        '''
+
+        if self._current is None:
+            return
+
+        message, self._current = self._current, None
+        self._records.clear()
+        await self._settle(message, success)
+
+
+class ConsumerError(Exception):
+    '''The ConsumerError Exception class.
+    '''
+
+    def __init__(self, message: str):
+        super().__init__(message)
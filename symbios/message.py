@@ -1,17 +1,26 @@
 '''
 @desc    The message class.
 @author  arthuchaut <arthuchaut@gmail.com>
-@version 0.3.0
+@version 0.7.0
 @date    2019-09-20
 @note    0.1.0 (2019-09-20): Writed the first drafts.
 @note    0.2.0 (2019-09-22): Redesigned message classes since 
                              the new middleware structure.
+@note    0.4.0 (2026-10-18): Accepted the raw buffers as body.
+@note    0.5.0 (2026-10-18): Added the finalizers of the incoming messages.
+@note    0.6.0 (2026-10-18): Added the settlement of the incoming messages.
+@note    0.7.0 (2026-10-18): Deserialized the incoming bodies lazily.
 '''
 
-from typing import Union, Dict, Any
+from typing import Union, Dict, Any, Callable, Awaitable, List
 import json
 
 from .utils import DeliveredMessage, GetEmpty, GetOk, Props
+from .ack import AckCoalescer
+from .codec import CodecRegistry
+
+_UNSET: object = object()
+_DEFAULT_CODECS: CodecRegistry = CodecRegistry()
 
 
 class IncomingMessage:
@@ -24,37 +33,233 @@ class IncomingMessage:
         delivery (Union[GetEmpty, GetOk]): The message ack tag.
         header (Any): The message header.
         props (Props): The message properties.
-        body (bytes): The message content.
+        body (bytes): The message content. Setting it forgets
+            the deserialized body.
+        view (memoryview): A zero-copy view of the message content.
+        deserialized (Any): The message content decoded with the codec
+            of its content-type, on the first access.
+        codecs (CodecRegistry): The codecs used to deserialize the body.
+        settled (bool): If the message was acknowledged, negatively
+            acknowledged or rejected.
+        _acker (AckCoalescer): The acknowledgments of the channel.
+            None if the message can't be settled.
+        _finalizers (List[Callable[[], Awaitable[None]]]): The callbacks
+            to run once the message was processed. Created on the first
+            registration, so that the copies don't share them.
+        _body (bytes): The message content.
+        _deserialized (Any): The cached deserialized body,
+            or _UNSET until the first access.
     '''
 
-    def __init__(self, message: DeliveredMessage):
+    def __init__(
+        self,
+        message: DeliveredMessage,
+        acker: AckCoalescer = None,
+        *,
+        codecs: CodecRegistry = None,
+    ):
         '''The IncomingMessage initializer.
 
         Args:
             message (DeliveredMessage): The aiormq message object.
+            acker (AckCoalescer): The acknowledgments of the channel,
+                which tracks the delivery. None if the message can't be
+                settled, e.g. if it was listened without acknowledgment.
+                Default to None.
+            codecs (CodecRegistry): The codecs used to deserialize
+                the body. Default to the standard codecs.
         '''
 
         self.delivery: Union[GetEmpty, GetOk] = message.delivery
         self.header: Any = message.header
         self.props: Props = message.header.properties
         self.body: bytes = message.body
+        self.codecs: CodecRegistry = codecs or _DEFAULT_CODECS
+        self.settled: bool = False
+        self._acker: AckCoalescer = acker
+        self._finalizers: List[Callable[[], Awaitable[None]]] = None
+
+    @property
+    def body(self) -> bytes:
+        '''The message content.
+
+        Returns:
+            bytes: The body.
+        '''
+
+        return self._body
+
+    @body.setter
+    def body(self, body: bytes) -> None:
+        '''Replace the message content, e.g. once decompressed,
+        and forget the deserialized one.
+
+        Args:
+            body (bytes): The new body.
+        '''
+
+        self._body = body
+        self._deserialized = _UNSET
+
+    @property
+    def deserialized(self) -> Any:
+        '''The message content decoded with the codec of its
+        content-type, or as text if it is unknown.
+
+        The body is decoded on the first access only, so the tasks
+        reading the headers or forwarding the raw body never pay
+        for it.
+
+        Returns:
+            Any: The deserialized body.
+        '''
+
+        if self._deserialized is _UNSET:
+            self._deserialized = self.codecs.decode(
+                self._body, self.props.content_type
+            )
+
+        return self._deserialized
+
+    @deserialized.setter
+    def deserialized(self, deserialized: Any) -> None:
+        '''Replace the deserialized body, e.g. by a middleware.
+
+        Args:
+            deserialized (Any): The deserialized body.
+        '''
+
+        self._deserialized = deserialized
+
+    @property
+    def view(self) -> memoryview:
+        '''A zero-copy view of the message content.
+
+        Returns:
+            memoryview: The view of the body.
+        '''
+
+        return memoryview(self.body)
+
+    async def ack(self) -> None:
+        '''Acknowledge the message.
+
+        The ack is coalesced with the other ones of the channel, then
+        the finalizers are run once it was sent.
+
+        Raises:
+            IncomingMessageError: If the message can't be settled
+                or was already settled.
+        '''
+
+        self._check_settleable()
+        await self._acker.ack(self.delivery.delivery_tag, self.finalize)
+
+    async def nack(self, requeue: bool = True) -> None:
+        '''Negatively acknowledge the message.
+
+        Args:
+            requeue (bool): Requeue the message. Default to True.
+
+        Raises:
+            IncomingMessageError: If the message can't be settled
+                or was already settled.
+        '''
+
+        self._check_settleable()
+        await self._acker.nack(self.delivery.delivery_tag, requeue)
+
+    async def reject(self, requeue: bool = False) -> None:
+        '''Reject the message.
+
+        Args:
+            requeue (bool): Requeue the message. Default to False.
+
+        Raises:
+            IncomingMessageError: If the message can't be settled
+                or was already settled.
+        '''
+
+        self._check_settleable()
+        await self._acker.reject(self.delivery.delivery_tag, requeue)
+
+    def _check_settleable(self) -> None:
+        '''Check that the message could be settled, then mark it settled.
+
+        Raises:
+            IncomingMessageError: If the message can't be settled
+                or was already settled.
+        '''
+
+        if self._acker is None:
+            raise IncomingMessageError(
+                'The message can\'t be settled: it was listened without '
+                'acknowledgment, or it is a record of a batch envelope.'
+            )
+
+        if self.settled:
+            raise IncomingMessageError('The message was already settled.')
+
+        self.settled = True
+
+    def finalize_with(self, callback: Callable[[], Awaitable[None]]) -> None:
+        '''Register a callback to run once the message was processed.
+
+        The consumer runs the callbacks after the task succeeded,
+        e.g. to release the resources held by a middleware.
+
+        Args:
+            callback (Callable[[], Awaitable[None]]): The coroutine
+                function to call.
+        '''
+
+        if self._finalizers is None:
+            self._finalizers = []
+
+        self._finalizers.append(callback)
+
+    async def finalize(self) -> None:
+        '''Run the registered callbacks, once.
+        '''
+
+        finalizers, self._finalizers = self._finalizers or [], None
+
+        for callback in finalizers:
+            await callback()
 
 
 class SendingMessage:
     '''The SendingMessage class declaration.
 
     Attributes:
-        body (Union[str, Dict[str, Any]]): The message to send.
+        body (Union[str, Dict[str, Any], bytes, bytearray, memoryview]):
+            The message to send. The raw buffers are emitted as they are.
+        props (Props): The message properties. Valorized by the Producer
+            before calling the middlewares, which could modify them.
     '''
 
-    def __init__(self, body: Union[str, Dict[str, Any]]):
+    def __init__(
+        self, body: Union[str, Dict[str, Any], bytes, bytearray, memoryview]
+    ):
         '''The SendingMessage initializer.
 
         Args:
-            body (Union[str, Dict[str, Any]]): The message to send.
+            body (Union[str, Dict[str, Any], bytes, bytearray, memoryview]):
+                The message to send.
         '''
 
-        self.body: Union[str, Dict[str, Any]] = body
+        self.body: Union[
+            str, Dict[str, Any], bytes, bytearray, memoryview
+        ] = body
+        self.props: Props = None
+
+
+class IncomingMessageError(Exception):
+    '''The IncomingMessageError Exception class.
+    '''
+
+    def __init__(self, message: str):
+        super().__init__(message)
 
 
 class SendingMessageError(Exception):
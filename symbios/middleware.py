@@ -1,12 +1,13 @@
 '''
 @desc    The Symbios middleware manager classes.
 @author  arthuchaut <arthuchaut@gmail.com>
-@version 0.1.0
+@version 0.2.0
 @date    2019-09-22
 @note    0.1.0 (2019-09-22): Writed the first drafts.
+@note    0.2.0 (2026-10-18): Allowed to skip some middleware types.
 '''
 
-from typing import Union, List
+from typing import Union, List, Dict, Tuple
 from enum import Enum
 from abc import ABC, abstractmethod
 
@@ -97,8 +98,32 @@ class MiddlewareLibrary:
 
         self._library[midd.event].append(midd)
 
+    def insert(self, index: int, midd: MiddlewareABC) -> None:
+        '''Register a middleware at a position of the library.
+
+        Args:
+            index (int): The position in the middlewares of the event.
+            midd (MiddlewareABC): The middleware instance to register.
+
+        Raises:
+            MiddlewareLibraryError: If the midd argument is not a subclass
+                of MiddlewareABC.
+        '''
+
+        if not isinstance(midd, MiddlewareABC):
+            raise MiddlewareLibraryError(
+                f'Expected an instance of MiddlewareABC, {type(midd)} given.'
+            )
+
+        self._library[midd.event].insert(index, midd)
+
     async def run_until_end(
-        self, symbios: object, message: SendingMessage, event: int
+        self,
+        symbios: object,
+        message: SendingMessage,
+        event: int,
+        *,
+        exclude: Tuple[type, ...] = (),
     ) -> None:
         '''Call all defined middlewares associated the event specified.
 
@@ -106,10 +131,13 @@ class MiddlewareLibrary:
             symbios (Symbios): The Symbios instance.
             message (Union[IncomingMessage, SendingMessage]): The 
                 listener/emiter message.
+            exclude (Tuple[type, ...]): The middleware types to skip.
+                Default to ().
         '''
 
         for midd in self._library[event]:
-            await midd.execute(symbios, message)
+            if not isinstance(midd, exclude):
+                await midd.execute(symbios, message)
 
 
 class MiddlewareLibraryError(Exception):
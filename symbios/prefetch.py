@@ -0,0 +1,341 @@
+'''
+@desc    The adaptive prefetch of the consumers.
+@author  arthuchaut <arthuchaut@gmail.com>
+@version 0.1.0
+@date    2026-10-18
+@note    0.1.0 (2026-10-18): Writed the first drafts.
+'''
+
+import asyncio
+import math
+from asyncio import TimerHandle
+from typing import Awaitable, Callable
+
+
+class AdaptivePrefetch:
+    '''The AdaptivePrefetch class declaration.
+
+    The tuning policy of the prefetch of a consumer.
+
+    Every interval, the tuner compares the time the messages wait in
+    the consumer before their task starts with the service time of
+    the task. If they wait longer than they are served, or longer than
+    max_latency, the consumer hoards messages that the other consumers
+    could process: the prefetch is multiplied by decrease. Else, if
+    the unacknowledged messages reached the prefetch, the window
+    throttled the consumer: the prefetch is increased by step.
+    It never goes below the number of messages needed to keep the
+    tasks busy at the measured rate, by Little's law.
+
+    Attributes:
+        _DEFAULT_MIN_PREFETCH (int): The default lowest prefetch.
+        _DEFAULT_MAX_PREFETCH (int): The default highest prefetch.
+        _DEFAULT_INTERVAL (float): The default time (in seconds)
+            between two adjustments.
+        _DEFAULT_STEP (int): The default additive increase.
+        _DEFAULT_DECREASE (float): The default multiplicative decrease.
+        _DEFAULT_SMOOTHING (float): The default weight of the last
+            measure in the moving averages.
+
+        min_prefetch (int): The lowest prefetch.
+        max_prefetch (int): The highest prefetch.
+        initial (int): The prefetch before the first adjustment.
+        interval (float): The time (in seconds) between two adjustments.
+        step (int): The additive increase.
+        decrease (float): The multiplicative decrease.
+        max_latency (float): The time (in seconds) from the delivery
+            to the end of the task above which the prefetch decreases.
+        smoothing (float): The weight of the last measure in the moving
+            averages.
+    '''
+
+    _DEFAULT_MIN_PREFETCH: int = 1
+    _DEFAULT_MAX_PREFETCH: int = 1000
+    _DEFAULT_INTERVAL: float = 1.0
+    _DEFAULT_STEP: int = 4
+    _DEFAULT_DECREASE: float = 0.5
+    _DEFAULT_SMOOTHING: float = 0.2
+
+    def __init__(
+        self,
+        *,
+        min_prefetch: int = _DEFAULT_MIN_PREFETCH,
+        max_prefetch: int = _DEFAULT_MAX_PREFETCH,
+        initial: int = None,
+        interval: float = _DEFAULT_INTERVAL,
+        step: int = _DEFAULT_STEP,
+        decrease: float = _DEFAULT_DECREASE,
+        max_latency: float = None,
+        smoothing: float = _DEFAULT_SMOOTHING,
+    ):
+        '''The AdaptivePrefetch initializer.
+
+        Args:
+            min_prefetch (int): The lowest prefetch.
+                Default to _DEFAULT_MIN_PREFETCH.
+            max_prefetch (int): The highest prefetch.
+                Default to _DEFAULT_MAX_PREFETCH.
+            initial (int): The prefetch before the first adjustment.
+                Default to min_prefetch.
+            interval (float): The time (in seconds) between two
+                adjustments. Default to _DEFAULT_INTERVAL.
+            step (int): The additive increase. Default to _DEFAULT_STEP.
+            decrease (float): The multiplicative decrease.
+                Default to _DEFAULT_DECREASE.
+            max_latency (float): The time (in seconds) from the delivery
+                to the end of the task above which the prefetch
+                decreases. Unbounded if None. Default to None.
+            smoothing (float): The weight of the last measure in
+                the moving averages. Default to _DEFAULT_SMOOTHING.
+
+        Raises:
+            AdaptivePrefetchError: If the bounds, the step or the decrease
+                are invalid.
+        '''
+
+        if not 1 <= min_prefetch <= max_prefetch:
+            raise AdaptivePrefetchError(
+                f'Expected 1 <= min_prefetch <= max_prefetch, '
+                f'{min_prefetch} and {max_prefetch} given.'
+            )
+
+        if step < 1 or not 0 < decrease < 1:
+            raise AdaptivePrefetchError(
+                f'Expected step >= 1 and 0 < decrease < 1, '
+                f'{step} and {decrease} given.'
+            )
+
+        self.min_prefetch: int = min_prefetch
+        self.max_prefetch: int = max_prefetch
+        self.initial: int = min(
+            max(initial or min_prefetch, min_prefetch), max_prefetch
+        )
+        self.interval: float = interval
+        self.step: int = step
+        self.decrease: float = decrease
+        self.max_latency: float = max_latency
+        self.smoothing: float = smoothing
+
+
+class PrefetchStats:
+    '''The PrefetchStats class declaration.
+
+    The measurements of an adaptive consumer.
+
+    Attributes:
+        prefetch (int): The current prefetch.
+        in_flight (int): The number of messages received and not
+            processed yet.
+        peak (int): The highest in_flight since the last adjustment.
+        wait_time (float): The moving average of the time (in seconds)
+            the messages wait before their task starts.
+        service_time (float): The moving average of the duration
+            (in seconds) of the tasks.
+        rate (float): The number of messages processed per second
+            during the last interval.
+        target (float): The mean number of messages in the consumer
+            at this rate, by Little's law.
+        increases (int): The number of increases of the prefetch.
+        decreases (int): The number of decreases of the prefetch.
+    '''
+
+    def __init__(self, prefetch: int):
+        '''The PrefetchStats initializer.
+
+        Args:
+            prefetch (int): The initial prefetch.
+        '''
+
+        self.prefetch: int = prefetch
+        self.in_flight: int = 0
+        self.peak: int = 0
+        self.wait_time: float = 0.0
+        self.service_time: float = 0.0
+        self.rate: float = 0.0
+        self.target: float = 0.0
+        self.increases: int = 0
+        self.decreases: int = 0
+
+
+class PrefetchTuner:
+    '''The PrefetchTuner class declaration.
+
+    Measures the messages of a consumer and adjusts its prefetch
+    following an AdaptivePrefetch policy.
+
+    Attributes:
+        policy (AdaptivePrefetch): The tuning policy.
+        stats (PrefetchStats): The measurements.
+        _apply (Callable[[int], Awaitable[None]]): The coroutine
+            function that sets the prefetch of the channel.
+        _completed (int): The number of messages processed since
+            the last adjustment.
+        _window (float): The loop time of the last adjustment.
+        _timer (TimerHandle): The timer of the next adjustment.
+    '''
+
+    def __init__(
+        self,
+        policy: AdaptivePrefetch,
+        apply: Callable[[int], Awaitable[None]],
+    ):
+        '''The PrefetchTuner initializer.
+
+        Args:
+            policy (AdaptivePrefetch): The tuning policy.
+            apply (Callable[[int], Awaitable[None]]): The coroutine
+                function that sets the prefetch of the channel.
+        '''
+
+        self.policy: AdaptivePrefetch = policy
+        self.stats: PrefetchStats = PrefetchStats(policy.initial)
+        self._apply: Callable[[int], Awaitable[None]] = apply
+        self._completed: int = 0
+        self._window: float = None
+        self._timer: TimerHandle = None
+
+    def start(self) -> None:
+        '''Start the periodic adjustments.
+        '''
+
+        self._window = asyncio.get_event_loop().time()
+        self._schedule()
+
+    def stop(self) -> None:
+        '''Stop the periodic adjustments.
+        '''
+
+        if not self._timer is None:
+            self._timer.cancel()
+            self._timer = None
+
+    def received(self) -> float:
+        '''Count a received message.
+
+        Returns:
+            float: The loop time of the reception.
+        '''
+
+        self.stats.in_flight += 1
+        self.stats.peak = max(self.stats.peak, self.stats.in_flight)
+
+        return asyncio.get_event_loop().time()
+
+    def started(self, received: float) -> float:
+        '''Measure the waiting time of a message whose task starts.
+
+        Args:
+            received (float): The loop time of the reception.
+
+        Returns:
+            float: The loop time of the start.
+        '''
+
+        now: float = asyncio.get_event_loop().time()
+        self.stats.wait_time = self._average(
+            self.stats.wait_time, now - received
+        )
+
+        return now
+
+    def finished(self, started: float) -> None:
+        '''Measure the service time of a message whose task ended.
+
+        Args:
+            started (float): The loop time of the start.
+        '''
+
+        self.stats.service_time = self._average(
+            self.stats.service_time,
+            asyncio.get_event_loop().time() - started,
+        )
+        self._completed += 1
+
+    def released(self) -> None:
+        '''Count a received message that left the consumer, processed
+        or not.
+        '''
+
+        self.stats.in_flight -= 1
+
+    async def tune(self) -> None:
+        '''Measure the last interval, then adjust the prefetch.
+
+        The adjustments stop if the prefetch could not be set,
+        e.g. once the channel was closed.
+        '''
+
+        self._timer = None
+        stats: PrefetchStats = self.stats
+        now: float = asyncio.get_event_loop().time()
+        stats.rate = self._completed / max(now - self._window, 1e-9)
+        latency: float = stats.wait_time + stats.service_time
+        stats.target = stats.rate * latency
+        prefetch: int = stats.prefetch
+
+        if self._completed and (
+            stats.wait_time > stats.service_time
+            or (
+                not self.policy.max_latency is None
+                and latency > self.policy.max_latency
+            )
+        ):
+            prefetch = min(
+                prefetch,
+                max(
+                    self.policy.min_prefetch,
+                    math.ceil(stats.rate * stats.service_time),
+                    int(prefetch * self.policy.decrease),
+                ),
+            )
+        elif stats.peak >= prefetch:
+            prefetch += self.policy.step
+
+        prefetch = min(prefetch, self.policy.max_prefetch)
+        self._completed = 0
+        self._window = now
+        stats.peak = stats.in_flight
+
+        if prefetch != stats.prefetch:
+            try:
+                await self._apply(prefetch)
+            except Exception:
+                return
+
+            if prefetch > stats.prefetch:
+                stats.increases += 1
+            else:
+                stats.decreases += 1
+
+            stats.prefetch = prefetch
+
+        self._schedule()
+
+    def _average(self, average: float, measure: float) -> float:
+        '''Update a moving average.
+
+        Args:
+            average (float): The current average.
+            measure (float): The last measure.
+
+        Returns:
+            float: The new average.
+        '''
+
+        return average + self.policy.smoothing * (measure - average)
+
+    def _schedule(self) -> None:
+        '''Arm the timer of the next adjustment.
+        '''
+
+        self._timer = asyncio.get_event_loop().call_later(
+            self.policy.interval, lambda: asyncio.ensure_future(self.tune())
+        )
+
+
+class AdaptivePrefetchError(Exception):
+    '''The AdaptivePrefetchError Exception class.
+    '''
+
+    def __init__(self, message: str):
+        super().__init__(message)
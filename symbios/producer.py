@@ -1,28 +1,55 @@
 '''
 @desc    The producer class for emit requests to the broker.
 @author  arthuchaut <arthuchaut@gmail.com>
-@version 0.1.0
+@version 0.8.0
 @date    2019-09-20
 @note    0.1.0 (2019-09-20): Writed the first drafts.
+@note    0.2.0 (2026-10-18): Leased the channels from the publishing pool.
+@note    0.3.0 (2026-10-18): Sharded the emits over the connections.
+@note    0.4.0 (2026-10-18): Added the bulk emits.
+@note    0.5.0 (2026-10-18): Bounded the unconfirmed emits with a window.
+@note    0.6.0 (2026-10-18): Kept the producer as a reusable handle.
+@note    0.7.0 (2026-10-18): Coalesced the small messages into envelopes.
+@note    0.7.1 (2026-10-18): Attached the properties to the messages before the
+                             middlewares.
+@note    0.7.2 (2026-10-18): Picked the content-types from the codec registry.
+@note    0.8.0 (2026-10-18): Added the headers of a single message.
 '''
 
-from typing import Awaitable, Any, Dict
+import asyncio
+from asyncio import Future, Lock
+from copy import copy
+from typing import (
+    Any,
+    Dict,
+    List,
+    Union,
+    Iterable,
+    AsyncIterable,
+    AsyncIterator,
+    Tuple,
+)
 
 from .utils import Props, Channel
+from .connector import Link
 from .message import SendingMessage
 from .exchange import Exchange
 from .middleware import MiddlewareLibrary, Event
-from .confirmation import EmitACK, ExchangeACK
+from .confirmation import EmitACK
+from .batch import Batching, Batcher, BatchEnvelope
 
 
 class Producer:
     '''The Producer class declaration.
 
     Allows to emit a message to the borker.
+    A Producer could be kept as a long-lived handle: the exchange and
+    the routing_key are checked once, the channel is kept between two
+    publications and the properties are prebuilt by body type.
+    The kept channel is leased from the pool until the Producer is
+    closed, so close it or use it as an asynchronous context manager.
 
     Attributes:
-        _CONTENT_TYPES (Dict[Any, str]): The association of types 
-            with their content-type.
         symbios (Symbios): The Symbios instance.
         exchange (str): the exchange name to bind with the exchange type.
         exchange_type (str): The exhange type.
@@ -32,16 +59,17 @@ class Producer:
         immediate (bool): Bypass the exchange type rules and send
             the message to the receiver directly if True.
         _midd_library (MiddlewareLibrary): The Symbios middleware library.        
+        _checked (bool): If the exchange and the routing_key were checked.
+        _link (Link): The connection of the kept channel.
+        _channel (Channel): The pooled channel leased between two
+            publications, until the Producer is closed.
+        _lock (Lock): Leases the kept channel once.
+        _templates (Dict[type, Props]): The prebuilt properties
+            by body type.
+        _batcher (Batcher): Coalesces the messages into envelopes
+            if the batching is enabled.
     '''
 
-    _CONTENT_TYPES: Dict[Any, str] = {
-        str: 'text/plain',
-        bool: 'text/plain',
-        int: 'text/plain',
-        float: 'text/plain',
-        dict: 'application/json',
-    }
-
     def __init__(
         self,
         *,
@@ -51,6 +79,7 @@ class Producer:
         props: Props = Props(),
         mandatory: bool = False,
         immediate: bool = False,
+        batching: Batching = None,
         midd_library: MiddlewareLibrary,
     ):
         '''The Producer initializer.
@@ -67,6 +96,9 @@ class Producer:
             immediate (bool): Bypass the exchange type rules and send
                 the message to the receiver directly if True.
                 Default to False.
+            batching (Batching): Coalesce the messages into envelopes
+                following this policy. See the BatchEnvelope documentation
+                for the envelope format. Default to None.
             _midd_library (MiddlewareLibrary): The Symbios middleware library.    
         '''
 
@@ -79,16 +111,30 @@ class Producer:
         self.declare_ok: object = None
         self.produce_ok: object = None
         self._midd_library: MiddlewareLibrary = midd_library
-
-    async def emit(self, message: SendingMessage) -> EmitACK:
-        '''Emit a message to the broker.
-
-        Important: Make sure that the destination queue(s) are correctly 
-        declared by a Consumer before sending a message.
-        Call all associated middlewares before emit the message.
+        self._checked: bool = False
+        self._link: Link = None
+        self._channel: Channel = None
+        self._lock: Lock = None
+        self._templates: Dict[type, Props] = {}
+        self._batcher: Batcher = None
+
+        if not batching is None:
+            self._batcher = Batcher(batching, self._publish_envelope)
+
+    async def publish(
+        self, body: Any, *, headers: Dict[str, Any] = None
+    ) -> EmitACK:
+        '''Emit a message body through the kept channel and wait for
+        its confirmation.
+
+        The message is sent by itself even if the batching is enabled,
+        since an envelope is confirmed only once it is flushed:
+        publish_deferred is the batching path.
 
         Args:
-            message (SendingMessage): The message to send.
+            body (Any): The message body to send.
+            headers (Dict[str, Any]): Some headers merged with the ones
+                of the properties for this message only. Default to None.
 
         Raises:
             ProducerError: If the type of exchange requires a routing_key.
@@ -97,11 +143,92 @@ class Producer:
             EmitACK: The producer confirmation.
         '''
 
-        chann: Channel = await self.symbios.channel
+        message: SendingMessage = SendingMessage(body)
+        link, chann = await self._hold()
+        await self._serialize(message, headers)
 
-        if self.exchange.exchange != '' and self.exchange.exchange is not None:
-            declare_ok = await chann.exchange_declare(**self.exchange.__dict__)
-            self.declare_ok = ExchangeACK(declare_ok)
+        return await (await self._send(link, chann, message))
+
+    async def publish_deferred(
+        self, body: Any, *, headers: Dict[str, Any] = None
+    ) -> Future:
+        '''Emit a message body through the kept channel without waiting
+        for its confirmation.
+
+        This is the batching path: the message is added to the pending
+        envelope and the future is resolved once the envelope is
+        confirmed. The headers of a message can't be batched, since
+        the envelope records carry only its body, its content-type and
+        its content-encoding.
+
+        Args:
+            body (Any): The message body to send.
+            headers (Dict[str, Any]): Some headers merged with the ones
+                of the properties for this message only. Default to None.
+
+        Raises:
+            ProducerError: If the type of exchange requires a routing_key,
+                or if some headers are given with the batching.
+
+        Returns:
+            Future: The future resolved with the EmitACK once the broker
+                has confirmed the message.
+        '''
+
+        message: SendingMessage = SendingMessage(body)
+
+        if not self._batcher is None:
+            if headers:
+                raise ProducerError(
+                    'The headers of a message can\'t be batched.'
+                )
+
+            return await self._batch(message)
+
+        link, chann = await self._hold()
+        await self._serialize(message, headers)
+
+        return await self._send(link, chann, message)
+
+    async def flush(self) -> None:
+        '''Emit the pending envelope if the batching is enabled.
+        '''
+
+        if not self._batcher is None:
+            await self._batcher.flush()
+
+    async def close(self) -> None:
+        '''Emit the pending envelope, then give the kept channel back
+        to the pool.
+        '''
+
+        await self.flush()
+
+        if not self._channel is None:
+            self._link.publish_pool.release(self._channel)
+            self._channel = None
+
+    async def __aenter__(self) -> 'Producer':
+        '''Use the Producer as an asynchronous context manager.
+
+        Returns:
+            Producer: The Producer itself.
+        '''
+
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        '''Close the Producer when leaving the context.
+        '''
+
+        await self.close()
+
+    def check(self) -> None:
+        '''Check the routing_key against the type of exchange.
+
+        Raises:
+            ProducerError: If the type of exchange requires a routing_key.
+        '''
 
         if not self.exchange.exchange_type in [
             Exchange.FANOUT,
@@ -114,30 +241,345 @@ class Producer:
                 )
             )
 
-        if not self.props.content_type:
-            self.props.content_type = self._determine_content_type(message)
+    async def _hold(self) -> Tuple[Link, Channel]:
+        '''The pooled channel kept between two publications.
+
+        The channel stays leased until the Producer is closed. A new
+        one is leased if it isn't kept yet or if it was closed.
+
+        Raises:
+            ProducerError: If the type of exchange requires a routing_key.
+
+        Returns:
+            Tuple[Link, Channel]: The connection and its channel.
+        '''
+
+        if self._lock is None:
+            self._lock = Lock()
+
+        async with self._lock:
+            if self._channel is None or self._channel.is_closed:
+                if not self._channel is None:
+                    self._link.publish_pool.release(self._channel)
+                    self._channel = None
+
+                self._link = self.symbios.publish_link(self.routing_key)
+                chann: Channel = await self._link.publish_pool.acquire()
+
+                try:
+                    await self._prepare(self._link, chann)
+                except BaseException:
+                    self._link.publish_pool.release(chann)
+                    raise
+
+                self._channel = chann
+
+        return self._link, self._channel
+
+    async def emit(self, message: SendingMessage) -> EmitACK:
+        '''Emit a message to the broker.
+
+        Important: Make sure that the destination queue(s) are correctly 
+        declared by a Consumer before sending a message.
+        Call all associated middlewares before emit the message.
+        The channel is leased from the publishing pool of the connection
+        picked by the Symbios sharding strategy. The exchange is declared
+        only once per connection. The message is sent by itself even if
+        the batching is enabled.
+
+        Args:
+            message (SendingMessage): The message to send.
+
+        Raises:
+            ProducerError: If the type of exchange requires a routing_key.
+
+        Returns:
+            EmitACK: The producer confirmation.
+        '''
+
+        self.produce_ok = await (await self._emit_nowait(message))
+
+        return self.produce_ok
+
+    async def emit_deferred(self, message: SendingMessage) -> Future:
+        '''Emit a message to the broker without waiting for
+        its confirmation.
+
+        Wait only while the confirmation window of the channel is full.
+        If the batching is enabled, the message is added to the pending
+        envelope instead.
+
+        Args:
+            message (SendingMessage): The message to send.
+
+        Raises:
+            ProducerError: If the type of exchange requires a routing_key.
+
+        Returns:
+            Future: The future resolved with the EmitACK once the broker
+                has confirmed the message.
+        '''
+
+        if not self._batcher is None:
+            return await self._batch(message)
+
+        return await self._emit_nowait(message)
+
+    async def emit_many(
+        self,
+        messages: Union[
+            Iterable[SendingMessage], AsyncIterable[SendingMessage]
+        ],
+    ) -> List[Union[EmitACK, Exception]]:
+        '''Emit a bulk of messages to the broker.
+
+        The exchange and the routing_key are checked once, then all the
+        messages are serialized and written on the same channel without
+        waiting for the previous confirmations, as long as the
+        confirmation window of the channel isn't full. If the batching
+        is enabled, they are added to the pending envelopes instead.
+
+        Args:
+            messages (Union[Iterable[SendingMessage],
+                AsyncIterable[SendingMessage]]): The messages to send.
+
+        Raises:
+            ProducerError: If the type of exchange requires a routing_key.
+
+        Returns:
+            List[Union[EmitACK, Exception]]: The producer confirmation
+                of each message, in the order of the messages, or its
+                delivery error if the broker refused it.
+        '''
+
+        produce_oks: List[Future] = []
+
+        if not self._batcher is None:
+            async for message in self._iterate(messages):
+                produce_oks.append(await self._batch(message))
+        else:
+            link: Link = self.symbios.publish_link(self.routing_key)
+
+            async with link.publish_pool.lease() as chann:
+                await self._prepare(link, chann)
+
+                async for message in self._iterate(messages):
+                    await self._serialize(message)
+                    produce_oks.append(
+                        await self._send(link, chann, message)
+                    )
+
+        return list(
+            await asyncio.gather(*produce_oks, return_exceptions=True)
+        )
+
+    async def _prepare(self, link: Link, chann: Channel) -> None:
+        '''Declare the exchange and check the routing_key.
+
+        The exchange is declared once per connection and the routing_key
+        is checked once per Producer.
+
+        Args:
+            link (Link): The connection to emit on.
+            chann (Channel): The leased channel.
+
+        Raises:
+            ProducerError: If the type of exchange requires a routing_key.
+        '''
+
+        if self.exchange.exchange != '' and self.exchange.exchange is not None:
+            self.declare_ok = await link.topology.declare_exchange(
+                chann, self.exchange
+            )
+
+        if self._checked:
+            return
+
+        self.check()
+
+        self._checked = True
+
+    @staticmethod
+    async def _iterate(
+        messages: Union[
+            Iterable[SendingMessage], AsyncIterable[SendingMessage]
+        ],
+    ) -> AsyncIterator[SendingMessage]:
+        '''Iterate the messages of a bulk, synchronous or not.
+
+        Args:
+            messages (Union[Iterable[SendingMessage],
+                AsyncIterable[SendingMessage]]): The messages.
+
+        Returns:
+            AsyncIterator[SendingMessage]: The messages.
+        '''
+
+        if hasattr(messages, '__aiter__'):
+            async for message in messages:
+                yield message
+        else:
+            for message in messages:
+                yield message
+
+    async def _emit_nowait(self, message: SendingMessage) -> Future:
+        '''Serialize a message and publish it by itself through a leased
+        channel, without waiting for the broker confirmation.
+
+        Args:
+            message (SendingMessage): The message to send.
+
+        Raises:
+            ProducerError: If the type of exchange requires a routing_key.
+
+        Returns:
+            Future: The future resolved with the EmitACK.
+        '''
+
+        link: Link = self.symbios.publish_link(self.routing_key)
+
+        async with link.publish_pool.lease() as chann:
+            await self._prepare(link, chann)
+            await self._serialize(message)
+
+            return await self._send(link, chann, message)
+
+    async def _batch(self, message: SendingMessage) -> Future:
+        '''Serialize a message and add it to the pending envelope.
+
+        No channel is leased: the envelope is published through
+        the kept channel once it is flushed.
+
+        Args:
+            message (SendingMessage): The message to send.
+
+        Raises:
+            ProducerError: If the type of exchange requires a routing_key.
+
+        Returns:
+            Future: The future resolved with the EmitACK
+                of the envelope.
+        '''
+
+        self.check()
+        await self._serialize(message)
+
+        return await self._batcher.add(message.props, message.serialized)
+
+    async def _serialize(
+        self, message: SendingMessage, headers: Dict[str, Any] = None
+    ) -> None:
+        '''Set the properties of a message and call the emitting
+        middlewares on it.
+
+        The properties are copied from the template of the body type
+        for each message, since the channel writes the message_id in.
+
+        Args:
+            message (SendingMessage): The message to send.
+            headers (Dict[str, Any]): Some headers merged with the ones
+                of the template. Default to None.
+        '''
+
+        props: Props = copy(self._template(message))
+        message.props = props
+
+        if headers:
+            props.headers = {**(props.headers or {}), **headers}
 
         if not self._midd_library is None:
             await self._midd_library.run_until_end(
                 self.symbios, message, Event.ON_EMIT
             )
 
-        produce_ok = await chann.basic_publish(
-            message.serialized,
-            routing_key=self.routing_key,
-            exchange=self.exchange.exchange,
-            properties=self.props,
-            immediate=self.immediate,
-            mandatory=self.mandatory,
+    async def _send(
+        self, link: Link, chann: Channel, message: SendingMessage
+    ) -> Future:
+        '''Publish a serialized message without waiting for the broker
+        confirmation.
+
+        Args:
+            link (Link): The connection to emit on.
+            chann (Channel): The leased channel.
+            message (SendingMessage): The serialized message.
+
+        Returns:
+            Future: The future resolved with the EmitACK.
+        '''
+
+        produce_ok: Future = await link.window(chann).push(
+            chann.basic_publish(
+                message.serialized,
+                routing_key=self.routing_key,
+                exchange=self.exchange.exchange,
+                properties=message.props,
+                immediate=self.immediate,
+                mandatory=self.mandatory,
+            )
         )
+        link.stats.published += 1
 
-        self.produce_ok = EmitACK(produce_ok)
+        return produce_ok
 
-        return self.produce_ok
+    async def _publish_envelope(self, body: bytes, count: int) -> Future:
+        '''Publish an envelope body through the kept channel.
+
+        Args:
+            body (bytes): The envelope body.
+            count (int): The number of messages in the envelope.
+
+        Returns:
+            Future: The future resolved with the EmitACK.
+        '''
+
+        link, chann = await self._hold()
+
+        props: Props = copy(self.props)
+        props.content_type = BatchEnvelope.CONTENT_TYPE
+        props.content_encoding = None
+        props.headers = {**(props.headers or {}), BatchEnvelope.HEADER: count}
+
+        produce_ok: Future = await link.window(chann).push(
+            chann.basic_publish(
+                body,
+                routing_key=self.routing_key,
+                exchange=self.exchange.exchange,
+                properties=props,
+                immediate=self.immediate,
+                mandatory=self.mandatory,
+            )
+        )
+        link.stats.published += 1
+
+        return produce_ok
+
+    def _template(self, message: SendingMessage) -> Props:
+        '''The prebuilt properties for the type of the message body.
+
+        Args:
+            message (SendingMessage): The message to send.
+
+        Returns:
+            Props: The properties template. Must be copied before use.
+        '''
+
+        body_type: type = type(message.body)
+
+        if not body_type in self._templates:
+            template: Props = copy(self.props)
+
+            if not template.content_type:
+                template.content_type = self._determine_content_type(message)
+
+            self._templates[body_type] = template
+
+        return self._templates[body_type]
 
     def _determine_content_type(self, message: SendingMessage) -> str:
         '''Try to determine the content-type via the message type.
 
+        See Symbios.codecs.
+
         Args:
             message (SendingMessage): The message to send.
 
@@ -145,14 +587,7 @@ class Producer:
             str: The content_type retreived or ''.
         '''
 
-        content_type: str = ''
-
-        try:
-            content_type = Producer._CONTENT_TYPES[type(message.body)]
-        except KeyError as e:
-            pass
-
-        return content_type
+        return self.symbios.codecs.content_type_of(message.body)
 
 
 class ProducerError(Exception):
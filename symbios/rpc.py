@@ -1,21 +1,42 @@
 '''
 @desc    The RPC class definition.
 @author  arthuchaut <arthuchaut@gmail.com>
-@version 0.1.0
+@version 0.6.0
 @date    2019-09-21
 @note    0.1.0 (2019-09-21): Writed the first drafts.
+@note    0.2.0 (2026-10-18): Received the replies with a single consumer.
+@note    0.3.0 (2026-10-18): Expired the calls with the timer wheel.
+@note    0.4.0 (2026-10-18): Implemented the server side.
+@note    0.5.0 (2026-10-18): Implemented the scatter-gather.
+@note    0.6.0 (2026-10-18): Cached the responses of the calls.
 '''
 
-from typing import Dict, Callable, List
+from typing import (
+    Any,
+    Awaitable,
+    AsyncIterator,
+    Dict,
+    Callable,
+    Iterable,
+    List,
+    Tuple,
+    Union,
+)
 from uuid import uuid4
-from asyncio import Task, Future
+import asyncio
+from asyncio import Task, Future, Lock
+from functools import partial
 
 import aiormq
 
-from .utils import Props
+from .utils import Props, Channel, DeliveredMessage, ArgumentsType
+from .connector import Link
 from .message import IncomingMessage, SendingMessage
 from .queue import Queue
-from .timeout import Timeout
+from .confirmation import ListenACK
+from .cache import RPCCache
+from .middleware import Event
+from .timeout import Timer, TimeoutElapsed
 
 
 class RPC:
@@ -23,86 +44,680 @@ class RPC:
 
     Allows to call the broker and waiting for its response back.
 
+    The replies of all the calls are received by a single consumer,
+    started on the first call, and dispatched by correlation_id.
+    It consumes the RabbitMQ direct reply-to pseudo-queue if the broker
+    supports it, else an exclusive queue named by the broker.
+    The requests are published on the channel of the reply consumer,
+    as required by the direct reply-to.
+
+    On the server side, serve() answers the calls of a queue.
+
     Attributes:
+        _DEFAULT_FANOUT (int): The default maximum number of calls
+            of a scatter-gather in flight at once.
+        DIRECT_REPLY_TO (str): The RabbitMQ direct reply-to pseudo-queue.
+        ERROR_HEADER (str): The header of the error replies, that holds
+            the type of the exception raised by the server.
+
         symbios (Symbios): A Symbios instance.
-        _future (Future): The future response back.
-        _ack (bool): Allows to know if the response was sent.
+        cache (RPCCache): The response cache of the calls, or None.
+        direct (bool): Try the direct reply-to. Unset if the broker
+            refused it.
+        _futures (Dict[str, Tuple[Future, Timer]]): The future
+            response back and the timeout of each pending call,
+            by correlation_id.
         _reply_queue (str): The queue to tell the broker where to reply.
+        _link (Link): The connection of the reply consumer.
+        _channel (Channel): The channel of the reply consumer.
+        _lock (Lock): Starts the reply consumer once.
+        _server_link (Link): The connection of the replies of the server.
+        _server_channel (Channel): The pooled channel leased to publish
+            the replies of the server, until the RPC is closed.
+        _server_lock (Lock): Leases the channel of the server once.
+        _flights (Dict[Tuple[str, str, bytes], Task]): The cached calls
+            in flight by key, shared by the concurrent misses.
     '''
 
-    def __init__(self, symbios: object):
+    _DEFAULT_FANOUT: int = 64
+    DIRECT_REPLY_TO: str = 'amq.rabbitmq.reply-to'
+    ERROR_HEADER: str = 'x-symbios-error'
+
+    def __init__(
+        self,
+        symbios: object,
+        *,
+        cache: RPCCache = None,
+        direct: bool = True,
+    ):
         '''The RPC initializer.
 
         Args:
             symbios (Symbios): The symbios instance.
+            cache (RPCCache): The response cache of the calls.
+                Set it to answer the repeated idempotent calls without
+                reaching the broker. Default to None.
+            direct (bool): Try the direct reply-to. Default to True.
         '''
 
         self.symbios: object = symbios
-        self._futures: Dict[str, Future] = {}
+        self.cache: RPCCache = cache
+        self.direct: bool = direct
+        self._futures: Dict[str, Tuple[Future, Timer]] = {}
         self._reply_queue: str = None
+        self._link: Link = None
+        self._channel: Channel = None
+        self._lock: Lock = None
+        self._server_link: Link = None
+        self._server_channel: Channel = None
+        self._server_lock: Lock = None
+        self._flights: Dict[Tuple[str, str, bytes], Task] = {}
+
+    async def close(self) -> None:
+        '''Give the channel of the server replies back to the pool.
+        '''
+
+        if not self._server_channel is None:
+            self._server_link.publish_pool.release(self._server_channel)
+            self._server_channel = None
+
+    async def _start(self) -> None:
+        '''Start the reply consumer, unless it is running.
+
+        A new one is started if its channel was closed.
+        '''
+
+        if self._lock is None:
+            self._lock = Lock()
+
+        async with self._lock:
+            if not self._channel is None and not self._channel.is_closed:
+                return
+
+            self._link = self.symbios.consume_link()
+            chann: Channel = await self._link.open_channel()
+
+            if self.direct:
+                try:
+                    await chann.basic_consume(
+                        self.DIRECT_REPLY_TO, self._on_delivery, no_ack=True
+                    )
+                    self._reply_queue = self.DIRECT_REPLY_TO
+                    self._channel = chann
+
+                    return
+                except aiormq.exceptions.ChannelClosed:
+                    self.direct = False
+                    chann = await self._link.open_channel()
+
+            declare_ok = await chann.queue_declare(
+                exclusive=True, auto_delete=True
+            )
+            await chann.basic_consume(
+                declare_ok.queue, self._on_delivery, no_ack=True
+            )
+            self._reply_queue = declare_ok.queue
+            self._channel = chann
+
+    async def _on_delivery(self, message: DeliveredMessage) -> None:
+        '''Call the listening middlewares on a reply, then dispatch it.
+
+        Args:
+            message (DeliveredMessage): The aiormq message model.
+        '''
+
+        message: IncomingMessage = IncomingMessage(
+            message, codecs=self.symbios.codecs
+        )
+
+        await self.symbios._midd_library.run_until_end(
+            self.symbios, message, Event.ON_LISTEN
+        )
+        await self._on_reply(self.symbios, message)
 
     async def _on_reply(
         self, symbios: object, message: IncomingMessage
     ) -> None:
         '''The task that will be called on the broker response.
 
-        Valorize the self.response attribute with the received message.
+        Resolve the future of the call with the received message,
+        or fail it if the message is an error reply.
+        The replies of the expired calls are dropped.
 
         Args:
             message (IncomingMessage): The message from the broker.
+
+        Raises:
+            RPCError: If the message has no correlation_id.
         '''
 
-        try:
-            future, countdown = self._futures.pop(message.props.correlation_id)
+        if not message.props.correlation_id:
+            raise RPCError(f'Expected a correlation_id from the server.')
+
+        pending: Tuple[Future, Timer] = self._futures.pop(
+            message.props.correlation_id, None
+        )
 
-            countdown.stop()
+        if pending is None:
+            return
+
+        future, timer = pending
+
+        if not timer is None:
+            timer.cancel()
+
+        if future.done():
+            return
+
+        headers: Dict[str, Any] = message.props.headers or {}
+
+        if self.ERROR_HEADER in headers:
+            future.set_exception(
+                RPCRemoteError(
+                    f'{headers[self.ERROR_HEADER]}: {message.deserialized}'
+                )
+            )
+        else:
             future.set_result(message)
-        except Exception as e:
-            raise RPCError(f'Expected a correlation_id from the server.')
 
     async def call(
-        self, message: SendingMessage, *, routing_key: str, timeout: int = None
+        self,
+        message: SendingMessage,
+        *,
+        routing_key: str,
+        timeout: int = None,
+        cached: bool = True,
     ) -> IncomingMessage:
         '''The calling procedure.
 
         Emit a message to the broker and wait for its response back.
+        If the cache holds the response of the same call, it is
+        returned without reaching the broker. The concurrent calls
+        missing the same entry share a single request.
         
         Args:
             message (SendingMessage): The message to send.
             routing_key (str): The routing key to emit the message.
             timeout (int): The time limite (in second) for the timeout.
-                Raised a TimeoutElapsed exception if the countdown has
-                expired. Default to None.
+                Default to None.
+            cached (bool): Use the cache, if any. Default to True.
+
+        Raises:
+            RPCError: If the broker refused the request, or if
+                the server failed to process it.
+            TimeoutElapsed: If the response didn't come back in time.
+
+        Returns:
+            IncomingMessage: The broker response back.
+        '''
+
+        key: Tuple[str, str, bytes] = None
+
+        if cached and not self.cache is None:
+            key = self.cache.key(
+                routing_key,
+                self.symbios.codecs.encode(message.body),
+                self.symbios.codecs.content_type_of(message.body),
+            )
+
+        if key is None:
+            return await self._call(message, routing_key, timeout)
+
+        reply: Union[IncomingMessage, Exception] = self.cache.get(key)
+
+        if isinstance(reply, Exception):
+            raise type(reply)(*reply.args)
+
+        if not reply is None:
+            return reply
+
+        flight: Task = self._flights.get(key)
+
+        if flight is None:
+            flight = asyncio.ensure_future(
+                self._fill(key, message, routing_key, timeout)
+            )
+            flight.add_done_callback(partial(self._land, key))
+            self._flights[key] = flight
+
+        return await asyncio.shield(flight)
+
+    async def _fill(
+        self,
+        key: Tuple[str, str, bytes],
+        message: SendingMessage,
+        routing_key: str,
+        timeout: int,
+    ) -> IncomingMessage:
+        '''Call the server on a cache miss, then cache its response
+        or its error.
+
+        Args:
+            key (Tuple[str, str, bytes]): The cache key of the call.
+            message (SendingMessage): The message to send.
+            routing_key (str): The routing key to emit the message.
+            timeout (int): The time limite (in second) for the timeout.
+
+        Returns:
+            IncomingMessage: The broker response back.
+        '''
+
+        try:
+            reply: IncomingMessage = await self._call(
+                message, routing_key, timeout
+            )
+        except RPCRemoteError as e:
+            self.cache.put(key, e)
+
+            raise
+
+        self.cache.put(key, reply)
+
+        return reply
+
+    def _land(self, key: Tuple[str, str, bytes], flight: Task) -> None:
+        '''Forget a finished call shared by the concurrent misses.
+
+        Args:
+            key (Tuple[str, str, bytes]): The cache key of the call.
+            flight (Task): The finished call.
+        '''
+
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+        if not flight.cancelled():
+            flight.exception()
+
+    async def _call(
+        self, message: SendingMessage, routing_key: str, timeout: int
+    ) -> IncomingMessage:
+        '''Emit a message to the broker and wait for its response back.
+
+        Args:
+            message (SendingMessage): The message to send.
+            routing_key (str): The routing key to emit the message.
+            timeout (int): The time limite (in second) for the timeout.
 
         Returns:
             IncomingMessage: The broker response back.
         '''
 
+        await self._start()
+
         cid: str = str(uuid4())
-        countdown: Timeout = Timeout(self.symbios.event_loop)
         future: Future = self.symbios.event_loop.create_future()
+        timer: Timer = None
+
+        if timeout:
+            timer = self.symbios.timers.schedule(
+                timeout, partial(self._expire, cid)
+            )
+
+        self._futures[cid] = (future, timer)
+
+        try:
+            await self._publish(message, routing_key, cid)
+
+            return await future
+        finally:
+            self._futures.pop(cid, None)
+
+            if not timer is None:
+                timer.cancel()
+
+    async def gather(
+        self,
+        requests: Iterable[Tuple[SendingMessage, str]],
+        *,
+        fanout: int = _DEFAULT_FANOUT,
+        timeout: float = None,
+        deadline: float = None,
+    ) -> AsyncIterator[Tuple[int, Union[IncomingMessage, Exception]]]:
+        '''Scatter many calls and gather their responses back
+        as they arrive.
+
+        At most fanout calls are in flight at once: the next request
+        is sent when a response comes back. A failed call yields its
+        exception instead of a response, e.g. a TimeoutElapsed if its
+        response didn't come back within timeout. Once deadline has
+        elapsed, the iteration stops with the responses gathered so
+        far: the calls in flight are abandoned and the other requests
+        are not sent. Closing the iterator abandons them as well.
+
+        Args:
+            requests (Iterable[Tuple[SendingMessage, str]]): The messages
+                to send, with their routing key. Consumed lazily.
+            fanout (int): The maximum number of calls in flight.
+                Default to _DEFAULT_FANOUT.
+            timeout (float): The time limit (in seconds) of each call.
+                Default to None.
+            deadline (float): The time limit (in seconds) of all the
+                calls. Default to None.
+
+        Yields:
+            Tuple[int, Union[IncomingMessage, Exception]]: The index of
+                a request and its response back, or its exception.
+        '''
+
+        loop: asyncio.AbstractEventLoop = self.symbios.event_loop
+        end: float = None if deadline is None else loop.time() + deadline
+        requests = enumerate(requests)
+        pending: Dict[Task, int] = {}
+        exhausted: bool = False
+
+        try:
+            while True:
+                while not exhausted and len(pending) < fanout:
+                    try:
+                        index, (message, routing_key) = next(requests)
+                    except StopIteration:
+                        exhausted = True
+                        break
+
+                    call: Task = loop.create_task(
+                        self.call(
+                            message, routing_key=routing_key, timeout=timeout
+                        )
+                    )
+                    pending[call] = index
+
+                if not pending:
+                    return
+
+                remaining: float = None
+
+                if not end is None:
+                    remaining = end - loop.time()
+
+                    if remaining <= 0:
+                        return
+
+                done, _ = await asyncio.wait(
+                    pending,
+                    timeout=remaining,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+
+                for call in done:
+                    yield pending.pop(call), (
+                        call.exception() or call.result()
+                    )
+        finally:
+            for call in pending:
+                if not call.done():
+                    call.cancel()
+                elif not call.cancelled():
+                    call.exception()
+
+    def _expire(self, cid: str) -> None:
+        '''Fail a call whose response didn't come back in time.
+
+        Args:
+            cid (str): The correlation_id of the call.
+        '''
 
-        self._futures[cid] = (future, countdown)
+        pending: Tuple[Future, Timer] = self._futures.pop(cid, None)
 
-        queue: Queue = Queue(cid, auto_delete=True)
+        if not pending is None and not pending[0].done():
+            pending[0].set_exception(TimeoutElapsed())
 
-        await self.symbios.declare_queue(queue)
-        await self.symbios.listen(self._on_reply, queue=queue, no_ack=True)
+    async def _publish(
+        self, message: SendingMessage, routing_key: str, cid: str
+    ) -> None:
+        '''Serialize a request and publish it on the channel of
+        the reply consumer, without waiting for its confirmation.
 
-        await self.symbios.emit(
-            message,
-            routing_key=routing_key,
-            props=Props(correlation_id=cid, reply_to=queue.queue),
+        Args:
+            message (SendingMessage): The message to send.
+            routing_key (str): The routing key to emit the message.
+            cid (str): The correlation_id of the call.
+        '''
+
+        message.props = Props(
+            content_type=self.symbios.codecs.content_type_of(message.body),
+            correlation_id=cid,
+            reply_to=self._reply_queue,
         )
 
-        if timeout:
-            await countdown.start(timeout)
+        await self.symbios._midd_library.run_until_end(
+            self.symbios, message, Event.ON_EMIT
+        )
+
+        produce_ok: Future = await self._link.window(self._channel).push(
+            self._channel.basic_publish(
+                message.serialized,
+                routing_key=routing_key,
+                properties=message.props,
+            )
+        )
+        produce_ok.add_done_callback(partial(self._on_confirm, cid))
+        self._link.stats.published += 1
+
+    def _on_confirm(self, cid: str, produce_ok: Future) -> None:
+        '''Fail the call if the broker refused its request.
+
+        Args:
+            cid (str): The correlation_id of the call.
+            produce_ok (Future): The confirmation of the request.
+        '''
+
+        if produce_ok.cancelled() or produce_ok.exception() is None:
+            return
+
+        pending: Tuple[Future, Timer] = self._futures.get(cid)
+
+        if pending is None or pending[0].done():
+            return
+
+        future, timer = pending
+
+        if not timer is None:
+            timer.cancel()
+
+        future.set_exception(
+            RPCError(f'The request was refused: {produce_ok.exception()}')
+        )
+
+    async def serve(
+        self,
+        handler: Callable[[object, IncomingMessage], Awaitable[Any]],
+        *,
+        queue: Queue = Queue(),
+        exclusive: bool = False,
+        arguments: ArgumentsType = None,
+        consumer_tag: str = None,
+        connection: int = None,
+        prefetch_count: int = None,
+        concurrency: int = None,
+    ) -> ListenACK:
+        '''Answer the calls of a queue.
+
+        The handler is called with each request, up to concurrency at
+        once, and its result is replied to the reply_to of the request
+        with its correlation_id. If the handler raises, an error reply
+        is sent instead, with the type of the exception in the
+        ERROR_HEADER header and its message as body: the call raises
+        an RPCError. A result of None is replied with an empty body,
+        and a result that could not be serialized with the
+        serialization error. The request is acknowledged once replied.
+        The requests without reply_to are processed without reply.
+
+        The replies are published on a pooled channel kept by the RPC,
+        without waiting for their confirmations: under load, they are
+        pipelined within the confirmation window of the channel.
+
+        Args:
+            handler (Callable[[Symbios, IncomingMessage], Awaitable[Any]]):
+                The coroutine function that returns the reply body.
+            queue (Queue): The queue of the requests. Default to Queue().
+            exclusive (bool): Makes this consumer exclusive.
+                Default to False.
+            arguments (ArgumentsType): The consumer arguments.
+                Default to None.
+            consumer_tag (str): The consumer tag. Default to None.
+            connection (int): The index of the connection to listen on.
+                Picked by round robin if None. Default to None.
+            prefetch_count (int): The maximum number of unacknowledged
+                requests. Default to 2 * concurrency.
+            concurrency (int): The maximum number of handlers running
+                at once. Default to the Consumer default.
+
+        Returns:
+            ListenACK: The consumer confirmation.
+        '''
+
+        return await self.symbios.listen(
+            partial(self._answer, handler),
+            queue=queue,
+            exclusive=exclusive,
+            arguments=arguments,
+            consumer_tag=consumer_tag,
+            connection=connection,
+            prefetch_count=prefetch_count,
+            concurrency=concurrency,
+        )
+
+    async def _answer(
+        self,
+        handler: Callable[[object, IncomingMessage], Awaitable[Any]],
+        symbios: object,
+        message: IncomingMessage,
+    ) -> None:
+        '''Call the handler with a request, then reply its result or
+        its error.
+
+        A result of None is replied with an empty body. If the result
+        could not be serialized, the serialization error is replied
+        instead, so that the request is acknowledged and the call
+        doesn't wait for its timeout.
+
+        Args:
+            handler (Callable[[Symbios, IncomingMessage], Awaitable[Any]]):
+                The coroutine function that returns the reply body.
+            symbios (Symbios): The Symbios instance.
+            message (IncomingMessage): The request.
+
+        Raises:
+            Exception: The handler exception, if the request has
+                no reply_to.
+        '''
+
+        headers: Dict[str, Any] = None
+
+        try:
+            body: Any = await handler(symbios, message)
+        except Exception as e:
+            if not message.props.reply_to:
+                raise
+
+            body = str(e)
+            headers = {self.ERROR_HEADER: type(e).__name__}
 
-        return await future
+        if not message.props.reply_to:
+            return
+
+        try:
+            reply: SendingMessage = await self._serialize(
+                message, b'' if body is None else body, headers
+            )
+        except Exception as e:
+            reply = await self._serialize(
+                message, str(e), {self.ERROR_HEADER: type(e).__name__}
+            )
+
+        await self._reply(message, reply)
+
+    async def _serialize(
+        self, request: IncomingMessage, body: Any, headers: Dict[str, Any]
+    ) -> SendingMessage:
+        '''Build a reply and call the emitting middlewares on it.
+
+        Args:
+            request (IncomingMessage): The request to answer.
+            body (Any): The reply body.
+            headers (Dict[str, Any]): The reply headers.
+
+        Returns:
+            SendingMessage: The serialized reply.
+        '''
+
+        message: SendingMessage = SendingMessage(body)
+        message.props = Props(
+            content_type=self.symbios.codecs.content_type_of(body),
+            correlation_id=request.props.correlation_id,
+            headers=headers,
+        )
+
+        await self.symbios._midd_library.run_until_end(
+            self.symbios, message, Event.ON_EMIT
+        )
+
+        return message
+
+    async def _reply(
+        self, request: IncomingMessage, message: SendingMessage
+    ) -> None:
+        '''Publish a reply without waiting for its confirmation.
+
+        Args:
+            request (IncomingMessage): The request to answer.
+            message (SendingMessage): The serialized reply.
+        '''
+
+        link, chann = await self._hold()
+
+        produce_ok: Future = await link.window(chann).push(
+            chann.basic_publish(
+                message.serialized,
+                routing_key=request.props.reply_to,
+                properties=message.props,
+            )
+        )
+        produce_ok.add_done_callback(self._on_reply_confirm)
+        link.stats.published += 1
+
+    async def _hold(self) -> Tuple[Link, Channel]:
+        '''The pooled channel kept to publish the replies of the server.
+
+        The channel stays leased until the RPC is closed. A new one
+        is leased if it isn't kept yet or if it was closed.
+
+        Returns:
+            Tuple[Link, Channel]: The connection and its channel.
+        '''
+
+        if self._server_lock is None:
+            self._server_lock = Lock()
+
+        async with self._server_lock:
+            if self._server_channel is None or self._server_channel.is_closed:
+                await self.close()
+                self._server_link = self.symbios.publish_link()
+                self._server_channel = (
+                    await self._server_link.publish_pool.acquire()
+                )
+
+        return self._server_link, self._server_channel
+
+    @staticmethod
+    def _on_reply_confirm(produce_ok: Future) -> None:
+        '''Drop the delivery error of a reply refused by the broker.
+
+        The call of a lost reply expires on the client side.
+
+        Args:
+            produce_ok (Future): The confirmation of the reply.
+        '''
+
+        if not produce_ok.cancelled():
+            produce_ok.exception()
 
     def multi_calls(self, calls: List[call]) -> List[Task]:
         '''Process multi asynchronous RPC.
 
+        The calls are all started at once. See gather() to bound them.
+
         Args:
             calls (List[RPC.call]): The list of RPC.call.
 
@@ -122,3 +737,12 @@ class RPCError(Exception):
     '''The RPCError exception class.
     '''
 
+
+class RPCRemoteError(RPCError):
+    '''The RPCRemoteError exception class.
+
+    Raised when the server failed to process a call.
+    '''
+
+    def __init__(self, message: str):
+        super().__init__(message)
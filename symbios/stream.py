@@ -0,0 +1,497 @@
+'''
+@desc    The chunked streaming of the large payloads.
+@author  arthuchaut <arthuchaut@gmail.com>
+@version 0.1.0
+@date    2026-10-18
+@note    0.1.0 (2026-10-18): Writed the first drafts.
+'''
+
+import asyncio
+import inspect
+from asyncio import Event, Future, Task
+from collections import deque
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Deque,
+    Dict,
+    Set,
+    Union,
+    IO,
+)
+from uuid import uuid4
+
+from .utils import Props, DeliveredMessage, ArgumentsType
+from .message import IncomingMessage
+from .queue import Queue
+from .producer import Producer
+from .consumer import Consumer
+from .middleware import MiddlewareLibrary, Event as MiddlewareEvent
+
+
+class Stream:
+    '''The Stream class declaration.
+
+    A payload is split into chunks, each one sent as an AMQP message
+    flagged by the stream headers:
+
+        HEADER_ID   The stream identifier, shared by all its chunks.
+        HEADER_SEQ  The chunk position in the stream, from 0.
+        HEADER_END  Set to True on the last chunk only.
+
+    Attributes:
+        HEADER_ID (str): The header of the stream identifier.
+        HEADER_SEQ (str): The header of the chunk position.
+        HEADER_END (str): The header flagging the last chunk.
+        _DEFAULT_CHUNK_SIZE (int): The default chunk size (in bytes).
+        _DEFAULT_PREFETCH (int): The default number of chunks delivered
+            and not yet read by the handlers.
+        _DEFAULT_CHUNK_TIMEOUT (float): The default time (in seconds)
+            waited for a missing chunk.
+    '''
+
+    HEADER_ID: str = 'x-symbios-stream-id'
+    HEADER_SEQ: str = 'x-symbios-stream-seq'
+    HEADER_END: str = 'x-symbios-stream-end'
+
+    _DEFAULT_CHUNK_SIZE: int = 256 * 1024
+    _DEFAULT_PREFETCH: int = 16
+    _DEFAULT_CHUNK_TIMEOUT: float = 30.0
+
+
+class StreamEmitter:
+    '''The StreamEmitter class declaration.
+
+    Splits a payload into chunks and emits them through a Producer.
+    At most max_in_flight chunks of the channel are held in memory
+    until they are confirmed by the broker.
+
+    Attributes:
+        producer (Producer): The producer of the chunks.
+        chunk_size (int): The maximum size of a chunk (in bytes).
+    '''
+
+    def __init__(
+        self, producer: Producer, chunk_size: int = Stream._DEFAULT_CHUNK_SIZE
+    ):
+        '''The StreamEmitter initializer.
+
+        Args:
+            producer (Producer): The producer of the chunks.
+            chunk_size (int): The maximum size of a chunk (in bytes).
+                Default to Stream._DEFAULT_CHUNK_SIZE.
+
+        Raises:
+            StreamError: If the chunk size is lower than 1.
+        '''
+
+        if chunk_size < 1:
+            raise StreamError(
+                f'The chunk size must be greater than 0, {chunk_size} given.'
+            )
+
+        self.producer: Producer = producer
+        self.chunk_size: int = chunk_size
+
+    async def emit(self, source: Union[AsyncIterable[bytes], IO]) -> str:
+        '''Emit a payload chunk by chunk.
+
+        The last chunk is only known once the source is exhausted, so
+        each chunk is emitted when the next one is read.
+
+        Args:
+            source (Union[AsyncIterable[bytes], IO]): An async iterator
+                of bytes, or a file object opened in binary mode whose
+                read method could be a coroutine.
+
+        Raises:
+            ProducerError: If the type of exchange requires a routing_key.
+
+        Returns:
+            str: The stream identifier, once all the chunks
+                are confirmed by the broker.
+        '''
+
+        stream_id: str = uuid4().hex
+        produce_oks: Deque[Future] = deque()
+        pending: bytes = None
+        seq: int = 0
+
+        async for chunk in self._read(source):
+            if not pending is None:
+                produce_oks.append(
+                    await self._send(stream_id, seq, pending, False)
+                )
+                seq += 1
+
+                while produce_oks and produce_oks[0].done():
+                    produce_oks.popleft().result()
+
+            pending = chunk
+
+        produce_oks.append(
+            await self._send(stream_id, seq, pending or b'', True)
+        )
+        await asyncio.gather(*produce_oks)
+
+        return stream_id
+
+    async def _read(
+        self, source: Union[AsyncIterable[bytes], IO]
+    ) -> AsyncIterator[memoryview]:
+        '''Read the chunks of a source.
+
+        The buffers larger than chunk_size are sliced without being
+        copied.
+
+        Args:
+            source (Union[AsyncIterable[bytes], IO]): The payload source.
+
+        Returns:
+            AsyncIterator[memoryview]: The chunks.
+        '''
+
+        if hasattr(source, '__aiter__'):
+            async for data in source:
+                view: memoryview = memoryview(data).cast('B')
+
+                for offset in range(0, len(view), self.chunk_size):
+                    yield view[offset : offset + self.chunk_size]
+
+            return
+
+        while True:
+            data: Any = source.read(self.chunk_size)
+
+            if inspect.isawaitable(data):
+                data = await data
+
+            if not data:
+                return
+
+            yield memoryview(data)
+
+    async def _send(
+        self, stream_id: str, seq: int, chunk: bytes, end: bool
+    ) -> Future:
+        '''Emit a chunk without waiting for its confirmation.
+
+        Args:
+            stream_id (str): The stream identifier.
+            seq (int): The chunk position.
+            chunk (bytes): The chunk body.
+            end (bool): If it is the last chunk.
+
+        Returns:
+            Future: The future resolved with the EmitACK.
+        '''
+
+        return await self.producer.publish_deferred(
+            chunk,
+            headers={
+                Stream.HEADER_ID: stream_id,
+                Stream.HEADER_SEQ: seq,
+                Stream.HEADER_END: end,
+            },
+        )
+
+
+class ChunkStream:
+    '''The ChunkStream class declaration.
+
+    The async iterator of the chunk bodies of an incoming stream, given
+    to the stream handler. A chunk is acknowledged once it is read, so
+    the number of chunks held in memory is bounded by the prefetch
+    count of the consumer. The chunks delivered out of order are
+    reordered.
+
+    Attributes:
+        stream_id (str): The stream identifier.
+        props (Props): The properties of the first chunk.
+        timeout (float): The time (in seconds) waited for the next chunk.
+        _consumer (StreamConsumer): The consumer of the chunks.
+        _chunks (Dict[int, IncomingMessage]): The chunks received
+            and not yet read, by position.
+        _next (int): The position of the next chunk to read.
+        _end (int): The position of the last chunk, None while unknown.
+        _arrived (Event): Set when a chunk is received.
+        _closed (bool): If the stream was closed.
+    '''
+
+    def __init__(
+        self,
+        stream_id: str,
+        props: Props,
+        timeout: float,
+        consumer: 'StreamConsumer',
+    ):
+        '''The ChunkStream initializer.
+
+        Args:
+            stream_id (str): The stream identifier.
+            props (Props): The properties of the first chunk.
+            timeout (float): The time (in seconds) waited for
+                the next chunk.
+            consumer (StreamConsumer): The consumer of the chunks.
+        '''
+
+        self.stream_id: str = stream_id
+        self.props: Props = props
+        self.timeout: float = timeout
+        self._consumer: StreamConsumer = consumer
+        self._chunks: Dict[int, IncomingMessage] = {}
+        self._next: int = 0
+        self._end: int = None
+        self._arrived: Event = Event()
+        self._closed: bool = False
+
+    async def put(
+        self, seq: int, message: IncomingMessage, end: bool
+    ) -> None:
+        '''Receive a chunk.
+
+        A redelivered chunk already read or already received is
+        acknowledged and dropped.
+
+        Args:
+            seq (int): The chunk position.
+            message (IncomingMessage): The chunk.
+            end (bool): If it is the last chunk.
+        '''
+
+        if seq < self._next or seq in self._chunks:
+            await message.ack()
+            return
+
+        self._chunks[seq] = message
+
+        if end:
+            self._end = seq
+
+        self._arrived.set()
+
+    def __aiter__(self) -> 'ChunkStream':
+        return self
+
+    async def __anext__(self) -> bytes:
+        '''Read the next chunk body and acknowledge it.
+
+        Raises:
+            StreamTimeoutError: If the next chunk didn't arrive in time.
+                The stream is closed.
+
+        Returns:
+            bytes: The chunk body.
+        '''
+
+        while not self._next in self._chunks:
+            if self._closed or (
+                not self._end is None and self._next > self._end
+            ):
+                await self.close()
+                raise StopAsyncIteration
+
+            self._arrived.clear()
+
+            try:
+                await asyncio.wait_for(self._arrived.wait(), self.timeout)
+            except asyncio.TimeoutError:
+                await self.close()
+                raise StreamTimeoutError(
+                    f'Chunk {self._next} of the stream {self.stream_id} '
+                    f'not received after {self.timeout}s.'
+                )
+
+        message: IncomingMessage = self._chunks.pop(self._next)
+        self._next += 1
+        await message.ack()
+
+        return message.body
+
+    async def close(self) -> None:
+        '''Close the stream and reject its unread chunks.
+
+        The chunks of a closed stream received afterward are rejected
+        too.
+        '''
+
+        if self._closed:
+            return
+
+        self._closed = True
+        self._arrived.set()
+        self._consumer._streams.pop(self.stream_id, None)
+        messages, self._chunks = list(self._chunks.values()), {}
+
+        for message in messages:
+            await message.reject()
+
+
+class StreamConsumer(Consumer):
+    '''The StreamConsumer class declaration.
+
+    Listen the chunked streams of a queue. The chunks of a stream must
+    be consumed by a single consumer, since they are reassembled
+    in memory. The prefetch count bounds the chunks held in memory.
+
+    Attributes:
+        chunk_timeout (float): The time (in seconds) waited for
+            a missing chunk.
+        task (Callable[[Symbios, ChunkStream], None]): The handler
+            to call when a stream begins.
+        _streams (Dict[str, ChunkStream]): The streams being read.
+        _handlers (Set[Task]): The running handlers, awaited on close.
+    '''
+
+    def __init__(
+        self,
+        *,
+        symbios: object,
+        queue: Queue = Queue(),
+        exclusive: bool = False,
+        arguments: ArgumentsType = None,
+        consumer_tag: str = None,
+        connection: int = None,
+        prefetch_count: int = Stream._DEFAULT_PREFETCH,
+        chunk_timeout: float = Stream._DEFAULT_CHUNK_TIMEOUT,
+        midd_library: MiddlewareLibrary,
+    ):
+        '''The StreamConsumer initializer.
+
+        Args:
+            symbios (Symbios): The Symbios instance.
+            queue (str): The queue to consume. Default to Queue().
+            exclusive (bool): Only one consumer registered to
+                the targeted queue. Default to False.
+            arguments (ArgumentsType): Some properties to the consumer.
+                Default to None.
+            consumer_tag (str): The consumer identity. Default to None.
+            connection (int): The index of the connection to listen on.
+                Picked by round-robin if None. Default to None.
+            prefetch_count (int): The number of chunks delivered and not
+                yet read by the handlers.
+                Default to Stream._DEFAULT_PREFETCH.
+            chunk_timeout (float): The time (in seconds) waited for
+                a missing chunk. Default to Stream._DEFAULT_CHUNK_TIMEOUT.
+            midd_library (MiddlewareLibrary): The Symbios middleware library.
+        '''
+
+        super().__init__(
+            symbios=symbios,
+            queue=queue,
+            no_ack=False,
+            exclusive=exclusive,
+            arguments=arguments,
+            consumer_tag=consumer_tag,
+            connection=connection,
+            prefetch_count=prefetch_count,
+            midd_library=midd_library,
+        )
+
+        self.chunk_timeout: float = chunk_timeout
+        self._streams: Dict[str, ChunkStream] = {}
+        self._handlers: Set[Task] = set()
+
+    async def _embed(self, message: DeliveredMessage) -> None:
+        '''Route a chunk to its stream.
+
+        Call the associated middlewares, then start the handler
+        on the first chunk of a stream. A message without stream
+        headers is read as a stream of a single chunk. The chunks
+        of an unknown or closed stream are rejected. If a middleware
+        fails, the chunk is negatively acknowledged and the exception
+        is raised again.
+
+        Args:
+            message (DeliveredMessage): The aiormq message model.
+        '''
+
+        message: IncomingMessage = self._receive(message)
+        headers: Dict[str, Any] = message.props.headers or {}
+        stream_id: str = headers.get(Stream.HEADER_ID)
+        seq: int = int(headers.get(Stream.HEADER_SEQ, 0))
+        end: bool = bool(headers.get(Stream.HEADER_END, stream_id is None))
+
+        if stream_id is None:
+            stream_id = uuid4().hex
+
+        if not self._midd_library is None:
+            try:
+                await self._midd_library.run_until_end(
+                    self.symbios, message, MiddlewareEvent.ON_LISTEN
+                )
+            except Exception:
+                await self._settle(message, False)
+                raise
+
+        stream: ChunkStream = self._streams.get(stream_id)
+
+        if stream is None:
+            if seq != 0:
+                await message.reject()
+                return
+
+            stream = ChunkStream(
+                stream_id, message.props, self.chunk_timeout, self
+            )
+            self._streams[stream_id] = stream
+            handler: Task = asyncio.ensure_future(self._handle(stream))
+            self._handlers.add(handler)
+            handler.add_done_callback(self._on_handled)
+
+        await stream.put(seq, message, end)
+
+    async def _handle(self, stream: ChunkStream) -> None:
+        '''Call the handler, then close its stream.
+
+        Args:
+            stream (ChunkStream): The incoming stream.
+        '''
+
+        try:
+            await self.task(self.symbios, stream)
+        finally:
+            await stream.close()
+
+    def _on_handled(self, handler: Task) -> None:
+        '''Forget a finished handler and report its failure to
+        the exception handler of the loop.
+
+        Args:
+            handler (Task): The finished handler.
+        '''
+
+        self._handlers.discard(handler)
+
+        if handler.cancelled() or handler.exception() is None:
+            return
+
+        asyncio.get_event_loop().call_exception_handler(
+            {
+                'message': 'Stream handler failed',
+                'exception': handler.exception(),
+                'task': handler,
+            }
+        )
+
+    async def close(self) -> None:
+        '''Close the streams being read and wait for their handlers,
+        then close the channel.
+        '''
+
+        for stream in list(self._streams.values()):
+            await stream.close()
+
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        await super().close()
+
+
+class StreamError(Exception):
+    '''The StreamError exception class.
+    '''
+
+
+class StreamTimeoutError(StreamError):
+    '''The StreamTimeoutError exception class.
+    '''
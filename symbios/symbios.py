@@ -1,26 +1,58 @@
 '''
 @desc    The main class of the Symbios library.
 @author  arthuchaut <arthuchaut@gmail.com>
-@version 0.3.0
+@version 0.16.2
 @date    2019-09-20
 @note    0.1.0 (2019-09-20): Writed the first drafts.
 @note    0.2.0 (2019-09-21): Implemented the class methods.
 @note    0.3.0 (2019-09-22): Implemented some basic middlewares.
+@note    0.4.0 (2026-10-18): Leased the channels from the pools.
+@note    0.5.0 (2026-10-18): Opened several connections to the broker.
+@note    0.6.0 (2026-10-18): Added the bulk emits.
+@note    0.7.0 (2026-10-18): Added the producer handles.
+@note    0.8.0 (2026-10-18): Added the batching of the small messages.
+@note    0.9.0 (2026-10-18): Added the codec registry.
+@note    0.10.0 (2026-10-18): Added the streams.
+@note    0.11.0 (2026-10-18): Added the QoS and the settlement of the messages.
+@note    0.12.0 (2026-10-18): Added the batch listening.
+@note    0.13.0 (2026-10-18): Added the pools of workers.
+@note    0.13.1 (2026-10-18): Deserialized the incoming bodies lazily.
+@note    0.14.0 (2026-10-18): Added the pull consumer.
+@note    0.15.0 (2026-10-18): Added the partitioned dispatch.
+@note    0.16.0 (2026-10-18): Added the adaptive prefetch, and closed the
+                              listeners with the instance.
+@note    0.16.1 (2026-10-18): Shared a timer wheel.
+@note    0.16.2 (2026-10-18): Closed the RPC with the instance.
 '''
 
-from typing import Dict, Union, Callable, Awaitable, Any
-
-from .utils import Props, ArgumentsType, Channel
-from .connector import Connector
+from asyncio import Future
+from concurrent.futures import Executor
+from typing import (
+    Dict,
+    Union,
+    Callable,
+    Hashable,
+    List,
+    Iterable,
+    AsyncIterable,
+    IO,
+)
+
+from .utils import Props, ArgumentsType
+from .connector import Connector, Link
 from .queue import Queue
 from .exchange import Exchange
 from .message import IncomingMessage, SendingMessage
 from .middleware import MiddlewareLibrary, MiddlewareABC, Event
 from .producer import Producer
-from .consumer import Consumer
+from .consumer import Consumer, BatchConsumer, PullConsumer, Execution
 from .rpc import RPC
+from .batch import Batching
+from .codec import CodecRegistry
+from .stream import Stream, StreamEmitter, StreamConsumer, ChunkStream
+from .prefetch import AdaptivePrefetch
+from .timeout import TimerWheel
 
-from middlewares.deserializer_middleware import DeserializerMiddleware
 from middlewares.serializer_middleware import SerializerMiddleware
 from .confirmation import EmitACK, ListenACK, ExchangeACK, QueueACK
 
@@ -32,7 +64,13 @@ class Symbios(Connector):
 
     Attributes:
         _midd_library (MiddlewareLibrary): The middleware library.
+        codecs (CodecRegistry): The body codecs by content-type and
+            by Python type. Register a codec to support a new format.
+        timers (TimerWheel): The timer wheel of the timeouts.
         rpc (RPC): The RPC instance.
+        executors (List[Executor]): The pools of workers of
+            the listeners, shut down on close.
+        consumers (List[Consumer]): The listeners, closed on close.
     '''
 
     def __init__(self, **kwargs: Dict[str, Union[str, int]]):
@@ -46,19 +84,28 @@ class Symbios(Connector):
         super().__init__(**kwargs)
 
         self._midd_library: MiddlewareLibrary = MiddlewareLibrary()
+        self.codecs: CodecRegistry = CodecRegistry()
+        self.timers: TimerWheel = TimerWheel()
         self.rpc: RPC = RPC(self)
+        self.executors: List[Executor] = []
+        self.consumers: List[Consumer] = []
         self._init_standard_middlewares()
 
     def _init_standard_middlewares(self) -> None:
         '''Implement some basic middlewares.
+
+        The incoming bodies are deserialized lazily, on the first access
+        to IncomingMessage.deserialized. Use DeserializerMiddleware to
+        deserialize them eagerly.
         '''
 
         self.use(SerializerMiddleware(Event.ON_EMIT))
-        self.use(DeserializerMiddleware(Event.ON_LISTEN))
 
     async def declare_queue(self, queue: Queue) -> QueueACK:
         '''Declare a queue to the broker.
 
+        The queue is always declared, then remembered by the connection.
+
         Args:
             queue (Queue): The queue to declare
 
@@ -66,15 +113,16 @@ class Symbios(Connector):
             QueueACK: The validation of the declaration.
         '''
 
-        chan: Channel = await self.channel
-
-        confirmation = await chan.queue_declare(**queue.__dict__)
+        link: Link = self.consume_link()
 
-        return QueueACK(confirmation)
+        async with link.consume_pool.lease() as chan:
+            return await link.topology.declare_queue(chan, queue, force=True)
 
     async def declare_exchange(self, exchange: Exchange) -> ExchangeACK:
         '''Declare an exchange to the broker.
 
+        The exchange is always declared, then remembered by the connection.
+
         Args:
             exchange (Exchange): The exchange to declare
 
@@ -82,11 +130,66 @@ class Symbios(Connector):
             ExchangeACK: The validation of the declaration.
         '''
 
-        chan: Channel = await self.channel
+        link: Link = self.publish_link()
+
+        async with link.publish_pool.lease() as chan:
+            return await link.topology.declare_exchange(
+                chan, exchange, force=True
+            )
+
+    def producer(
+        self,
+        *,
+        exchange: Exchange = Exchange(),
+        routing_key: str = None,
+        props: Props = Props(),
+        mandatory: bool = False,
+        immediate: bool = False,
+        batching: Batching = None,
+    ) -> Producer:
+        '''Create a long-lived emitter handle.
+
+        The handle checks the exchange and the routing_key once, keeps
+        a pooled channel and prebuilds the message properties.
+        Use Producer.publish(body) to emit through it, and close it
+        to give its channel back to the pool.
 
-        confirmation = await chan.exchange_declare(**exchange.__dict__)
+        Args:
+            exchange (Exchange): the exchange name to bind with the 
+                exchange type. Default to Exchange().
+            routing_key (str): The message routing key. Default to None.
+            props (Props): The message properties that contain the header.
+                Default to an empty instance of Props.
+            mandatory (bool): Tell if the message is important or not.
+                Default to False.
+            immediate (bool): Bypass the exchange type rules and send
+                the message to the receiver directly if True.
+                Default to False.
+            batching (Batching): Coalesce the messages published with
+                Producer.publish_deferred into envelopes following this
+                policy. The listeners unpack them transparently.
+                Default to None.
 
-        return ExchangeACK(confirmation)
+        Raises:
+            ProducerError: If the type of exchange requires a routing_key.
+
+        Returns:
+            Producer: The emitter handle.
+        '''
+
+        producer: Producer = Producer(
+            symbios=self,
+            exchange=exchange,
+            routing_key=routing_key,
+            props=props,
+            mandatory=mandatory,
+            immediate=immediate,
+            batching=batching,
+            midd_library=self._midd_library,
+        )
+        producer.check()
+
+        return producer
 
     async def emit(
         self,
@@ -114,17 +217,270 @@ class Symbios(Connector):
                 Default to False.
         '''
 
-        producer: Producer = Producer(
+        producer: Producer = self.producer(
+            exchange=exchange,
+            routing_key=routing_key,
+            props=props,
+            mandatory=mandatory,
+            immediate=immediate,
+        )
+
+        return await producer.emit(message)
+
+    async def emit_deferred(
+        self,
+        message: SendingMessage,
+        *,
+        exchange: Exchange = Exchange(),
+        routing_key: str = None,
+        props: Props = Props(),
+        mandatory: bool = False,
+        immediate: bool = False,
+    ) -> Future:
+        '''Emit a message to the broker without waiting for
+        its confirmation.
+
+        Wait only while max_in_flight messages of the channel are
+        still unconfirmed.
+
+        Args:
+            message (SendingMessage): The message to send.
+            exchange (Exchange): the exchange name to bind with the 
+                exchange type. Default to Exchange().
+            routing_key (str): The message routing key. Default to None.
+            props (Props): The message properties that contain the header.
+                Default to an empty instance of Props.
+            mandatory (bool): Tell if the message is important or not.
+                Default to False.
+            immediate (bool): Bypass the exchange type rules and send
+                the message to the receiver directly if True.
+                Default to False.
+
+        Returns:
+            Future: The future resolved with the EmitACK once the broker
+                has confirmed the message.
+        '''
+
+        producer: Producer = self.producer(
+            exchange=exchange,
+            routing_key=routing_key,
+            props=props,
+            mandatory=mandatory,
+            immediate=immediate,
+        )
+
+        return await producer.emit_deferred(message)
+
+    async def emit_many(
+        self,
+        messages: Union[
+            Iterable[SendingMessage], AsyncIterable[SendingMessage]
+        ],
+        *,
+        exchange: Exchange = Exchange(),
+        routing_key: str = None,
+        props: Props = Props(),
+        mandatory: bool = False,
+        immediate: bool = False,
+    ) -> List[Union[EmitACK, Exception]]:
+        '''Emit a bulk of messages to the broker.
+
+        The messages are published one after the other on the same
+        channel without waiting for the previous confirmations.
+
+        Args:
+            messages (Union[Iterable[SendingMessage],
+                AsyncIterable[SendingMessage]]): The messages to send.
+            exchange (Exchange): the exchange name to bind with the 
+                exchange type. Default to Exchange().
+            routing_key (str): The messages routing key. Default to None.
+            props (Props): The messages properties that contain the header.
+                Default to an empty instance of Props.
+            mandatory (bool): Tell if the messages are important or not.
+                Default to False.
+            immediate (bool): Bypass the exchange type rules and send
+                the messages to the receiver directly if True.
+                Default to False.
+
+        Returns:
+            List[Union[EmitACK, Exception]]: The producer confirmation
+                of each message, in the order of the messages, or its
+                delivery error if the broker refused it.
+        '''
+
+        producer: Producer = self.producer(
+            exchange=exchange,
+            routing_key=routing_key,
+            props=props,
+            mandatory=mandatory,
+            immediate=immediate,
+        )
+
+        return await producer.emit_many(messages)
+
+    async def listen_batch(
+        self,
+        task: Callable[[object, List[IncomingMessage]], None],
+        *,
+        queue: Queue = Queue(),
+        exclusive: bool = False,
+        arguments: ArgumentsType = None,
+        consumer_tag: str = None,
+        connection: int = None,
+        prefetch_count: int = None,
+        max_batch: int = BatchConsumer._DEFAULT_MAX_BATCH,
+        max_wait: float = BatchConsumer._DEFAULT_MAX_WAIT,
+    ) -> ListenACK:
+        '''Listen the messages of a broker queue by batch.
+
+        The task is called with a list of up to max_batch messages,
+        or with the messages received within max_wait seconds.
+        A batch is acknowledged at once when the task succeeded, and
+        requeued if it raises, unless all its messages were already
+        redelivered.
+
+        Args:
+            task (Callable[[Symbios, List[IncomingMessage]], None]): The
+                task to call with a batch.
+            queue (str): The queue to consume. Default to Queue().
+            exclusive (bool): Only one consumer registered to 
+                the targeted queue. Default to False.
+            arguments (ArgumentsType): Some properties to the consumer.
+                Default to None.
+            consumer_tag (str): The consumer identity. Default to None.
+            connection (int): The index of the connection to listen on.
+                Picked by round-robin if None. Default to None.
+            prefetch_count (int): The maximum number of unacknowledged
+                messages delivered to the listener.
+                Default to twice max_batch.
+            max_batch (int): The maximum number of messages of a batch.
+                Default to BatchConsumer._DEFAULT_MAX_BATCH.
+            max_wait (float): The time (in seconds) waited for a batch
+                to fill after its first message.
+                Default to BatchConsumer._DEFAULT_MAX_WAIT.
+
+        Raises:
+            ConsumerError: If max_batch is lower than 1.
+
+        Returns:
+            ListenACK: The consumer confirmation.
+        '''
+
+        consumer: BatchConsumer = BatchConsumer(
             symbios=self,
+            queue=queue,
+            exclusive=exclusive,
+            arguments=arguments,
+            consumer_tag=consumer_tag,
+            connection=connection,
+            prefetch_count=prefetch_count,
+            max_batch=max_batch,
+            max_wait=max_wait,
+            midd_library=self._midd_library,
+        )
+
+        return await consumer.listen(task)
+
+    async def emit_stream(
+        self,
+        source: Union[AsyncIterable[bytes], IO],
+        *,
+        exchange: Exchange = Exchange(),
+        routing_key: str = None,
+        props: Props = Props(),
+        mandatory: bool = False,
+        immediate: bool = False,
+        chunk_size: int = Stream._DEFAULT_CHUNK_SIZE,
+    ) -> str:
+        '''Emit a large payload as a stream of chunks.
+
+        Each chunk is sent as a message flagged by the stream headers,
+        see the Stream documentation. Listen them with listen_stream.
+
+        Args:
+            source (Union[AsyncIterable[bytes], IO]): An async iterator
+                of bytes, or a file object opened in binary mode.
+            exchange (Exchange): the exchange name to bind with the 
+                exchange type. Default to Exchange().
+            routing_key (str): The chunks routing key. Default to None.
+            props (Props): The chunks properties that contain the header.
+                Default to an empty instance of Props.
+            mandatory (bool): Tell if the chunks are important or not.
+                Default to False.
+            immediate (bool): Bypass the exchange type rules and send
+                the chunks to the receiver directly if True.
+                Default to False.
+            chunk_size (int): The maximum size of a chunk (in bytes).
+                Default to Stream._DEFAULT_CHUNK_SIZE.
+
+        Raises:
+            StreamError: If the chunk size is lower than 1.
+
+        Returns:
+            str: The stream identifier, once all the chunks
+                are confirmed by the broker.
+        '''
+
+        async with self.producer(
             exchange=exchange,
             routing_key=routing_key,
             props=props,
             mandatory=mandatory,
             immediate=immediate,
+        ) as producer:
+            return await StreamEmitter(producer, chunk_size).emit(source)
+
+    async def listen_stream(
+        self,
+        task: Callable[[object, ChunkStream], None],
+        *,
+        queue: Queue = Queue(),
+        exclusive: bool = False,
+        arguments: ArgumentsType = None,
+        consumer_tag: str = None,
+        connection: int = None,
+        prefetch_count: int = Stream._DEFAULT_PREFETCH,
+        chunk_timeout: float = Stream._DEFAULT_CHUNK_TIMEOUT,
+    ) -> ListenACK:
+        '''Listen the streams emitted by emit_stream.
+
+        The task is called once per stream with a ChunkStream, the async
+        iterator of its chunk bodies. It raises StreamTimeoutError if
+        a chunk is missing for chunk_timeout seconds.
+
+        Args:
+            task (Callable[[Symbios, ChunkStream], None]): The
+                task to call when a stream begins.
+            queue (str): The queue to consume. Default to Queue().
+            exclusive (bool): Only one consumer registered to 
+                the targeted queue. Default to False.
+            arguments (ArgumentsType): Some properties to the consumer.
+                Default to None.
+            consumer_tag (str): The consumer identity. Default to None.
+            connection (int): The index of the connection to listen on.
+                Picked by round-robin if None. Default to None.
+            prefetch_count (int): The number of chunks held in memory
+                and not yet read. Default to Stream._DEFAULT_PREFETCH.
+            chunk_timeout (float): The time (in seconds) waited for
+                a missing chunk. Default to Stream._DEFAULT_CHUNK_TIMEOUT.
+
+        Returns:
+            ListenACK: The consumer confirmation.
+        '''
+
+        consumer: StreamConsumer = StreamConsumer(
+            symbios=self,
+            queue=queue,
+            exclusive=exclusive,
+            arguments=arguments,
+            consumer_tag=consumer_tag,
+            connection=connection,
+            prefetch_count=prefetch_count,
+            chunk_timeout=chunk_timeout,
             midd_library=self._midd_library,
         )
 
-        return await producer.emit(message)
+        return await consumer.listen(task)
 
     async def listen(
         self,
@@ -135,9 +491,43 @@ class Symbios(Connector):
         exclusive: bool = False,
         arguments: ArgumentsType = None,
         consumer_tag: str = None,
-    ) -> None:
+        connection: int = None,
+        prefetch_count: int = None,
+        prefetch_size: int = None,
+        concurrency: int = None,
+        execution: Execution = Execution.LOOP,
+        workers: int = None,
+        partition: Callable[[IncomingMessage], Hashable] = None,
+        lanes: int = Consumer._DEFAULT_LANES,
+        lane_depth: int = Consumer._DEFAULT_LANE_DEPTH,
+        adaptive: AdaptivePrefetch = None,
+    ) -> ListenACK:
         '''Listen a message from a broker queue.
 
+        Unless no_ack is set, a message is acknowledged once its task
+        succeeded. If the task raises, the message is requeued, or
+        discarded if it was already redelivered.
+
+        With the THREAD or PROCESS execution, the task is a blocking
+        function called in a pool of workers as task(body, props).
+        The body is deserialized in the worker, and the message is
+        settled back on the loop. A PROCESS task must be picklable,
+        as a function defined at the top level of a module.
+
+        With a partition function, the messages of a same key are
+        processed in the order of delivery, and the ones of different
+        keys in parallel over a bounded number of lanes. The function
+        is called with the message as delivered, before the middlewares:
+
+            await symbios.listen(
+                task, partition=lambda message: message.props.user_id
+            )
+
+        With an adaptive prefetch, the prefetch follows the measured
+        waiting and service times of the messages within the bounds
+        of the AdaptivePrefetch policy. The measurements are exposed
+        by ListenACK.prefetch.
+
         Args:
             task (Callable[[Symbios, IncomingMessage], None]): The
                 task to call when a message arrives.
@@ -149,9 +539,43 @@ class Symbios(Connector):
             arguments (ArgumentsType): Some properties to the consumer.
                 Default to None.
             consumer_tag (str): The consumer identity. Default to None.
-        '''
+            connection (int): The index of the connection to listen on.
+                Picked by round-robin if None. Default to None.
+            prefetch_count (int): The maximum number of unacknowledged
+                messages delivered to the listener. Default to twice
+                the concurrency, or unlimited if None.
+            prefetch_size (int): The maximum size (in bytes) of the
+                unacknowledged messages delivered to the listener.
+                Not supported by RabbitMQ. Default to None.
+            concurrency (int): The maximum number of tasks running
+                at once. Unlimited if None, or the number of workers
+                of the pool. Default to None.
+            execution (Execution): Where the task runs.
+                Default to Execution.LOOP.
+            workers (int): The number of workers of the pool. Default to
+                the number of CPUs for the processes, and to four more
+                for the threads.
+            partition (Callable[[IncomingMessage], Hashable]): The key
+                of the messages processed in order, e.g. a header,
+                the routing key or a body field. Default to None.
+            lanes (int): The number of lanes of the partitioned
+                messages. Default to Consumer._DEFAULT_LANES.
+            lane_depth (int): The number of messages per lane held by
+                the QoS, which defaults to lanes * lane_depth with
+                a partition function.
+                Default to Consumer._DEFAULT_LANE_DEPTH.
+            adaptive (AdaptivePrefetch): The tuning policy of
+                the prefetch, which replaces prefetch_count.
+                Default to None.
+
+        Raises:
+            ConsumerError: If the concurrency, the number of workers,
+                the number of lanes or their depth is lower than 1,
+                or if the task of a PROCESS execution is not picklable.
 
-        ack: QueueACK = await self.declare_queue(queue)
+        Returns:
+            ListenACK: The consumer confirmation.
+        '''
 
         consumer: Consumer = Consumer(
             symbios=self,
@@ -160,12 +584,96 @@ class Symbios(Connector):
             exclusive=exclusive,
             arguments=arguments,
             consumer_tag=consumer_tag,
+            connection=connection,
+            prefetch_count=prefetch_count,
+            prefetch_size=prefetch_size,
+            concurrency=concurrency,
+            execution=execution,
+            workers=workers,
+            partition=partition,
+            lanes=lanes,
+            lane_depth=lane_depth,
+            adaptive=adaptive,
             midd_library=self._midd_library,
         )
 
         return await consumer.listen(task)
 
-    def use(self, midd: MiddlewareABC) -> None:
+    def consume(
+        self,
+        queue: Queue = Queue(),
+        *,
+        batch: int = PullConsumer._DEFAULT_BATCH,
+        polling: float = None,
+        exclusive: bool = False,
+        arguments: ArgumentsType = None,
+        consumer_tag: str = None,
+        connection: int = None,
+    ) -> PullConsumer:
+        '''Iterate the messages of a broker queue.
+
+        A message is acknowledged when the iteration moves to the next
+        one, unless it was settled meanwhile. Use the iterator as an
+        async context manager, so that the last message is settled and
+        the channel is closed:
+
+            async with symbios.consume(Queue('tasks')) as messages:
+                async for message in messages:
+                    ...
+
+        Args:
+            queue (str): The queue to consume. Default to Queue().
+            batch (int): The number of messages buffered, and fetched
+                by bulk while polling.
+                Default to PullConsumer._DEFAULT_BATCH.
+            polling (float): Fetch the messages with basic_get, and wait
+                this time (in seconds) before polling again an empty
+                queue. Consume the queue if None. Default to None.
+            exclusive (bool): Only one consumer registered to
+                the targeted queue. Default to False.
+            arguments (ArgumentsType): Some properties to the consumer.
+                Default to None.
+            consumer_tag (str): The consumer identity. Default to None.
+            connection (int): The index of the connection to listen on.
+                Picked by round-robin if None. Default to None.
+
+        Raises:
+            ConsumerError: If batch is lower than 1.
+
+        Returns:
+            PullConsumer: The async iterator of the messages.
+        '''
+
+        return PullConsumer(
+            symbios=self,
+            queue=queue,
+            exclusive=exclusive,
+            arguments=arguments,
+            consumer_tag=consumer_tag,
+            connection=connection,
+            batch=batch,
+            polling=polling,
+            midd_library=self._midd_library,
+        )
+
+    async def close(self) -> None:
+        '''Close the listeners and all the broker connections, then
+        shut down the pools of workers of the listeners.
+        '''
+
+        for consumer in self.consumers:
+            await consumer.close()
+
+        self.consumers.clear()
+        await self.rpc.close()
+        await super().close()
+
+        for executor in self.executors:
+            executor.shutdown(wait=False)
+
+        self.executors.clear()
+
+    def use(self, midd: MiddlewareABC, *, index: int = None) -> None:
         '''Implement a new middleware for the consumer.
 
         All middlewares will be called before the main task.
@@ -174,6 +682,12 @@ class Symbios(Connector):
         Args:
             midd (MiddlewareABC): The middleware instance to register to the
                 middleware library.
+            index (int): The position of the middleware among the ones
+                of its event. Appended after them if None.
+                Default to None.
         '''
 
-        self._midd_library.append(midd)
+        if index is None:
+            self._midd_library.append(midd)
+        else:
+            self._midd_library.insert(index, midd)
@@ -1,13 +1,16 @@
 '''
 @desc    The timeout class.
 @author  arthuchaut <arthuchaut@gmail.com>
-@version 0.1.0
+@version 0.2.0
 @date    2019-09-23
 @note    0.1.0 (2019-09-23): Writed the first drafts.
+@note    0.2.0 (2026-10-18): Implemented a shared timer wheel.
 '''
 
 import asyncio
-from asyncio import AbstractEventLoop, Task, CancelledError
+import math
+from asyncio import AbstractEventLoop, Task, CancelledError, TimerHandle
+from typing import Callable, List, Set
 
 
 class Timeout:
@@ -21,17 +24,15 @@ class Timeout:
         _task (Task): A coroutine that process the countdown.
     '''
 
-    def __init__(
-        self, loop: AbstractEventLoop = asyncio.get_event_loop()
-    ) -> None:
+    def __init__(self, loop: AbstractEventLoop = None) -> None:
         '''The Timeout initializer.
 
         Args:
             _loop (AbstractEventLoop): The asyncio event loop.
-                Default to a new event loop.
+                Default to the current event loop.
         '''
 
-        self._loop: AbstractEventLoop = loop
+        self._loop: AbstractEventLoop = loop or asyncio.get_event_loop()
         self._task: Task = None
 
     async def start(self, limit: int) -> None:
@@ -74,6 +75,213 @@ class Timeout:
             self._task.cancel()
 
 
+class Timer:
+    '''The Timer class declaration.
+
+    A callback scheduled on a TimerWheel.
+
+    Attributes:
+        tick (int): The tick of the wheel at which the timer expires.
+        callback (Callable[[], None]): The function called on expiry.
+        _wheel (TimerWheel): The wheel holding the timer, or None once
+            it expired or was cancelled.
+    '''
+
+    __slots__ = ('tick', 'callback', '_wheel')
+
+    def __init__(
+        self, tick: int, callback: Callable[[], None], wheel: object
+    ):
+        '''The Timer initializer.
+
+        Args:
+            tick (int): The tick of the wheel at which the timer expires.
+            callback (Callable[[], None]): The function called on expiry.
+            wheel (TimerWheel): The wheel holding the timer.
+        '''
+
+        self.tick: int = tick
+        self.callback: Callable[[], None] = callback
+        self._wheel: object = wheel
+
+    @property
+    def pending(self) -> bool:
+        '''Whether the timer neither expired nor was cancelled.
+        '''
+
+        return not self._wheel is None
+
+    def cancel(self) -> None:
+        '''Unschedule the timer, unless it already expired.
+        '''
+
+        if not self._wheel is None:
+            self._wheel._remove(self)
+
+
+class TimerWheel:
+    '''The TimerWheel class declaration.
+
+    A hashed timer wheel, shared by many timeouts instead of a task or
+    a loop timer each. The timers are hashed by their expiry tick into
+    a ring of slots, so scheduling and cancelling are O(1). A single
+    loop timer advances the wheel tick by tick while timers are
+    pending, and fires the expired timers of the current slot.
+    The timers expire at most one resolution late.
+
+    Attributes:
+        _DEFAULT_RESOLUTION (float): The default duration (in seconds)
+            of a tick.
+        _DEFAULT_SLOTS (int): The default number of slots.
+
+        resolution (float): The duration (in seconds) of a tick.
+        slots (int): The number of slots. The timers of farther ticks
+            share the slots and are skipped until their tick.
+        _wheel (List[Set[Timer]]): The timers by slot.
+        _count (int): The number of pending timers.
+        _origin (float): The loop time of the tick 0.
+        _cursor (int): The next tick to process.
+        _loop (AbstractEventLoop): The loop advancing the wheel.
+        _handle (TimerHandle): The loop timer of the next tick.
+    '''
+
+    _DEFAULT_RESOLUTION: float = 0.01
+    _DEFAULT_SLOTS: int = 1024
+
+    def __init__(
+        self,
+        *,
+        resolution: float = _DEFAULT_RESOLUTION,
+        slots: int = _DEFAULT_SLOTS,
+    ):
+        '''The TimerWheel initializer.
+
+        Args:
+            resolution (float): The duration (in seconds) of a tick.
+                Default to _DEFAULT_RESOLUTION.
+            slots (int): The number of slots. Default to _DEFAULT_SLOTS.
+        '''
+
+        self.resolution: float = resolution
+        self.slots: int = slots
+        self._wheel: List[Set[Timer]] = [set() for _ in range(slots)]
+        self._count: int = 0
+        self._origin: float = None
+        self._cursor: int = 0
+        self._loop: AbstractEventLoop = None
+        self._handle: TimerHandle = None
+
+    def __len__(self) -> int:
+        '''The number of pending timers.
+        '''
+
+        return self._count
+
+    def schedule(self, delay: float, callback: Callable[[], None]) -> Timer:
+        '''Schedule a callback.
+
+        Args:
+            delay (float): The time (in seconds) before the expiry.
+            callback (Callable[[], None]): The function called on expiry.
+
+        Returns:
+            Timer: The timer, to cancel it.
+        '''
+
+        if not self._count:
+            self._loop = asyncio.get_event_loop()
+
+            if self._origin is None:
+                self._origin = self._loop.time()
+
+            self._cursor = self._tick_of(self._loop.time())
+
+        tick: int = max(
+            self._cursor,
+            math.ceil(
+                (self._loop.time() + delay - self._origin) / self.resolution
+            ),
+        )
+        timer: Timer = Timer(tick, callback, self)
+
+        self._wheel[tick % self.slots].add(timer)
+        self._count += 1
+
+        if self._handle is None:
+            self._arm()
+
+        return timer
+
+    def _remove(self, timer: Timer) -> None:
+        '''Unschedule a pending timer.
+
+        Args:
+            timer (Timer): The timer to remove.
+        '''
+
+        self._wheel[timer.tick % self.slots].discard(timer)
+        timer._wheel = None
+        self._count -= 1
+
+        if not self._count and not self._handle is None:
+            self._handle.cancel()
+            self._handle = None
+
+    def _advance(self) -> None:
+        '''Fire the timers expired since the last tick processed.
+
+        The loop may have been late: a whole turn of the wheel at most
+        is scanned to catch up.
+        '''
+
+        self._handle = None
+        now: int = self._tick_of(self._loop.time())
+        start: int = self._cursor
+        self._cursor = max(start, now + 1)
+
+        for cursor in range(start, min(now, start + self.slots - 1) + 1):
+            slot: Set[Timer] = self._wheel[cursor % self.slots]
+
+            if not slot:
+                continue
+
+            for timer in [timer for timer in slot if timer.tick <= now]:
+                if timer._wheel is None:
+                    continue
+
+                self._remove(timer)
+
+                try:
+                    timer.callback()
+                except Exception as e:
+                    self._loop.call_exception_handler(
+                        {'message': 'Timer callback failed', 'exception': e}
+                    )
+
+        if self._count and self._handle is None:
+            self._arm()
+
+    def _arm(self) -> None:
+        '''Schedule the processing of the next tick.
+        '''
+
+        self._handle = self._loop.call_at(
+            self._origin + self._cursor * self.resolution, self._advance
+        )
+
+    def _tick_of(self, time: float) -> int:
+        '''The tick of a loop time.
+
+        Args:
+            time (float): A loop time.
+
+        Returns:
+            int: The last tick started at this time.
+        '''
+
+        return int((time - self._origin) / self.resolution)
+
+
 class TimeoutElapsed(Exception):
     '''The TimeoutElapsed Exception.
 
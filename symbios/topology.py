@@ -0,0 +1,120 @@
+'''
+@desc    The topology declaration cache.
+@author  arthuchaut <arthuchaut@gmail.com>
+@version 0.1.0
+@date    2026-10-18
+@note    0.1.0 (2026-10-18): Writed the first drafts.
+'''
+
+from typing import Dict, Tuple, Union
+
+from .utils import Channel
+from .queue import Queue
+from .exchange import Exchange
+from .confirmation import ExchangeACK, QueueACK
+
+
+class TopologyCache:
+    '''The TopologyCache class declaration.
+
+    Remember the exchanges and queues already declared on a connection
+    so that they are not declared again to the broker.
+    The server-named and the auto-deleted declarations are never cached
+    since the broker could forget them while the connection is alive.
+
+    Attributes:
+        _exchanges (Dict[Tuple, ExchangeACK]): The declared exchanges
+            by declaration arguments.
+        _queues (Dict[Tuple, QueueACK]): The declared queues
+            by declaration arguments.
+    '''
+
+    def __init__(self):
+        '''The TopologyCache initializer.
+        '''
+
+        self._exchanges: Dict[Tuple, ExchangeACK] = {}
+        self._queues: Dict[Tuple, QueueACK] = {}
+
+    async def declare_exchange(
+        self, chann: Channel, exchange: Exchange, *, force: bool = False
+    ) -> ExchangeACK:
+        '''Declare an exchange if it isn't declared yet.
+
+        Args:
+            chann (Channel): The channel to declare the exchange on.
+            exchange (Exchange): The exchange to declare.
+            force (bool): Declare the exchange even if it is cached.
+                Default to False.
+
+        Returns:
+            ExchangeACK: The validation of the declaration.
+        '''
+
+        key: Tuple = self._key(exchange)
+
+        if force or not key in self._exchanges:
+            ack: ExchangeACK = ExchangeACK(
+                await chann.exchange_declare(**exchange.__dict__)
+            )
+
+            if exchange.auto_delete:
+                return ack
+
+            self._exchanges[key] = ack
+
+        return self._exchanges[key]
+
+    async def declare_queue(
+        self, chann: Channel, queue: Queue, *, force: bool = False
+    ) -> QueueACK:
+        '''Declare a queue if it isn't declared yet.
+
+        Args:
+            chann (Channel): The channel to declare the queue on.
+            queue (Queue): The queue to declare.
+            force (bool): Declare the queue even if it is cached.
+                Default to False.
+
+        Returns:
+            QueueACK: The validation of the declaration.
+        '''
+
+        key: Tuple = self._key(queue)
+
+        if force or not key in self._queues:
+            ack: QueueACK = QueueACK(
+                await chann.queue_declare(**queue.__dict__)
+            )
+
+            if not queue.queue or queue.auto_delete:
+                return ack
+
+            self._queues[key] = ack
+
+        return self._queues[key]
+
+    def clear(self) -> None:
+        '''Forget all the declarations.
+        '''
+
+        self._exchanges.clear()
+        self._queues.clear()
+
+    @staticmethod
+    def _key(declaration: Union[Exchange, Queue]) -> Tuple:
+        '''Build the cache key from the declaration arguments.
+
+        Args:
+            declaration (Union[Exchange, Queue]): The exchange or queue.
+
+        Returns:
+            Tuple: The hashable declaration arguments.
+        '''
+
+        return tuple(
+            sorted(
+                (name, repr(value))
+                for name, value in declaration.__dict__.items()
+            )
+        )
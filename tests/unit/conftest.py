@@ -1,4 +1,3 @@
-from typing import Any
 import asyncio
 from asyncio import Task
 from os import environ
@@ -6,12 +5,10 @@ from collections import namedtuple
 
 import pytest
 
-from symbios.utils import Props
 from symbios import Symbios
 from symbios.connector import Connector
-from symbios.message import IncomingMessage, SendingMessage
-from symbios.queue import Queue
-from .mocks import MockSymbios, MockChannel
+from symbios.message import IncomingMessage
+from .mocks import MockChannel, MockConsumingChannel
 
 
 @pytest.fixture
@@ -78,38 +75,27 @@ def mocked_channel(monkeypatch) -> None:
 
 
 @pytest.fixture
-def mocked_symbios(symbios, monkeypatch) -> None:
-    async def mock_symbios_emit(*args, **kwargs):
-        return await MockSymbios(symbios).emit(*args, **kwargs)
+def pooled_channel(symbios) -> MockChannel:
+    chann: MockChannel = MockChannel()
 
-    async def mock_symbios_listen(*args, **kwargs):
-        return await MockSymbios(symbios).listen(*args, **kwargs)
+    for link in symbios.links:
+        link.publish_pool._idle.append(chann)
+        link.consume_pool._idle.append(chann)
 
-    async def mock_symbios_declare_queue(*args, **kwargs):
-        return await MockSymbios(symbios).declare_queue(*args, **kwargs)
+    return chann
 
-    monkeypatch.setattr(symbios, 'emit', mock_symbios_emit)
-    monkeypatch.setattr(symbios, 'listen', mock_symbios_listen)
-    monkeypatch.setattr(symbios, 'declare_queue', mock_symbios_declare_queue)
 
-    return symbios
+@pytest.fixture
+def consuming_channel(symbios, monkeypatch) -> MockConsumingChannel:
+    chann: MockConsumingChannel = MockConsumingChannel()
 
+    async def open_channel() -> MockConsumingChannel:
+        return chann
 
-@pytest.fixture
-def init_rpc_server(mocked_symbios) -> None:
-    async def inner(mocked_symbios) -> None:
-        async def listen_handler(symbios_sck, message):
-            await symbios_sck.emit(
-                SendingMessage('RPC_ACK'),
-                routing_key=message.props.reply_to,
-                props=Props(correlation_id=message.props.correlation_id),
-            )
-
-        await mocked_symbios.listen(
-            listen_handler, queue=Queue('symbios_tests')
-        )
+    for link in symbios.links:
+        monkeypatch.setattr(link, 'open_channel', open_channel)
 
-    return inner
+    return chann
 
 
 @pytest.fixture
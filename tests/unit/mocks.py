@@ -1,104 +1,153 @@
-from typing import Dict, List, Callable, Any
+from typing import Dict, List, Callable, Awaitable, Any, Tuple
 from collections import namedtuple
-import asyncio
 
-import pytest
+from symbios.utils import Props
 
-from symbios import Symbios
-from symbios.utils import Props, ArgumentsType
-from symbios.queue import Queue
-from symbios.exchange import Exchange
-from symbios.message import SendingMessage, IncomingMessage
-from symbios.confirmation import QueueACK, EmitACK, ExchangeACK, ListenACK
 
-
-class MockSymbios:
-    '''The Symbios class modifier.
-
-    Modify the Symbios.emit and Symbios.listen methods
-    for simulating a basic broker communication.
+class MockChannel:
+    '''The aiormq Channel mock class. 
     '''
 
-    def __init__(self, symbios: Symbios):
-        self.symbios: Symbios = symbios
-        setattr(self.symbios, '_queue_state', {})
+    is_closed: bool = False
 
-    async def declare_queue(self, *args) -> Any:
-        await asyncio.sleep(0.5)
-        return 'OK'
-
-    async def emit(
-        self,
-        message: SendingMessage,
-        *,
-        exchange: Exchange = Exchange(),
-        routing_key: str = None,
-        props: Props = Props(),
-        mandatory: bool = False,
-        immediate: bool = False,
-    ) -> None:
-        '''Modify the Symbios.emit method.
+    async def queue_declare(self, **kwargs) -> Any:
+        '''Just return an ack.
         '''
 
-        if not routing_key in self.symbios._queue_state.keys():
-            self.symbios._queue_state[routing_key] = []
+        return 'OK'
 
-        HeaderModel = namedtuple('HeaderModel', 'properties')
-        DeliveredMessageModel = namedtuple(
-            'DeliveredMessageModel', 'delivery, header, body'
-        )
+    async def exchange_declare(self, **kwargs) -> Any:
+        '''Just return an ack.
+        '''
 
-        self.symbios._queue_state[routing_key].append(
-            IncomingMessage(
-                DeliveredMessageModel(None, HeaderModel(props), message.body)
-            )
-        )
+        return 'OK'
 
-        await asyncio.sleep(0.5)
-
-    async def listen(
-        self,
-        task: Callable[[object, IncomingMessage], None],
-        *,
-        queue: Queue = Queue(),
-        no_ack: bool = False,
-        exclusive: bool = False,
-        arguments: ArgumentsType = None,
-        consumer_tag: str = None,
-    ) -> None:
-        '''Modify the Symbios.listen method.
+    async def basic_publish(self, *args, **kwargs) -> Any:
+        '''Record the published message and return an ack.
         '''
 
-        async def process_listener() -> None:
-            while True:
-                try:
-                    message: IncomingMessage = self.symbios._queue_state[
-                        queue.queue
-                    ].pop()
+        if not hasattr(self, 'published'):
+            self.published = []
 
-                    while message:
-                        await task(self, message)
-                        message = self.symbios._queue_state[queue.queue].pop()
-                except (KeyError, IndexError):
-                    pass
+        self.published.append((args, kwargs))
 
-                await asyncio.sleep(0.2)
+        return 'OK'
 
-        self.symbios.event_loop.create_task(process_listener())
 
+class MockConsumingChannel(MockChannel):
+    '''The aiormq Channel mock class for the consumers.
 
-class MockChannel:
-    '''The aiormq Channel mock class. 
+    Records the QoS and the settlements, and delivers the messages
+    to the registered consumer.
     '''
 
+    def __init__(self):
+        self.qos: Dict[str, Any] = {}
+        self.consumer: Callable[[Any], Awaitable] = None
+        self.acked: List[Any] = []
+        self.nacked: List[Any] = []
+        self.rejected: List[Any] = []
+        self.queued: List[Tuple[bytes, Props]] = []
+        self.closed: bool = False
+        self.tag: int = 0
+
     async def queue_declare(self, **kwargs) -> Any:
-        '''Just return an ack.
+        '''Return a declaration ack with the queue name.
         '''
 
+        DeclareOkModel = namedtuple('DeclareOkModel', 'queue')
+
+        return DeclareOkModel(kwargs.get('queue') or 'amq.gen-symbios')
+
+    async def basic_qos(self, **kwargs) -> Any:
+        '''Record the QoS.
+        '''
+
+        self.qos = kwargs
+
         return 'OK'
 
-    async def basic_publish(self, *args, **kwargs) -> Any:
-        '''Just return an ack.
+    async def rpc(self, frame: Any) -> Any:
+        '''Record the QoS set by frame.
         '''
 
+        self.qos = {
+            'prefetch_count': frame.prefetch_count,
+            'prefetch_size': frame.prefetch_size,
+            'global_': frame.global_,
+        }
+
         return 'OK'
+
+    async def basic_consume(self, queue: str, consumer: Callable, **kwargs):
+        '''Register the consumer.
+        '''
+
+        self.consumer = consumer
+
+        return 'OK'
+
+    async def basic_ack(self, delivery_tag: int, multiple: bool = False):
+        '''Record the acknowledgment.
+        '''
+
+        self.acked.append((delivery_tag, multiple))
+
+    async def basic_nack(
+        self, delivery_tag: int, multiple: bool = False, requeue: bool = True
+    ):
+        '''Record the negative acknowledgment.
+        '''
+
+        self.nacked.append((delivery_tag, multiple, requeue))
+
+    async def basic_reject(self, delivery_tag: int, requeue: bool = True):
+        '''Record the rejection.
+        '''
+
+        self.rejected.append((delivery_tag, requeue))
+
+    async def basic_get(self, queue: str, **kwargs) -> Any:
+        '''Fetch a queued message, or None if the queue is empty.
+        '''
+
+        if not self.queued:
+            return None
+
+        return self._delivered(*self.queued.pop(0))
+
+    async def close(self) -> None:
+        '''Record the closing.
+        '''
+
+        self.closed = True
+        self.is_closed = True
+
+    async def deliver(
+        self, body: bytes, props: Props = Props(), redelivered: bool = False
+    ) -> None:
+        '''Deliver a message to the registered consumer.
+        '''
+
+        await self.consumer(self._delivered(body, props, redelivered))
+
+    def _delivered(
+        self, body: bytes, props: Props = Props(), redelivered: bool = False
+    ) -> Any:
+        '''Build a delivered message with the next delivery tag.
+        '''
+
+        self.tag += 1
+        tag: int = self.tag
+
+        DeliverModel = namedtuple(
+            'DeliverModel', 'delivery_tag, redelivered'
+        )
+        HeaderModel = namedtuple('HeaderModel', 'properties')
+        DeliveredMessageModel = namedtuple(
+            'DeliveredMessageModel', 'delivery, header, body, channel'
+        )
+
+        return DeliveredMessageModel(
+            DeliverModel(tag, redelivered), HeaderModel(props), body, self
+        )
@@ -0,0 +1,219 @@
+'''
+@desc    The acknowledgment coalescer test classes.
+@author  arthuchaut <arthuchaut@gmail.com>
+@version 0.1.0
+@date    2026-10-18
+@note    0.1.0 Writing the first drafts.
+'''
+
+import asyncio
+from collections import namedtuple
+from typing import Callable, List
+
+import pytest
+
+from symbios.utils import Props
+from symbios.ack import AckCoalescer
+from symbios.message import IncomingMessage, IncomingMessageError
+from .mocks import MockConsumingChannel
+
+
+DeliverModel = namedtuple('DeliverModel', 'delivery_tag, redelivered')
+
+
+def tracked(acker: AckCoalescer, count: int) -> None:
+    for tag in range(1, count + 1):
+        acker.track(tag)
+
+
+class TestAckCoalescer:
+    '''The AckCoalescer tests class.
+    '''
+
+    def test_out_of_order(self, run_async: Callable) -> None:
+        '''Test that the acks wait for the older deliveries.
+        '''
+
+        async def test() -> None:
+            chann: MockConsumingChannel = MockConsumingChannel()
+            acker: AckCoalescer = AckCoalescer(chann, interval=60)
+            calls: List[int] = []
+
+            async def callback() -> None:
+                calls.append(1)
+
+            tracked(acker, 4)
+
+            for tag in [2, 3]:
+                await acker.ack(tag, callback)
+
+            await acker.flush()
+
+            assert chann.acked == []
+
+            await acker.nack(1)
+            await acker.flush()
+
+            assert chann.nacked == [(1, False, True)]
+            assert chann.acked == [(3, True)]
+            assert calls == [1, 1]
+
+            await acker.ack(4)
+            await acker.flush()
+            await acker.ack(5)
+
+            assert chann.acked == [(3, True), (4, True), (5, False)]
+
+        run_async(test)
+
+    def test_blocked(self, run_async: Callable) -> None:
+        '''Test that the acks blocked by a slow delivery are sent
+        one by one after two flushes.
+        '''
+
+        async def test() -> None:
+            chann: MockConsumingChannel = MockConsumingChannel()
+            acker: AckCoalescer = AckCoalescer(chann, interval=60)
+
+            tracked(acker, 3)
+            await acker.ack(2)
+            await acker.flush()
+
+            assert chann.acked == []
+
+            await acker.ack(3)
+            await acker.flush()
+
+            assert chann.acked == [(2, False)]
+
+            await acker.ack(1)
+            await acker.flush()
+
+            assert chann.acked == [(2, False), (3, True)]
+
+        run_async(test)
+
+    def test_concurrent_flush(
+        self, monkeypatch, run_async: Callable
+    ) -> None:
+        '''Test that two flushes started at once don't send the same
+        tags.
+        '''
+
+        async def test() -> None:
+            chann: MockConsumingChannel = MockConsumingChannel()
+            acker: AckCoalescer = AckCoalescer(chann, interval=60)
+            basic_ack: Callable = chann.basic_ack
+
+            async def slow_ack(delivery_tag: int, multiple: bool = False):
+                await asyncio.sleep(0)
+                await basic_ack(delivery_tag, multiple)
+
+            monkeypatch.setattr(chann, 'basic_ack', slow_ack)
+
+            tracked(acker, 4)
+
+            for tag in [2, 3]:
+                await acker.ack(tag)
+
+            await acker.flush()
+
+            async def nack_and_flush() -> None:
+                await acker.nack(1)
+                await acker.flush()
+
+            await asyncio.gather(acker.flush(), nack_and_flush())
+
+            assert chann.acked == [(2, False), (3, False)]
+            assert list(acker._order) == [4]
+
+        run_async(test)
+
+    def test_triggers(self, run_async: Callable) -> None:
+        '''Test the flush by number and by time.
+        '''
+
+        async def test() -> None:
+            chann: MockConsumingChannel = MockConsumingChannel()
+            acker: AckCoalescer = AckCoalescer(
+                chann, max_pending=2, interval=0.01
+            )
+
+            tracked(acker, 3)
+
+            for tag in [1, 2]:
+                await acker.ack(tag)
+
+            assert chann.acked == [(2, True)]
+
+            await acker.ack(3)
+            await asyncio.sleep(0.05)
+
+            assert chann.acked == [(2, True), (3, True)]
+
+        run_async(test)
+
+    def test_nack_many(self, run_async: Callable) -> None:
+        '''Test the multiple nack of the oldest deliveries only.
+        '''
+
+        async def test() -> None:
+            chann: MockConsumingChannel = MockConsumingChannel()
+            acker: AckCoalescer = AckCoalescer(chann, interval=60)
+
+            tracked(acker, 5)
+            await acker.nack_many([1, 2], requeue=False)
+            await acker.nack_many([4, 5])
+
+            assert chann.nacked == [
+                (2, True, False),
+                (4, False, True),
+                (5, False, True),
+            ]
+
+        run_async(test)
+
+
+class TestMessageSettlement:
+    '''The IncomingMessage settlement tests class.
+    '''
+
+    def test_settle(
+        self, delivered_message_model, run_async: Callable
+    ) -> None:
+        '''Test the settlement methods and their guards.
+        '''
+
+        async def test() -> None:
+            chann: MockConsumingChannel = MockConsumingChannel()
+            acker: AckCoalescer = AckCoalescer(chann, interval=60)
+            tracked(acker, 3)
+
+            messages: List[IncomingMessage] = [
+                IncomingMessage(
+                    delivered_message_model(
+                        DeliverModel(tag, False), Props(), b''
+                    ),
+                    acker,
+                )
+                for tag in range(1, 4)
+            ]
+
+            await messages[0].ack()
+            await messages[1].nack(requeue=False)
+            await messages[2].reject()
+            await acker.flush()
+
+            assert chann.acked == [(1, True)]
+            assert chann.nacked == [(2, False, False)]
+            assert chann.rejected == [(3, False)]
+
+            with pytest.raises(IncomingMessageError):
+                await messages[0].ack()
+
+            with pytest.raises(IncomingMessageError):
+                await IncomingMessage(
+                    delivered_message_model(None, Props(), b'')
+                ).ack()
+
+        run_async(test)
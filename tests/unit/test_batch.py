@@ -0,0 +1,258 @@
+'''
+@desc    The micro-batching test classes.
+@author  arthuchaut <arthuchaut@gmail.com>
+@version 0.1.0
+@date    2026-10-18
+@note    0.1.0 Writing the first drafts.
+'''
+
+import asyncio
+from typing import Callable, List, Tuple
+
+import pytest
+
+from symbios import Symbios
+from symbios.utils import Props
+from symbios.message import IncomingMessage, SendingMessage
+from symbios.producer import Producer, ProducerError
+from symbios.consumer import Consumer
+from symbios.confirmation import EmitACK
+from symbios.batch import (
+    BatchEnvelope,
+    Batching,
+    Batcher,
+    BatchEnvelopeError,
+)
+
+
+class TestBatchEnvelope:
+    '''The BatchEnvelope tests class.
+    '''
+
+    RECORDS: List[Tuple[str, str, bytes]] = [
+        ('text/plain', '', b'lapin'),
+        ('application/json', 'gzip', b'{}'),
+        ('', '', b''),
+    ]
+
+    def test_pack_unpack(self) -> None:
+        '''Test the envelope body round trip.
+        '''
+
+        body: bytes = BatchEnvelope.pack(TestBatchEnvelope.RECORDS)
+
+        assert BatchEnvelope.unpack(body) == TestBatchEnvelope.RECORDS
+
+        with pytest.raises(BatchEnvelopeError):
+            BatchEnvelope.unpack(body[:-4])
+
+    def test_open(self, delivered_message_model) -> None:
+        '''Test the split of an incoming envelope.
+        '''
+
+        message: IncomingMessage = IncomingMessage(
+            delivered_message_model(
+                'TAG',
+                Props(
+                    content_type=BatchEnvelope.CONTENT_TYPE,
+                    headers={BatchEnvelope.HEADER: 3},
+                ),
+                BatchEnvelope.pack(TestBatchEnvelope.RECORDS),
+            )
+        )
+
+        assert BatchEnvelope.is_envelope(message)
+
+        messages: List[IncomingMessage] = BatchEnvelope.open(message)
+
+        assert [m.body for m in messages] == [b'lapin', b'{}', b'']
+        assert messages[1].props.content_type == 'application/json'
+        assert messages[1].props.content_encoding == 'gzip'
+        assert all(m.delivery == 'TAG' for m in messages)
+        assert message.props.content_type == BatchEnvelope.CONTENT_TYPE
+
+
+class TestBatcher:
+    '''The Batcher tests class.
+    '''
+
+    def test_flush_by_size(self, run_async: Callable) -> None:
+        '''Test that an envelope is emitted once it is full.
+        '''
+
+        envelopes: List[Tuple[bytes, int]] = []
+
+        async def publish(body: bytes, count: int) -> asyncio.Future:
+            envelopes.append((body, count))
+            future = asyncio.get_event_loop().create_future()
+            future.set_result(EmitACK('OK'))
+            return future
+
+        async def test() -> None:
+            batcher: Batcher = Batcher(
+                Batching(max_messages=2, linger=10), publish
+            )
+
+            first = await batcher.add(Props(content_type='text/plain'), b'a')
+
+            assert not envelopes
+
+            second = await batcher.add(Props(content_type='text/plain'), b'b')
+
+            assert (await first).confirmation == 'OK'
+            assert (await second).confirmation == 'OK'
+            assert len(envelopes) == 1 and envelopes[0][1] == 2
+
+        run_async(test)
+
+    def test_flush_by_linger(self, run_async: Callable) -> None:
+        '''Test that an envelope is emitted after the lingering time.
+        '''
+
+        envelopes: List[Tuple[bytes, int]] = []
+
+        async def publish(body: bytes, count: int) -> asyncio.Future:
+            envelopes.append((body, count))
+            future = asyncio.get_event_loop().create_future()
+            future.set_result(EmitACK('OK'))
+            return future
+
+        async def test() -> None:
+            batcher: Batcher = Batcher(Batching(linger=0.05), publish)
+
+            future = await batcher.add(Props(), b'a')
+            await asyncio.wait_for(future, 1)
+
+            assert envelopes[0][1] == 1
+
+        run_async(test)
+
+
+class TestBatchedProducer:
+    '''The batched Producer/Consumer round trip tests class.
+    '''
+
+    def test_round_trip(
+        self,
+        symbios: Symbios,
+        pooled_channel,
+        delivered_message_model,
+        run_async: Callable,
+    ) -> None:
+        '''Test that a Consumer unpacks the Producer envelopes.
+        '''
+
+        received: List[IncomingMessage] = []
+
+        async def task(symbios: Symbios, message: IncomingMessage) -> None:
+            received.append(message)
+
+        async def test() -> None:
+            producer: Producer = symbios.producer(
+                routing_key='symbios_tests', batching=Batching(linger=10)
+            )
+
+            futures = [
+                await producer.publish_deferred(body)
+                for body in ['lapin', {'lapin': 42}]
+            ]
+            await producer.flush()
+            await asyncio.gather(*futures)
+
+            (args, kwargs), = pooled_channel.published
+
+            consumer: Consumer = Consumer(
+                symbios=symbios,
+                no_ack=True,
+                midd_library=symbios._midd_library,
+            )
+            consumer.task = task
+
+            await consumer._embed(
+                delivered_message_model(None, kwargs['properties'], args[0])
+            )
+
+            assert [m.deserialized for m in received] == [
+                'lapin',
+                {'lapin': 42},
+            ]
+
+            with pytest.raises(ProducerError):
+                await producer.publish_deferred('lapin', headers={'a': 1})
+
+        run_async(test)
+
+    def test_direct(
+        self, symbios: Symbios, pooled_channel, monkeypatch, run_async
+    ) -> None:
+        '''Test that the awaited publications bypass the batching, and
+        that the batched ones don't lease a channel.
+        '''
+
+        async def test() -> None:
+            producer: Producer = symbios.producer(
+                routing_key='symbios_tests', batching=Batching(linger=10)
+            )
+
+            ack: EmitACK = await asyncio.wait_for(producer.publish('lapin'), 1)
+
+            assert isinstance(ack, EmitACK)
+            assert pooled_channel.published[-1][0] == (b'lapin',)
+
+            leases: List[int] = []
+
+            for link in symbios.links:
+                monkeypatch.setattr(
+                    link.publish_pool, 'lease', lambda: leases.append(1)
+                )
+
+            producer._batcher.policy.linger = 0.01
+            acks = await producer.emit_many(
+                [SendingMessage('lapin'), SendingMessage({'lapin': 42})]
+            )
+
+            assert [type(ack) for ack in acks] == [EmitACK, EmitACK]
+            assert leases == []
+            assert (
+                pooled_channel.published[-1][1]['properties'].content_type
+                == BatchEnvelope.CONTENT_TYPE
+            )
+
+            await producer.close()
+
+        run_async(test)
+
+    def test_malformed(
+        self,
+        symbios: Symbios,
+        consuming_channel,
+        run_async: Callable,
+    ) -> None:
+        '''Test that a Consumer rejects a malformed envelope.
+        '''
+
+        async def task(symbios: Symbios, message: IncomingMessage) -> None:
+            ...
+
+        async def test() -> None:
+            consumer: Consumer = Consumer(
+                symbios=symbios,
+                prefetch_count=10,
+                midd_library=symbios._midd_library,
+            )
+            await consumer.listen(task)
+            body: bytes = BatchEnvelope.pack(TestBatchEnvelope.RECORDS)
+
+            with pytest.raises(BatchEnvelopeError):
+                await consuming_channel.deliver(
+                    body[:-4], Props(headers={BatchEnvelope.HEADER: 3})
+                )
+
+            await consuming_channel.deliver(b'lapin')
+            await asyncio.sleep(0.05)
+
+            assert consuming_channel.rejected == [(1, False)]
+            assert consuming_channel.nacked == []
+            assert consuming_channel.acked[-1][0] == 2
+
+        run_async(test)
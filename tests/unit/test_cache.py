@@ -0,0 +1,104 @@
+'''
+@desc    The RPCCache test class.
+@author  arthuchaut <arthuchaut@gmail.com>
+@version 0.1.0
+@date    2026-10-18
+@note    0.1.0 Writing the first drafts.
+'''
+
+import pytest
+
+import symbios.cache
+from symbios.cache import RPCCache, RPCCacheError
+from symbios.rpc import RPCRemoteError
+
+
+class TestRPCCache:
+    '''The RPCCache tests class.
+    '''
+
+    def test_get(self, monkeypatch) -> None:
+        '''Test the RPCCache.get and RPCCache.put methods.
+        '''
+
+        now = [100.0]
+        monkeypatch.setattr(symbios.cache, 'monotonic', lambda: now[0])
+        cache: RPCCache = RPCCache(ttl=10, routes={'slow': 60, 'live': 0})
+        key = cache.key('users', b'{"id": 1}')
+
+        assert cache.key('users', b'{"id": 1}') == key
+        assert cache.key('users', b'{"id": 2}') != key
+        assert cache.key('users', b'{"id": 1}', 'application/json') != key
+        assert cache.key('live', b'{"id": 1}') is None
+        assert cache.get(key) is None
+
+        cache.put(key, 'REPLY')
+        cache.put(cache.key('slow', b''), 'SLOW')
+        now[0] += 5
+
+        assert cache.get(key) == 'REPLY'
+
+        now[0] += 10
+
+        assert cache.get(key) is None
+        assert cache.get(cache.key('slow', b'')) == 'SLOW'
+        assert len(cache) == 1
+        assert (
+            cache.stats.hits,
+            cache.stats.misses,
+            cache.stats.expirations,
+        ) == (2, 2, 1)
+        assert cache.stats.ratio == 0.5
+
+    def test_eviction(self) -> None:
+        '''Test the least recently used eviction.
+        '''
+
+        cache: RPCCache = RPCCache(max_size=2)
+        keys = [cache.key('users', bytes([i])) for i in range(3)]
+
+        cache.put(keys[0], 0)
+        cache.put(keys[1], 1)
+        cache.get(keys[0])
+        cache.put(keys[2], 2)
+
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[0]) == 0
+        assert cache.get(keys[2]) == 2
+        assert cache.stats.evictions == 1
+
+        with pytest.raises(RPCCacheError):
+            RPCCache(max_size=0)
+
+    def test_negative(self) -> None:
+        '''Test the caching of the errors.
+        '''
+
+        cache: RPCCache = RPCCache()
+        key = cache.key('users', b'')
+
+        cache.put(key, RPCRemoteError('KeyError: 1'))
+
+        assert cache.get(key) is None
+
+        cache = RPCCache(negative_ttl=5)
+        cache.put(key, RPCRemoteError('KeyError: 1'))
+
+        assert isinstance(cache.get(key), RPCRemoteError)
+        assert cache.stats.negative_hits == 1
+
+    def test_invalidate(self) -> None:
+        '''Test the RPCCache.invalidate method.
+        '''
+
+        cache: RPCCache = RPCCache()
+        cache.put(cache.key('users', b''), 'USER')
+        cache.put(cache.key('orders', b''), 'ORDER')
+        cache.invalidate('users')
+
+        assert cache.get(cache.key('users', b'')) is None
+        assert cache.get(cache.key('orders', b'')) == 'ORDER'
+
+        cache.invalidate()
+
+        assert len(cache) == 0
@@ -0,0 +1,179 @@
+'''
+@desc    The claim-check middlewares test classes.
+@author  arthuchaut <arthuchaut@gmail.com>
+@version 0.1.0
+@date    2026-10-18
+@note    0.1.0 Writing the first drafts.
+'''
+
+import os
+import time
+from typing import Callable
+
+import pytest
+
+from symbios import Symbios
+from symbios.utils import Props
+from symbios.middleware import Event
+from symbios.message import SendingMessage, IncomingMessage
+from middlewares.serializer_middleware import SerializerMiddleware
+from middlewares.deserializer_middleware import DeserializerMiddleware
+from middlewares.compressor_middleware import CompressorMiddleware
+from middlewares.decompressor_middleware import DecompressorMiddleware
+from middlewares.claim_check_middleware import (
+    ClaimCheckMiddleware,
+    ClaimCheckMiddlewareError,
+    FileBlobStore,
+)
+from middlewares.claim_fetch_middleware import (
+    ClaimFetchMiddleware,
+    ClaimFetchMiddlewareError,
+)
+
+
+@pytest.fixture
+def store(tmp_path) -> FileBlobStore:
+    return FileBlobStore(str(tmp_path))
+
+
+class TestClaimCheck:
+    '''The claim-check middlewares tests class.
+    '''
+
+    def test_round_trip(
+        self,
+        symbios: Symbios,
+        store: FileBlobStore,
+        delivered_message_model,
+        run_async: Callable,
+    ) -> None:
+        '''Test the check-in and the redeeming of a compressed body.
+        '''
+
+        async def test() -> None:
+            body = {'lapin': ['carotte'] * 1000}
+            message: SendingMessage = SendingMessage(body)
+            message.props = Props(content_type='application/json')
+
+            for midd in [
+                SerializerMiddleware(Event.ON_EMIT),
+                CompressorMiddleware(Event.ON_EMIT),
+                ClaimCheckMiddleware(
+                    Event.ON_EMIT, store=store, threshold=16
+                ),
+            ]:
+                await midd.execute(symbios, message)
+
+            assert message.props.content_type == (
+                ClaimCheckMiddleware.CONTENT_TYPE
+            )
+            assert len(os.listdir(store.directory)) == 1
+
+            incoming: IncomingMessage = IncomingMessage(
+                delivered_message_model(
+                    None, message.props, message.serialized
+                )
+            )
+
+            for midd in [
+                ClaimFetchMiddleware(Event.ON_LISTEN, store=store),
+                DecompressorMiddleware(Event.ON_LISTEN),
+                DeserializerMiddleware(Event.ON_LISTEN),
+            ]:
+                await midd.execute(symbios, incoming)
+
+            assert incoming.deserialized == body
+            assert incoming.props.content_type == 'application/json'
+            assert len(os.listdir(store.directory)) == 1
+
+            await incoming.finalize()
+
+            assert not os.listdir(store.directory)
+
+        run_async(test)
+
+    def test_threshold(
+        self, symbios: Symbios, store: FileBlobStore, run_async: Callable
+    ) -> None:
+        '''Test that the small bodies are emitted as they are.
+        '''
+
+        async def test() -> None:
+            message: SendingMessage = SendingMessage('lapin')
+            message.props = Props(content_type='text/plain')
+            message.serialized = b'lapin'
+
+            await ClaimCheckMiddleware(Event.ON_EMIT, store=store).execute(
+                symbios, message
+            )
+
+            assert message.serialized == b'lapin'
+            assert message.props.content_type == 'text/plain'
+            assert not os.listdir(store.directory)
+
+            with pytest.raises(ClaimCheckMiddlewareError):
+                ClaimCheckMiddleware(Event.ON_EMIT, store=store, threshold=0)
+
+        run_async(test)
+
+    def test_missing_blob(
+        self,
+        symbios: Symbios,
+        store: FileBlobStore,
+        delivered_message_model,
+        run_async: Callable,
+    ) -> None:
+        '''Test the redeeming of a collected or forged reference.
+        '''
+
+        async def test() -> None:
+            props: Props = Props(
+                content_type=ClaimCheckMiddleware.CONTENT_TYPE
+            )
+
+            for body in [b'{"key": "deadbeef"}', b'{"key": "../etc"}', b'{']:
+                incoming: IncomingMessage = IncomingMessage(
+                    delivered_message_model(None, props, body)
+                )
+
+                with pytest.raises(ClaimFetchMiddlewareError):
+                    await ClaimFetchMiddleware(
+                        Event.ON_LISTEN, store=store
+                    ).execute(symbios, incoming)
+
+        run_async(test)
+
+
+class TestFileBlobStore:
+    '''The FileBlobStore tests class.
+    '''
+
+    def test_store(self, store: FileBlobStore, run_async: Callable) -> None:
+        '''Test the storage, the zero-copy retrieval and the sweeping.
+        '''
+
+        async def test() -> None:
+            key: str = await store.put(memoryview(b'lapin'))
+            blob: memoryview = await store.get(key)
+
+            assert blob == b'lapin'
+            assert blob.readonly
+
+            await store.delete(key)
+            await store.delete(key)
+
+            assert blob == b'lapin'
+
+            with pytest.raises(KeyError):
+                await store.get(key)
+
+            assert await store.get(await store.put(b'')) == b''
+
+            key = await store.put(b'carotte')
+            past: float = time.time() - 60
+            os.utime(os.path.join(store.directory, key), (past, past))
+
+            assert store.sweep(30) == 1
+            assert len(os.listdir(store.directory)) == 1
+
+        run_async(test)
@@ -0,0 +1,134 @@
+'''
+@desc    The codec registry test classes.
+@author  arthuchaut <arthuchaut@gmail.com>
+@version 0.1.0
+@date    2026-10-18
+@note    0.1.0 Writing the first drafts.
+'''
+
+from typing import Any, Tuple
+from collections import OrderedDict
+from array import array
+
+import pytest
+
+from symbios.codec import (
+    CodecABC,
+    CodecRegistry,
+    CodecError,
+    JsonCodec,
+)
+
+
+class UpperCodec(CodecABC):
+    '''A custom codec for the tests.
+    '''
+
+    content_type: str = 'text/x-upper'
+    types: Tuple[type, ...] = (str,)
+
+    def encode(self, body: Any) -> bytes:
+        return body.upper().encode()
+
+    def decode(self, body: bytes) -> Any:
+        return body.decode().lower()
+
+
+class TestCodecRegistry:
+    '''The CodecRegistry tests class.
+    '''
+
+    @pytest.mark.parametrize(
+        'body, content_type',
+        [
+            ('', 'text/plain'),
+            (True, 'text/plain'),
+            (42, 'text/plain'),
+            (3.14, 'text/plain'),
+            ({}, 'application/json'),
+            ([], 'application/json'),
+            (OrderedDict(), 'application/json'),
+            (b'', 'application/octet-stream'),
+            (bytearray(), 'application/octet-stream'),
+            (memoryview(b''), 'application/octet-stream'),
+            (object(), ''),
+        ],
+    )
+    def test_content_type_of(self, body: Any, content_type: str) -> None:
+        '''Test the content-type determination via the body type.
+        '''
+
+        assert CodecRegistry().content_type_of(body) == content_type
+
+    def test_encode_decode(self) -> None:
+        '''Test the round trip of the standard codecs.
+        '''
+
+        codecs: CodecRegistry = CodecRegistry()
+
+        assert codecs.encode({'lapin': 42}) in [
+            b'{"lapin": 42}',
+            b'{"lapin":42}',
+        ]
+        assert codecs.decode(b'{"lapin": 42}', 'application/json') == {
+            'lapin': 42
+        }
+        assert codecs.encode(42, 'text/plain') == b'42'
+        assert codecs.decode(b'lapin', 'application/x-unknown') == 'lapin'
+        assert codecs.decode(memoryview(b'lapin'), 'text/plain') == 'lapin'
+
+        with pytest.raises(CodecError):
+            codecs.encode(object())
+
+    def test_encode_content_type(self) -> None:
+        '''Test the serialization of a body whose type doesn't fit
+        its content-type.
+        '''
+
+        codecs: CodecRegistry = CodecRegistry()
+
+        assert codecs.encode({'a': 1}, 'text/plain') in [
+            b'{"a": 1}',
+            b'{"a":1}',
+        ]
+        assert codecs.encode('{"a": 1}', 'application/json') == b'{"a": 1}'
+        assert codecs.encode('lapin', 'application/octet-stream') == (
+            b'lapin'
+        )
+        assert codecs.encode({1: 'lapin'}) == b'{"1": "lapin"}'
+
+        with pytest.raises(CodecError):
+            codecs.encode({'lapin': object()})
+
+    def test_raw_buffers(self) -> None:
+        '''Test that the raw buffers pass through without being copied.
+        '''
+
+        codecs: CodecRegistry = CodecRegistry()
+        body: bytearray = bytearray(b'lapin')
+        view: memoryview = memoryview(body)
+        words: memoryview = memoryview(array('i', [1, 2]))
+
+        assert codecs.encode(body) is body
+        assert codecs.encode(view) is view
+        assert codecs.encode(words).nbytes == len(codecs.encode(words))
+        assert codecs.encode(words).obj is words.obj
+        assert codecs.decode(b'lapin', 'application/octet-stream') == (
+            b'lapin'
+        )
+
+    def test_register(self) -> None:
+        '''Test the registration of a custom codec.
+        '''
+
+        codecs: CodecRegistry = CodecRegistry()
+        codecs.register(UpperCodec())
+
+        assert codecs.content_type_of('lapin') == 'text/x-upper'
+        assert codecs.encode('lapin') == b'LAPIN'
+        assert codecs.encode('lapin', 'text/plain') == b'lapin'
+        assert codecs.decode(b'LAPIN', 'text/x-upper') == 'lapin'
+        assert isinstance(codecs.get('application/json'), JsonCodec)
+
+        with pytest.raises(CodecError):
+            codecs.register(object())
@@ -0,0 +1,128 @@
+'''
+@desc    The compression middlewares test classes.
+@author  arthuchaut <arthuchaut@gmail.com>
+@version 0.1.0
+@date    2026-10-18
+@note    0.1.0 Writing the first drafts.
+'''
+
+from typing import Callable
+
+import pytest
+
+from symbios import Symbios
+from symbios.utils import Props
+from symbios.middleware import Event
+from symbios.message import SendingMessage, IncomingMessage
+from middlewares.serializer_middleware import SerializerMiddleware
+from middlewares.deserializer_middleware import DeserializerMiddleware
+from middlewares.compressor_middleware import (
+    CompressorMiddleware,
+    CompressorMiddlewareError,
+    CODECS,
+)
+from middlewares.decompressor_middleware import (
+    DecompressorMiddleware,
+    DecompressorMiddlewareError,
+)
+
+
+class TestCompression:
+    '''The compression middlewares tests class.
+    '''
+
+    @pytest.mark.parametrize('codec', list(CODECS.keys()))
+    def test_round_trip(
+        self,
+        symbios: Symbios,
+        delivered_message_model,
+        run_async: Callable,
+        codec: str,
+    ) -> None:
+        '''Test the compression and the decompression of a body.
+        '''
+
+        async def test() -> None:
+            body = {'lapin': ['carotte'] * 1000}
+            message: SendingMessage = SendingMessage(body)
+            message.props = Props(content_type='application/json')
+
+            await SerializerMiddleware(Event.ON_EMIT).execute(symbios, message)
+            size: int = len(message.serialized)
+            await CompressorMiddleware(Event.ON_EMIT, codec=codec).execute(
+                symbios, message
+            )
+
+            assert message.props.content_encoding == codec
+            assert len(message.serialized) < size
+
+            incoming: IncomingMessage = IncomingMessage(
+                delivered_message_model(
+                    None, message.props, message.serialized
+                )
+            )
+
+            await DecompressorMiddleware(Event.ON_LISTEN).execute(
+                symbios, incoming
+            )
+            await DeserializerMiddleware(Event.ON_LISTEN).execute(
+                symbios, incoming
+            )
+
+            assert incoming.deserialized == body
+            assert not incoming.props.content_encoding
+
+        run_async(test)
+
+    def test_threshold(self, symbios: Symbios, run_async: Callable) -> None:
+        '''Test that the small bodies aren't compressed.
+        '''
+
+        async def test() -> None:
+            message: SendingMessage = SendingMessage('lapin')
+            message.props = Props()
+            message.serialized = b'lapin'
+
+            await CompressorMiddleware(Event.ON_EMIT).execute(
+                symbios, message
+            )
+
+            assert message.serialized == b'lapin'
+            assert not message.props.content_encoding
+
+            with pytest.raises(CompressorMiddlewareError):
+                CompressorMiddleware(Event.ON_EMIT, codec='lapin')
+
+        run_async(test)
+
+    def test_invalid_body(
+        self, symbios: Symbios, delivered_message_model, run_async: Callable
+    ) -> None:
+        '''Test the decompression of a corrupted body.
+        '''
+
+        async def test() -> None:
+            incoming: IncomingMessage = IncomingMessage(
+                delivered_message_model(
+                    None, Props(content_encoding='deflate'), b'lapin'
+                )
+            )
+
+            with pytest.raises(DecompressorMiddlewareError):
+                await DecompressorMiddleware(Event.ON_LISTEN).execute(
+                    symbios, incoming
+                )
+
+        run_async(test)
+
+    def test_use_index(self, symbios: Symbios) -> None:
+        '''Test the registration of the decompressor before
+        the deserializer.
+        '''
+
+        symbios.use(DecompressorMiddleware(Event.ON_LISTEN), index=0)
+
+        assert isinstance(
+            symbios._midd_library._library[Event.ON_LISTEN][0],
+            DecompressorMiddleware,
+        )
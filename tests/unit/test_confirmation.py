@@ -0,0 +1,76 @@
+'''
+@desc    The confirmation test classes.
+@author  arthuchaut <arthuchaut@gmail.com>
+@version 0.1.0
+@date    2026-10-18
+@note    0.1.0 Writing the first drafts.
+'''
+
+import asyncio
+from asyncio import Future
+from typing import Callable, List
+
+import pytest
+
+from symbios.confirmation import ConfirmWindow, EmitACK
+
+
+class TestConfirmWindow:
+    '''The ConfirmWindow tests class.
+    '''
+
+    def test_push(self, run_async: Callable) -> None:
+        '''Test the resolution of the confirmation futures.
+        '''
+
+        async def confirm(frame: str) -> str:
+            return frame
+
+        async def nack() -> None:
+            raise ValueError('NACK')
+
+        async def test() -> None:
+            window: ConfirmWindow = ConfirmWindow(2)
+
+            produce_ok: Future = await window.push(confirm('ACK'))
+            ack: EmitACK = await produce_ok
+
+            assert ack.confirmation == 'ACK'
+
+            with pytest.raises(ValueError):
+                await (await window.push(nack()))
+
+            assert window.in_flight == 0
+
+        run_async(test)
+
+    def test_backpressure(self, run_async: Callable) -> None:
+        '''Test that a push waits while the window is full.
+        '''
+
+        async def test() -> None:
+            window: ConfirmWindow = ConfirmWindow(2)
+            confirmations: List[Future] = [
+                asyncio.get_event_loop().create_future() for _ in range(3)
+            ]
+
+            produce_oks: List[Future] = [
+                await window.push(confirmations[0]),
+                await window.push(confirmations[1]),
+            ]
+
+            assert window.in_flight == 2
+
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(window.push(confirmations[2]), 0.1)
+
+            confirmations[0].set_result('ACK')
+            await produce_oks[0]
+
+            produce_oks.append(
+                await asyncio.wait_for(window.push(confirmations[2]), 0.1)
+            )
+
+            assert window.in_flight == 2
+
+        run_async(test)
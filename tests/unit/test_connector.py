@@ -1,11 +1,19 @@
-from typing import Callable
+from typing import Callable, List
+import asyncio
 from asyncio import AbstractEventLoop
 
+import aiormq
 import pytest
 
 from symbios import Symbios
 from symbios.utils import Connection, Channel
-from symbios.connector import Connector, ConnectorError
+from symbios.connector import (
+    Connector,
+    ConnectorError,
+    ChannelPool,
+    ChannelPoolError,
+)
+from .mocks import MockChannel
 
 
 class TestConnector:
@@ -65,3 +73,146 @@ class TestConnector:
 
         assert connector._url == expected_url
 
+    def test_publish_link(self) -> None:
+        '''Test the spreading of the emitters over the connections.
+        '''
+
+        connector: Connector = Connector(connections=3)
+
+        indexes: List[int] = [
+            connector.publish_link('rk').stats.index for _ in range(4)
+        ]
+
+        assert indexes == [0, 1, 2, 0]
+
+        connector = Connector(connections=3, sharding=Connector.ROUTING_KEY)
+
+        assert connector.publish_link('rk') is connector.publish_link('rk')
+
+    def test_consume_link(self) -> None:
+        '''Test the pinning of the listeners on the connections.
+        '''
+
+        connector: Connector = Connector(connections=2)
+
+        assert connector.consume_link(1) is connector.links[1]
+        assert connector.consume_link().stats.index == 0
+        assert connector.consume_link().stats.index == 1
+
+        for connection in [2, -1]:
+            with pytest.raises(ConnectorError):
+                connector.consume_link(connection)
+
+    def test_concurrent_connection(
+        self, monkeypatch, run_async: Callable
+    ) -> None:
+        '''Test that the concurrent first leases share the connection.
+        '''
+
+        async def test() -> None:
+            connections: List[MockChannel] = []
+
+            async def connect(url: str, **kwargs) -> MockChannel:
+                await asyncio.sleep(0.01)
+                connections.append(MockChannel())
+
+                return connections[-1]
+
+            monkeypatch.setattr(aiormq, 'connect', connect)
+            link = Connector().links[0]
+
+            first, second = await asyncio.gather(
+                link.connection, link.connection
+            )
+
+            assert first is second
+            assert len(connections) == 1
+
+        run_async(test)
+
+    def test_stats(self) -> None:
+        '''Test the per-connection counters.
+        '''
+
+        connector: Connector = Connector(connections=4)
+
+        assert [stats.index for stats in connector.stats] == [0, 1, 2, 3]
+
+        with pytest.raises(ConnectorError):
+            Connector(connections=0)
+
+        with pytest.raises(ConnectorError):
+            Connector(sharding='lapin')
+
+
+class TestChannelPool:
+    '''The ChannelPool unit tests.
+    '''
+
+    def test_acquire_release(self, run_async: Callable) -> None:
+        '''Test the channel reuse between two leases.
+        '''
+
+        async def opener() -> MockChannel:
+            return MockChannel()
+
+        async def test() -> None:
+            pool: ChannelPool = ChannelPool(opener, 2)
+
+            chann: MockChannel = await pool.acquire()
+            pool.release(chann)
+
+            assert await pool.acquire() is chann
+
+        run_async(test)
+
+    def test_closed_channel(self, run_async: Callable) -> None:
+        '''Test that the closed channels are discarded.
+        '''
+
+        async def opener() -> MockChannel:
+            return MockChannel()
+
+        async def test() -> None:
+            pool: ChannelPool = ChannelPool(opener, 2)
+
+            async with pool.lease() as chann:
+                pass
+
+            chann.is_closed = True
+
+            async with pool.lease() as other_chann:
+                assert other_chann is not chann
+
+            discarded: List[MockChannel] = []
+            pool = ChannelPool(opener, 2, on_discard=discarded.append)
+
+            async with pool.lease() as chann:
+                chann.is_closed = True
+
+            assert discarded == [chann]
+
+        run_async(test)
+
+    def test_bounded(self, run_async: Callable) -> None:
+        '''Test that a lease waits while the pool is exhausted.
+        '''
+
+        async def opener() -> MockChannel:
+            return MockChannel()
+
+        async def test() -> None:
+            pool: ChannelPool = ChannelPool(opener, 1)
+            chann: MockChannel = await pool.acquire()
+
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(pool.acquire(), 0.1)
+
+            pool.release(chann)
+
+            assert await asyncio.wait_for(pool.acquire(), 0.1) is chann
+
+            with pytest.raises(ChannelPoolError):
+                ChannelPool(opener, 0)
+
+        run_async(test)
@@ -1,12 +1,21 @@
-from typing import Callable, List, Tuple
+import asyncio
+import threading
+from typing import Any, Callable, List, Tuple
 
 import pytest
 
 from symbios import Symbios
 from symbios.utils import Props, ArgumentsType
 from symbios.queue import Queue
-from symbios.consumer import Consumer
+from symbios.consumer import Consumer, ConsumerError, Execution
+from symbios.message import IncomingMessage
 from symbios.confirmation import ListenACK
+from .mocks import MockConsumingChannel
+
+
+def process_task(body: Any, props: Props) -> None:
+    if body['lapin'] != 'carotte':
+        raise ValueError(body)
 
 
 class TestConsumer:
@@ -51,3 +60,397 @@ class TestConsumer:
             assert isinstance(ack, ListenACK)
 
         run_async(test)
+
+    def test_concurrency(
+        self,
+        symbios: Symbios,
+        consuming_channel: MockConsumingChannel,
+        run_async: Callable,
+    ) -> None:
+        '''Test the QoS and the bound of the running tasks.
+        '''
+
+        async def test() -> None:
+            running: List[int] = [0, 0]
+
+            async def task(symbios: Symbios, message: IncomingMessage):
+                running[0] += 1
+                running[1] = max(running)
+                await asyncio.sleep(0.01)
+                running[0] -= 1
+
+            await symbios.listen(
+                task, queue=Queue('symbios_tests'), concurrency=2
+            )
+
+            assert consuming_channel.qos == {
+                'prefetch_count': 4,
+                'prefetch_size': 0,
+            }
+
+            await asyncio.gather(
+                *[consuming_channel.deliver(b'lapin') for _ in range(6)]
+            )
+
+            await asyncio.sleep(0.05)
+
+            assert running[1] == 2
+            assert consuming_channel.acked[-1] == (6, True)
+
+            with pytest.raises(ConsumerError):
+                await symbios.listen(task, concurrency=0)
+
+        run_async(test)
+
+    def test_execution(
+        self,
+        symbios: Symbios,
+        consuming_channel: MockConsumingChannel,
+        run_async: Callable,
+    ) -> None:
+        '''Test the tasks called in the thread and process pools.
+        '''
+
+        async def test() -> None:
+            calls: List[Tuple[Any, str, str]] = []
+            props: Props = Props(content_type='application/json')
+
+            for link in symbios.links:
+                link.acker(consuming_channel).interval = 60
+
+            def thread_task(body: Any, props: Props) -> None:
+                calls.append(
+                    (body, props.content_type, threading.current_thread().name)
+                )
+
+            await symbios.listen(
+                thread_task,
+                queue=Queue('symbios_tests'),
+                execution=Execution.THREAD,
+                workers=2,
+            )
+
+            assert consuming_channel.qos['prefetch_count'] == 4
+
+            await consuming_channel.deliver(b'{"lapin": "carotte"}', props)
+
+            assert calls[0][:2] == ({'lapin': 'carotte'}, 'application/json')
+            assert calls[0][2].startswith('symbios')
+
+            await symbios.listen(
+                process_task,
+                queue=Queue('symbios_tests'),
+                execution=Execution.PROCESS,
+                workers=1,
+            )
+            await consuming_channel.deliver(b'{"lapin": "carotte"}', props)
+
+            with pytest.raises(ValueError):
+                await consuming_channel.deliver(b'{"lapin": "chou"}', props)
+
+            await asyncio.sleep(0.05)
+
+            assert consuming_channel.nacked == [(3, False, True)]
+
+            with pytest.raises(ConsumerError):
+                await symbios.listen(
+                    lambda body, props: None, execution=Execution.PROCESS
+                )
+
+            with pytest.raises(ConsumerError):
+                await symbios.listen(
+                    thread_task, execution=Execution.THREAD, workers=0
+                )
+
+            assert len(symbios.executors) == 2
+
+            await symbios.close()
+
+            assert consuming_channel.acked == [(2, True)]
+            assert not symbios.executors
+
+        run_async(test)
+
+    def test_partition(
+        self,
+        symbios: Symbios,
+        consuming_channel: MockConsumingChannel,
+        run_async: Callable,
+    ) -> None:
+        '''Test the ordering of the messages of a same key.
+        '''
+
+        async def test() -> None:
+            processed: List[bytes] = []
+            running: List[int] = [0, 0]
+
+            async def task(symbios: Symbios, message: IncomingMessage):
+                running[0] += 1
+                running[1] = max(running)
+                await asyncio.sleep(0.03 if message.body[-1:] == b'0' else 0)
+                processed.append(message.body)
+                running[0] -= 1
+
+            await symbios.listen(
+                task,
+                queue=Queue('symbios_tests'),
+                partition=lambda message: message.props.headers['key'],
+                lanes=4,
+                lane_depth=2,
+            )
+
+            assert consuming_channel.qos['prefetch_count'] == 8
+
+            await asyncio.gather(
+                *[
+                    consuming_channel.deliver(
+                        key + str(i).encode(),
+                        Props(headers={'key': lane}),
+                    )
+                    for i in range(3)
+                    for lane, key in enumerate([b'a', b'b'])
+                ]
+            )
+
+            with pytest.raises(KeyError):
+                await consuming_channel.deliver(b'c', Props(headers={}))
+
+            await asyncio.sleep(0.05)
+
+            assert [b for b in processed if b[:1] == b'a'] == [
+                b'a0',
+                b'a1',
+                b'a2',
+            ]
+            assert [b for b in processed if b[:1] == b'b'] == [
+                b'b0',
+                b'b1',
+                b'b2',
+            ]
+            assert running[1] == 2
+            assert consuming_channel.acked[-1] == (6, True)
+            assert consuming_channel.nacked == [(7, False, True)]
+
+            with pytest.raises(ConsumerError):
+                await symbios.listen(task, partition=hash, lanes=0)
+
+        run_async(test)
+
+    def test_settlement(
+        self,
+        symbios: Symbios,
+        consuming_channel: MockConsumingChannel,
+        run_async: Callable,
+    ) -> None:
+        '''Test the negative acknowledgment of the failed messages.
+        '''
+
+        async def test() -> None:
+            async def task(symbios: Symbios, message: IncomingMessage):
+                if message.body == b'carotte':
+                    raise ValueError(message.body)
+
+            await symbios.listen(
+                task, queue=Queue('symbios_tests'), prefetch_count=10
+            )
+            await consuming_channel.deliver(b'lapin')
+
+            for redelivered in [False, True]:
+                with pytest.raises(ValueError):
+                    await consuming_channel.deliver(
+                        b'carotte', redelivered=redelivered
+                    )
+
+            assert consuming_channel.nacked == [
+                (2, False, True),
+                (3, False, False),
+            ]
+
+            await asyncio.sleep(0.05)
+
+            assert consuming_channel.acked == [(1, True)]
+
+        run_async(test)
+
+
+class TestPullConsumer:
+    '''The PullConsumer class tests.
+    '''
+
+    def test_consume(
+        self,
+        symbios: Symbios,
+        consuming_channel: MockConsumingChannel,
+        run_async: Callable,
+    ) -> None:
+        '''Test the iteration of the consumed messages.
+        '''
+
+        async def test() -> None:
+            bodies: List[bytes] = []
+
+            async with symbios.consume(
+                Queue('symbios_tests'), batch=3
+            ) as messages:
+                assert consuming_channel.qos['prefetch_count'] == 3
+
+                for body in [b'lapin', b'carotte', b'chou']:
+                    await consuming_channel.deliver(body)
+
+                async for message in messages:
+                    bodies.append(message.body)
+
+                    if message.body == b'carotte':
+                        await message.reject()
+
+                    if message.body == b'chou':
+                        break
+
+            await consuming_channel.deliver(b'navet')
+            await asyncio.sleep(0.05)
+
+            assert bodies == [b'lapin', b'carotte', b'chou']
+            assert consuming_channel.acked == [(3, True)]
+            assert consuming_channel.rejected == [(2, False)]
+            assert consuming_channel.nacked == [(4, False, True)]
+            assert consuming_channel.closed
+
+            with pytest.raises(ConsumerError):
+                symbios.consume(batch=0)
+
+        run_async(test)
+
+    def test_polling(
+        self,
+        symbios: Symbios,
+        consuming_channel: MockConsumingChannel,
+        run_async: Callable,
+    ) -> None:
+        '''Test the bulk fetching and the failure of the iteration.
+        '''
+
+        async def test() -> None:
+            consuming_channel.queued = [(b'lapin', Props())] * 3
+            remaining: List[int] = []
+
+            with pytest.raises(ValueError):
+                async with symbios.consume(
+                    Queue('symbios_tests'), batch=2, polling=0.01
+                ) as messages:
+                    async for message in messages:
+                        remaining.append(len(consuming_channel.queued))
+
+                        if message.delivery.delivery_tag == 3:
+                            asyncio.get_event_loop().call_later(
+                                0.03,
+                                consuming_channel.queued.append,
+                                (b'chou', Props()),
+                            )
+
+                        if message.body == b'chou':
+                            raise ValueError(message.body)
+
+            assert remaining == [1, 1, 0, 0]
+            assert not consuming_channel.consumer
+            assert consuming_channel.acked[-1] == (3, True)
+            assert consuming_channel.nacked == [(4, False, True)]
+            assert consuming_channel.closed
+
+        run_async(test)
+
+
+class TestBatchConsumer:
+    '''The BatchConsumer class tests.
+    '''
+
+    def test_own_channel(
+        self,
+        symbios: Symbios,
+        consuming_channel: MockConsumingChannel,
+        pooled_channel,
+        listener_handler: Callable,
+        run_async: Callable,
+    ) -> None:
+        '''Test that a consumer without QoS consumes on its own channel.
+        '''
+
+        async def test() -> None:
+            await symbios.listen(listener_handler, queue=Queue('symbios'))
+
+            assert consuming_channel.consumer is not None
+            assert consuming_channel.qos == {}
+            assert not hasattr(pooled_channel, 'consumer')
+
+        run_async(test)
+
+    def test_listen_batch(
+        self,
+        symbios: Symbios,
+        consuming_channel: MockConsumingChannel,
+        run_async: Callable,
+    ) -> None:
+        '''Test the batches by size and by time, and their multiple acks.
+        '''
+
+        async def test() -> None:
+            batches: List[List[bytes]] = []
+
+            async def task(symbios: Symbios, batch: List[IncomingMessage]):
+                batches.append([message.body for message in batch])
+
+            await symbios.listen_batch(
+                task, queue=Queue('symbios_tests'), max_batch=2, max_wait=0.01
+            )
+
+            assert consuming_channel.qos['prefetch_count'] == 4
+
+            for body in [b'a', b'b', b'c', b'd', b'e']:
+                await consuming_channel.deliver(body)
+
+            await asyncio.sleep(0.05)
+
+            assert batches == [[b'a', b'b'], [b'c', b'd'], [b'e']]
+            assert consuming_channel.acked == [
+                (2, True),
+                (4, True),
+                (5, True),
+            ]
+
+            with pytest.raises(ConsumerError):
+                await symbios.listen_batch(task, max_batch=0)
+
+        run_async(test)
+
+    def test_failure(
+        self,
+        symbios: Symbios,
+        consuming_channel: MockConsumingChannel,
+        run_async: Callable,
+    ) -> None:
+        '''Test the multiple nack of a failed batch.
+        '''
+
+        async def test() -> None:
+            async def task(symbios: Symbios, batch: List[IncomingMessage]):
+                raise ValueError(len(batch))
+
+            await symbios.listen_batch(
+                task, queue=Queue('symbios_tests'), max_batch=2
+            )
+            await consuming_channel.deliver(b'a', redelivered=True)
+
+            with pytest.raises(ValueError):
+                await consuming_channel.deliver(b'b')
+
+            await consuming_channel.deliver(b'c', redelivered=True)
+
+            with pytest.raises(ValueError):
+                await consuming_channel.deliver(b'd', redelivered=True)
+
+            assert consuming_channel.nacked == [
+                (2, True, True),
+                (4, True, False),
+            ]
+            assert not consuming_channel.acked
+
+        run_async(test)
@@ -6,19 +6,22 @@
 @note    0.1.0 Writing the first drafts.
 '''
 
-from typing import Any
+from typing import Any, List
 
 import pytest
 
 from symbios.utils import Props
 from symbios.message import SendingMessage, IncomingMessage
+from symbios.codec import CodecRegistry
 
 
 class TestSendingMessage:
     '''The SendingMessage tests class.
     '''
 
-    @pytest.mark.parametrize('body', ['Hello', {}, 42, 3.14])
+    @pytest.mark.parametrize(
+        'body', ['Hello', {}, 42, 3.14, b'Hello', memoryview(b'Hello')]
+    )
     def test_sending_message(self, body: Any) -> None:
         '''Test the SendingMessage class atrributes integrity.
         '''
@@ -58,3 +61,70 @@ class TestIncomingMessage:
             and message.body == body
         )
 
+
+    def test_view(self, delivered_message_model) -> None:
+        '''Test the zero-copy view of the body.
+        '''
+
+        body: bytes = b'Hello'
+        message: IncomingMessage = IncomingMessage(
+            delivered_message_model(True, Props(), body)
+        )
+
+        assert message.view.obj is body
+        assert message.view[1:3] == b'el'
+
+    def test_deserialized(self, delivered_message_model) -> None:
+        '''Test the lazy and cached deserialization of the body.
+        '''
+
+        calls: List[bytes] = []
+
+        class SpyCodecs(CodecRegistry):
+            def decode(self, body: bytes, content_type: str = None) -> Any:
+                calls.append(body)
+                return super().decode(body, content_type)
+
+        message: IncomingMessage = IncomingMessage(
+            delivered_message_model(
+                True, Props(content_type='application/json'), b'{"a": 1}'
+            ),
+            codecs=SpyCodecs(),
+        )
+
+        assert not calls
+        assert message.deserialized == {'a': 1}
+        assert message.deserialized == {'a': 1}
+        assert len(calls) == 1
+
+        message.body = b'[1]'
+
+        assert message.deserialized == [1]
+
+        message.deserialized = 'lapin'
+
+        assert message.deserialized == 'lapin'
+        assert IncomingMessage(
+            delivered_message_model(True, Props(), b'carotte')
+        ).deserialized == 'carotte'
+
+    def test_finalize(self, delivered_message_model, run_async) -> None:
+        '''Test that the finalizers run once.
+        '''
+
+        async def test() -> None:
+            calls: List[int] = []
+
+            async def finalizer() -> None:
+                calls.append(1)
+
+            message: IncomingMessage = IncomingMessage(
+                delivered_message_model(True, Props(), b'Hello')
+            )
+            message.finalize_with(finalizer)
+            await message.finalize()
+            await message.finalize()
+
+            assert calls == [1]
+
+        run_async(test)
@@ -0,0 +1,177 @@
+'''
+@desc    The adaptive prefetch test classes.
+@author  arthuchaut <arthuchaut@gmail.com>
+@version 0.1.0
+@date    2026-10-18
+@note    0.1.0 Writing the first drafts.
+'''
+
+import asyncio
+from typing import Callable, List
+
+import pytest
+
+from symbios import Symbios
+from symbios.queue import Queue
+from symbios.message import IncomingMessage
+from symbios.confirmation import ListenACK
+from symbios.prefetch import (
+    AdaptivePrefetch,
+    AdaptivePrefetchError,
+    PrefetchTuner,
+)
+from .mocks import MockConsumingChannel
+
+
+class TestPrefetchTuner:
+    '''The PrefetchTuner tests class.
+    '''
+
+    def test_tune(self, run_async: Callable) -> None:
+        '''Test the additive increase and the multiplicative decrease.
+        '''
+
+        async def test() -> None:
+            applied: List[int] = []
+
+            async def apply(prefetch: int) -> None:
+                applied.append(prefetch)
+
+            tuner: PrefetchTuner = PrefetchTuner(
+                AdaptivePrefetch(
+                    initial=4, max_prefetch=7, step=2, interval=60
+                ),
+                apply,
+            )
+            tuner.start()
+
+            for _ in range(4):
+                tuner.received()
+
+            tuner.stats.service_time = 0.01
+            await tuner.tune()
+
+            assert applied == [6]
+            assert tuner.stats.peak == 4
+
+            await tuner.tune()
+
+            assert applied == [6]
+
+            for _ in range(2):
+                tuner.received()
+
+            await tuner.tune()
+
+            assert applied == [6, 7]
+
+            tuner._completed = 10
+            tuner._window = asyncio.get_event_loop().time() - 10
+            tuner.stats.wait_time = 0.1
+            await tuner.tune()
+
+            assert applied == [6, 7, 3]
+            assert tuner.stats.rate == pytest.approx(1, rel=0.01)
+            assert tuner.stats.target == pytest.approx(0.11, rel=0.01)
+            assert (tuner.stats.increases, tuner.stats.decreases) == (2, 1)
+
+            tuner.policy.max_latency = 0.05
+            tuner.stats.wait_time = 0.0
+            tuner.stats.service_time = 0.1
+            tuner._completed = 1
+            tuner._window = asyncio.get_event_loop().time() - 10
+            await tuner.tune()
+
+            assert applied[-1] == 1
+            assert not tuner._timer is None
+
+            tuner.stop()
+
+        run_async(test)
+
+    def test_failure(self, run_async: Callable) -> None:
+        '''Test that the adjustments stop once the prefetch can't be set.
+        '''
+
+        async def test() -> None:
+            async def apply(prefetch: int) -> None:
+                raise ConnectionError()
+
+            tuner: PrefetchTuner = PrefetchTuner(
+                AdaptivePrefetch(interval=60), apply
+            )
+            tuner.start()
+            tuner.received()
+            await tuner.tune()
+
+            assert tuner._timer is None
+            assert tuner.stats.prefetch == 1
+
+            with pytest.raises(AdaptivePrefetchError):
+                AdaptivePrefetch(min_prefetch=2, max_prefetch=1)
+
+            with pytest.raises(AdaptivePrefetchError):
+                AdaptivePrefetch(decrease=1)
+
+        run_async(test)
+
+    def test_listen(
+        self,
+        symbios: Symbios,
+        consuming_channel: MockConsumingChannel,
+        run_async: Callable,
+    ) -> None:
+        '''Test the measurements of an adaptive consumer.
+        '''
+
+        async def test() -> None:
+            async def task(symbios: Symbios, message: IncomingMessage):
+                await asyncio.sleep(0.01)
+
+            ack: ListenACK = await symbios.listen(
+                task,
+                queue=Queue('symbios_tests'),
+                adaptive=AdaptivePrefetch(initial=8, interval=60),
+            )
+
+            assert consuming_channel.qos == {
+                'prefetch_count': 8,
+                'prefetch_size': 0,
+                'global_': True,
+            }
+
+            await consuming_channel.deliver(b'lapin')
+
+            assert ack.prefetch.in_flight == 0
+            assert ack.prefetch.peak == 1
+            assert ack.prefetch.service_time > 0.001
+
+            await symbios.listen(
+                task, queue=Queue('symbios_tests'), prefetch_count=4
+            )
+
+            assert 'global_' not in consuming_channel.qos
+
+            def partition(message: IncomingMessage) -> str:
+                raise KeyError('lapin')
+
+            ack = await symbios.listen(
+                task,
+                queue=Queue('symbios_tests'),
+                partition=partition,
+                adaptive=AdaptivePrefetch(interval=60),
+            )
+
+            with pytest.raises(KeyError):
+                await consuming_channel.deliver(b'lapin')
+
+            assert ack.prefetch.in_flight == 0
+
+            tuners = [c.tuner for c in symbios.consumers if c.tuner]
+
+            await symbios.close()
+
+            assert [t._timer for t in tuners] == [None, None]
+            assert consuming_channel.closed
+
+        run_async(test)
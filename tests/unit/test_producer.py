@@ -1,11 +1,13 @@
 from typing import Callable, List, Tuple
+from asyncio import Future
 
 import pytest
+from aiormq.exceptions import DeliveryError
 
 from symbios import Symbios
 from symbios.utils import Props
 from symbios.exchange import Exchange
-from symbios.producer import Producer
+from symbios.producer import Producer, ProducerError
 from symbios.message import SendingMessage
 from symbios.confirmation import EmitACK
 
@@ -90,6 +92,175 @@ class TestProducer:
 
         run_async(test)
 
+    def test_publish(
+        self, symbios: Symbios, pooled_channel, run_async: Callable
+    ) -> None:
+        '''Test the long-lived producer handle.
+        '''
+
+        async def test() -> None:
+            producer: Producer = symbios.producer(routing_key='symbios_test')
+
+            for body in ['lapin', {}, 'lapin']:
+                assert isinstance(await producer.publish(body), EmitACK)
+
+            assert producer._channel is pooled_channel
+            assert set(producer._templates.keys()) == {str, dict}
+
+            props: List[Props] = [
+                kwargs['properties'] for _, kwargs in pooled_channel.published
+            ]
+
+            assert props[0] is not props[2]
+            assert not producer.props.content_type
+            assert not pooled_channel in producer._link.publish_pool._idle
+
+            await producer.close()
+
+            assert producer._channel is None
+            assert pooled_channel in producer._link.publish_pool._idle
+
+            async with symbios.producer(routing_key='symbios_test') as held:
+                await held.publish('lapin')
+
+                assert held._channel is pooled_channel
+
+            assert held._channel is None
+
+            with pytest.raises(ProducerError):
+                symbios.producer()
+
+        run_async(test)
+
+    def test_publish_raw(
+        self, symbios: Symbios, pooled_channel, run_async: Callable
+    ) -> None:
+        '''Test that the raw buffers are published without being copied.
+        '''
+
+        async def test() -> None:
+            producer: Producer = symbios.producer(routing_key='symbios_test')
+            body: memoryview = memoryview(bytearray(b'lapin'))
+
+            assert isinstance(await producer.publish(body), EmitACK)
+
+            args, kwargs = pooled_channel.published[-1]
+
+            assert args[0] is body
+            assert (
+                kwargs['properties'].content_type
+                == 'application/octet-stream'
+            )
+
+        run_async(test)
+
+    def test_emit_deferred(
+        self, symbios: Symbios, pooled_channel, run_async: Callable
+    ) -> None:
+        '''Test the producer emitter without confirmation waiting.
+        '''
+
+        async def test() -> None:
+            producer: Producer = Producer(
+                symbios=symbios,
+                routing_key='symbios_test',
+                midd_library=symbios._midd_library,
+            )
+
+            produce_ok: Future = await producer.emit_deferred(
+                SendingMessage('lapin')
+            )
+
+            assert isinstance(await produce_ok, EmitACK)
+            assert symbios.stats[0].published == 1
+
+        run_async(test)
+
+    def test_emit_many(
+        self, symbios: Symbios, pooled_channel, run_async: Callable
+    ) -> None:
+        '''Test the producer bulk emitter.
+        '''
+
+        async def messages():
+            for body in ['lapin', 42, {}]:
+                yield SendingMessage(body)
+
+        async def test() -> None:
+            producer: Producer = Producer(
+                symbios=symbios,
+                routing_key='symbios_test',
+                midd_library=symbios._midd_library,
+            )
+
+            acks: List[EmitACK] = await producer.emit_many(
+                [SendingMessage('lapin'), SendingMessage({})]
+            )
+            acks += await producer.emit_many(messages())
+
+            assert len(acks) == 5
+            assert all(isinstance(ack, EmitACK) for ack in acks)
+
+            content_types: List[str] = [
+                kwargs['properties'].content_type
+                for _, kwargs in pooled_channel.published
+            ]
+
+            assert content_types == [
+                'text/plain',
+                'application/json',
+                'text/plain',
+                'text/plain',
+                'application/json',
+            ]
+
+            with pytest.raises(ProducerError):
+                await Producer(
+                    symbios=symbios, midd_library=symbios._midd_library
+                ).emit_many([SendingMessage('lapin')])
+
+        run_async(test)
+
+    def test_emit_many_nack(
+        self,
+        symbios: Symbios,
+        pooled_channel,
+        monkeypatch,
+        run_async: Callable,
+    ) -> None:
+        '''Test the producer bulk emitter when a message is refused.
+        '''
+
+        publish = pooled_channel.basic_publish
+
+        async def basic_publish(body, **kwargs):
+            if body == b'nack':
+                raise DeliveryError(None, None)
+
+            return await publish(body, **kwargs)
+
+        monkeypatch.setattr(pooled_channel, 'basic_publish', basic_publish)
+
+        async def test() -> None:
+            producer: Producer = Producer(
+                symbios=symbios,
+                routing_key='symbios_test',
+                midd_library=symbios._midd_library,
+            )
+
+            acks = await producer.emit_many(
+                [SendingMessage(body) for body in ['a', 'nack', 'b', 'c']]
+            )
+
+            assert [type(ack) for ack in acks] == [
+                EmitACK,
+                DeliveryError,
+                EmitACK,
+                EmitACK,
+            ]
+
+        run_async(test)
+
     @pytest.mark.parametrize('message, content_type', CONTENT_TYPE_DATASET)
     def test__determine_content_type(
         self, symbios: Symbios, message: SendingMessage, content_type: str
@@ -7,35 +7,140 @@
 '''
 
 import asyncio
+from typing import List
 
+import aiormq
 import pytest
 
 from symbios import Symbios
 from symbios.utils import Props
 from symbios.message import SendingMessage, IncomingMessage
-from symbios.rpc import RPC
+from symbios.rpc import RPC, RPCError, RPCRemoteError
+from symbios.cache import RPCCache
 from symbios.queue import Queue
-from symbios.timeout import Timeout
-from .mocks import MockSymbios
+from symbios.timeout import TimeoutElapsed
+from .mocks import MockConsumingChannel
+
+
+async def reply(chann: MockConsumingChannel, body: bytes) -> str:
+    '''Answer the next published request, like an RPC server.
+
+    Returns:
+        str: The queue the request asked to reply to.
+    '''
+
+    while not getattr(chann, 'published', None):
+        await asyncio.sleep(0)
+
+    args, kwargs = chann.published.pop(0)
+    props: Props = kwargs['properties']
+    await chann.deliver(body, Props(correlation_id=props.correlation_id))
+
+    return props.reply_to
+
+
+async def serve(
+    chann: MockConsumingChannel, rpc: RPC, skip: int = None
+) -> List[int]:
+    '''Answer the published requests, except the skip-th one, until
+    cancelled, recording the calls in flight at each request.
+    '''
+
+    in_flight: List[int] = []
+
+    try:
+        while True:
+            await asyncio.sleep(0.001)
+
+            for args, kwargs in getattr(chann, 'published', []):
+                in_flight.append(len(rpc._futures))
+
+                if args[0] != skip:
+                    await chann.deliver(
+                        args[0],
+                        Props(
+                            correlation_id=kwargs['properties'].correlation_id
+                        ),
+                    )
+
+            chann.published = []
+    except asyncio.CancelledError:
+        return in_flight
 
 
 class TestRPC:
-    def test_call(self, mocked_symbios, init_rpc_server, run_async) -> None:
+    def test_call(self, symbios, consuming_channel, run_async) -> None:
         '''Test the RPC.call method.
         '''
 
         async def test() -> None:
-            mocked_symbios.event_loop.create_task(
-                init_rpc_server(mocked_symbios)
-            )
+            rpc: RPC = RPC(symbios)
+
+            for _ in range(2):
+                server = symbios.event_loop.create_task(
+                    reply(consuming_channel, b'RPC_ACK')
+                )
+                res = await rpc.call(
+                    SendingMessage('HI'), routing_key='symbios_tests'
+                )
 
-            rpc: RPC = RPC(mocked_symbios)
+                assert res.body == b'RPC_ACK'
+                assert await server == RPC.DIRECT_REPLY_TO
 
+            assert rpc._futures == {}
+
+        run_async(test)
+
+    def test_call_fallback(
+        self, symbios, consuming_channel, monkeypatch, run_async
+    ) -> None:
+        '''Test the RPC.call method without the direct reply-to.
+        '''
+
+        async def test() -> None:
+            basic_consume = consuming_channel.basic_consume
+
+            async def refuse(queue, consumer, **kwargs):
+                if queue == RPC.DIRECT_REPLY_TO:
+                    raise aiormq.exceptions.ChannelClosed()
+
+                return await basic_consume(queue, consumer, **kwargs)
+
+            monkeypatch.setattr(consuming_channel, 'basic_consume', refuse)
+            rpc: RPC = RPC(symbios)
+
+            server = symbios.event_loop.create_task(
+                reply(consuming_channel, b'RPC_ACK')
+            )
             res = await rpc.call(
                 SendingMessage('HI'), routing_key='symbios_tests'
             )
 
-            assert res.body == 'RPC_ACK'
+            assert res.body == b'RPC_ACK'
+            assert await server == 'amq.gen-symbios'
+            assert not rpc.direct
+
+        run_async(test)
+
+    def test_call_timeout(
+        self, symbios, consuming_channel, run_async
+    ) -> None:
+        '''Test the RPC.call method when the reply is late.
+        '''
+
+        async def test() -> None:
+            rpc: RPC = RPC(symbios)
+
+            with pytest.raises(TimeoutElapsed):
+                await rpc.call(
+                    SendingMessage('HI'),
+                    routing_key='symbios_tests',
+                    timeout=0.01,
+                )
+
+            assert rpc._futures == {}
+            assert len(symbios.timers) == 0
+            await reply(consuming_channel, b'RPC_ACK')
 
         run_async(test)
 
@@ -51,7 +156,7 @@ class TestRPC:
 
             rpc: RPC = RPC(symbios)
 
-            rpc._futures[fake_uid] = (future, Timeout(symbios.event_loop))
+            rpc._futures[fake_uid] = (future, None)
 
             await rpc._on_reply(
                 symbios,
@@ -66,29 +171,327 @@ class TestRPC:
 
             assert future.result().body == 'ON_REPLY_OK'
 
+            with pytest.raises(RPCError):
+                await rpc._on_reply(
+                    symbios,
+                    IncomingMessage(
+                        delivered_message_model(
+                            None, Props(correlation_id=''), 'ON_REPLY_OK'
+                        )
+                    ),
+                )
+
         run_async(test)
 
     def test_multi_calls(
-        self, mocked_symbios, run_async, init_rpc_server
+        self, symbios, consuming_channel, run_async
     ) -> None:
         '''Test the RPC.multi_calls method.
         '''
 
         async def test() -> None:
-            mocked_symbios.event_loop.create_task(
-                init_rpc_server(mocked_symbios)
-            )
-            rpc: RPC = RPC(mocked_symbios)
+            rpc: RPC = RPC(symbios)
 
             task_queue = rpc.multi_calls(
                 [
                     rpc.call(SendingMessage('HI'), routing_key='symbios_tests')
-                    for _ in range(1)
+                    for _ in range(3)
                 ]
             )
 
+            for _ in task_queue:
+                await reply(consuming_channel, b'RPC_ACK')
+
             for task in task_queue:
                 await task
-                assert task.result().body == 'RPC_ACK'
+                assert task.result().body == b'RPC_ACK'
+
+        run_async(test)
+
+    def test_serve(
+        self, symbios, consuming_channel, pooled_channel, run_async
+    ) -> None:
+        '''Test the RPC.serve method.
+        '''
+
+        async def test() -> None:
+            async def handler(symbios, message) -> str:
+                if message.deserialized == 'FAIL':
+                    raise ValueError('Bad request')
+
+                if message.deserialized == 'NONE':
+                    return None
+
+                if message.deserialized == 'OBJECT':
+                    return object()
+
+                return message.deserialized + '_ACK'
+
+            rpc: RPC = RPC(symbios)
+
+            await rpc.serve(
+                handler, queue=Queue('symbios_tests'), concurrency=4
+            )
+            await consuming_channel.deliver(
+                b'SYN',
+                Props(
+                    content_type='text/plain',
+                    correlation_id='1',
+                    reply_to='amq.rabbitmq.reply-to.a',
+                ),
+            )
+            await consuming_channel.deliver(
+                b'FAIL',
+                Props(
+                    content_type='text/plain',
+                    correlation_id='2',
+                    reply_to='amq.rabbitmq.reply-to.b',
+                ),
+            )
+            for i, body in enumerate([b'NONE', b'OBJECT'], 3):
+                await consuming_channel.deliver(
+                    body,
+                    Props(
+                        content_type='text/plain',
+                        correlation_id=str(i),
+                        reply_to='amq.rabbitmq.reply-to.c',
+                    ),
+                )
+
+            await asyncio.sleep(0.05)
+
+            (
+                (ok, ok_kwargs),
+                (error, error_kwargs),
+                (empty, _),
+                (unserializable, unserializable_kwargs),
+            ) = pooled_channel.published
+
+            assert ok == (b'SYN_ACK',)
+            assert ok_kwargs['routing_key'] == 'amq.rabbitmq.reply-to.a'
+            assert ok_kwargs['properties'].correlation_id == '1'
+            assert ok_kwargs['properties'].headers is None
+            assert error == (b'Bad request',)
+            assert error_kwargs['routing_key'] == 'amq.rabbitmq.reply-to.b'
+            assert error_kwargs['properties'].headers == {
+                RPC.ERROR_HEADER: 'ValueError'
+            }
+            assert empty == (b'',)
+            assert unserializable_kwargs['properties'].correlation_id == '4'
+            assert unserializable_kwargs['properties'].headers == {
+                RPC.ERROR_HEADER: 'SerializerMiddlewareError'
+            }
+            assert consuming_channel.acked[-1] == (4, True)
+            assert consuming_channel.nacked == []
+            assert rpc._server_channel is pooled_channel
+
+            pooled_channel.published.clear()
+            await consuming_channel.deliver(
+                b'SYN', Props(content_type='text/plain', reply_to='')
+            )
+
+            with pytest.raises(ValueError):
+                await consuming_channel.deliver(
+                    b'FAIL', Props(content_type='text/plain')
+                )
+
+            assert pooled_channel.published == []
+            assert consuming_channel.nacked == [(6, False, True)]
+
+            await rpc.close()
+
+            assert rpc._server_channel is None
+            assert pooled_channel in rpc._server_link.publish_pool._idle
+
+        run_async(test)
+
+    def test__on_reply_error(
+        self, symbios: Symbios, delivered_message_model, run_async
+    ) -> None:
+        '''Test the RPC._on_reply method with an error reply.
+        '''
+
+        async def test() -> None:
+            future = symbios.event_loop.create_future()
+            rpc: RPC = RPC(symbios)
+            rpc._futures['1'] = (future, None)
+
+            await rpc._on_reply(
+                symbios,
+                IncomingMessage(
+                    delivered_message_model(
+                        None,
+                        Props(
+                            correlation_id='1',
+                            headers={RPC.ERROR_HEADER: 'ValueError'},
+                        ),
+                        b'Bad request',
+                    )
+                ),
+            )
+
+            with pytest.raises(RPCError, match='ValueError: Bad request'):
+                await future
+
+        run_async(test)
+
+    def test_gather(self, symbios, consuming_channel, run_async) -> None:
+        '''Test the RPC.gather method.
+        '''
+
+        async def test() -> None:
+            rpc: RPC = RPC(symbios)
+            server = symbios.event_loop.create_task(
+                serve(consuming_channel, rpc)
+            )
+
+            replies = {
+                index: reply.body
+                async for index, reply in rpc.gather(
+                    ((SendingMessage(i), 'shard') for i in range(20)),
+                    fanout=4,
+                )
+            }
+            server.cancel()
+
+            assert replies == {i: str(i).encode() for i in range(20)}
+            assert max(await server) <= 4
+            assert rpc._futures == {}
+
+        run_async(test)
+
+    def test_gather_deadline(
+        self, symbios, consuming_channel, run_async
+    ) -> None:
+        '''Test the RPC.gather method when some responses are late.
+        '''
+
+        async def test() -> None:
+            rpc: RPC = RPC(symbios)
+            server = symbios.event_loop.create_task(
+                serve(consuming_channel, rpc, skip=b'3')
+            )
+
+            replies = [
+                (index, reply)
+                async for index, reply in rpc.gather(
+                    [(SendingMessage(i), 'shard') for i in range(6)],
+                    timeout=0.05,
+                )
+            ]
+            timed_out = [
+                index
+                for index, reply in replies
+                if isinstance(reply, TimeoutElapsed)
+            ]
+
+            assert len(replies) == 6
+            assert timed_out == [3]
+
+            replies = [
+                index
+                async for index, reply in rpc.gather(
+                    [(SendingMessage(i), 'shard') for i in range(6)],
+                    deadline=0.05,
+                )
+            ]
+            server.cancel()
+            await asyncio.sleep(0)
+
+            assert sorted(replies) == [0, 1, 2, 4, 5]
+            assert rpc._futures == {}
+
+        run_async(test)
+
+    def test_call_cached(
+        self, symbios, consuming_channel, run_async
+    ) -> None:
+        '''Test the RPC.call method with a cache.
+        '''
+
+        async def test() -> None:
+            rpc: RPC = RPC(symbios, cache=RPCCache(negative_ttl=5))
+
+            server = symbios.event_loop.create_task(
+                reply(consuming_channel, b'RPC_ACK')
+            )
+            res = await rpc.call(SendingMessage('HI'), routing_key='users')
+            await server
+
+            assert await rpc.call(
+                SendingMessage('HI'), routing_key='users'
+            ) is res
+            assert consuming_channel.published == []
+
+            server = symbios.event_loop.create_task(
+                reply(consuming_channel, b'RPC_ACK')
+            )
+            await rpc.call(
+                SendingMessage('HI'), routing_key='users', cached=False
+            )
+            await server
+
+            async def fail() -> None:
+                while not getattr(consuming_channel, 'published', None):
+                    await asyncio.sleep(0)
+
+                args, kwargs = consuming_channel.published.pop(0)
+                await consuming_channel.deliver(
+                    b'Unknown user',
+                    Props(
+                        correlation_id=kwargs['properties'].correlation_id,
+                        headers={RPC.ERROR_HEADER: 'KeyError'},
+                    ),
+                )
+
+            server = symbios.event_loop.create_task(fail())
+
+            for _ in range(2):
+                with pytest.raises(RPCRemoteError, match='Unknown user'):
+                    await rpc.call(
+                        SendingMessage('NOBODY'), routing_key='users'
+                    )
+
+            await server
+            stats = rpc.cache.stats
+
+            assert (stats.hits, stats.negative_hits, stats.misses) == (2, 1, 2)
+
+        run_async(test)
+
+    def test_call_single_flight(
+        self, symbios, consuming_channel, run_async
+    ) -> None:
+        '''Test that the concurrent misses of a same call share
+        a single request, and that the content-type is part of the key.
+        '''
+
+        async def test() -> None:
+            rpc: RPC = RPC(symbios, cache=RPCCache())
+
+            server = symbios.event_loop.create_task(
+                reply(consuming_channel, b'RPC_ACK')
+            )
+            first, second = await asyncio.wait_for(
+                asyncio.gather(
+                    rpc.call(SendingMessage('HI'), routing_key='users'),
+                    rpc.call(SendingMessage('HI'), routing_key='users'),
+                ),
+                1,
+            )
+            await server
+
+            assert first is second
+            assert consuming_channel.published == []
+            assert rpc._flights == {}
+
+            server = symbios.event_loop.create_task(
+                reply(consuming_channel, b'RPC_ACK')
+            )
+            res = await rpc.call(SendingMessage(b'HI'), routing_key='users')
+            await server
+
+            assert res is not first
+            assert len(rpc.cache) == 2
 
         run_async(test)
@@ -0,0 +1,270 @@
+'''
+@desc    The chunked streaming test classes.
+@author  arthuchaut <arthuchaut@gmail.com>
+@version 0.1.0
+@date    2026-10-18
+@note    0.1.0 Writing the first drafts.
+'''
+
+import asyncio
+from io import BytesIO
+from typing import Any, AsyncIterator, Callable, Dict, List
+
+import pytest
+
+from symbios import Symbios
+from symbios.utils import Props
+from symbios.queue import Queue
+from symbios.message import IncomingMessage
+from symbios.middleware import MiddlewareABC, Event
+from symbios.stream import (
+    Stream,
+    ChunkStream,
+    StreamError,
+    StreamTimeoutError,
+)
+from .mocks import MockConsumingChannel
+
+
+def chunk_props(stream_id: str, seq: int, end: bool) -> Props:
+    return Props(
+        headers={
+            Stream.HEADER_ID: stream_id,
+            Stream.HEADER_SEQ: seq,
+            Stream.HEADER_END: end,
+        }
+    )
+
+
+class TestStreamEmitter:
+    '''The StreamEmitter tests class.
+    '''
+
+    def test_emit_stream(
+        self, symbios: Symbios, pooled_channel, run_async: Callable
+    ) -> None:
+        '''Test the chunking of the async iterators and the file objects.
+        '''
+
+        async def source() -> AsyncIterator[bytes]:
+            yield b'abcde'
+            yield bytearray(b'fg')
+
+        async def test() -> None:
+            stream_id: str = await symbios.emit_stream(
+                source(), routing_key='symbios_test', chunk_size=2
+            )
+            published: List[Any] = pooled_channel.published
+
+            assert [bytes(args[0]) for args, _ in published] == [
+                b'ab',
+                b'cd',
+                b'e',
+                b'fg',
+            ]
+
+            headers: List[Dict[str, Any]] = [
+                kwargs['properties'].headers for _, kwargs in published
+            ]
+
+            assert {h[Stream.HEADER_ID] for h in headers} == {stream_id}
+            assert [h[Stream.HEADER_SEQ] for h in headers] == [0, 1, 2, 3]
+            assert [h[Stream.HEADER_END] for h in headers] == [
+                False,
+                False,
+                False,
+                True,
+            ]
+
+            published.clear()
+            await symbios.emit_stream(
+                BytesIO(b'abc'), routing_key='symbios_test', chunk_size=2
+            )
+
+            assert [bytes(args[0]) for args, _ in published] == [b'ab', b'c']
+
+            published.clear()
+            await symbios.emit_stream(
+                BytesIO(b''), routing_key='symbios_test'
+            )
+
+            assert bytes(published[0][0][0]) == b''
+            assert published[0][1]['properties'].headers[Stream.HEADER_END]
+
+            with pytest.raises(StreamError):
+                await symbios.emit_stream(
+                    BytesIO(b''), routing_key='symbios_test', chunk_size=0
+                )
+
+        run_async(test)
+
+
+class TestStreamConsumer:
+    '''The StreamConsumer tests class.
+    '''
+
+    def test_listen_stream(
+        self,
+        symbios: Symbios,
+        consuming_channel: MockConsumingChannel,
+        run_async: Callable,
+    ) -> None:
+        '''Test the reassembly of the chunks delivered out of order.
+        '''
+
+        async def test() -> None:
+            received: List[bytes] = []
+            done: asyncio.Event = asyncio.Event()
+
+            async def handler(symbios: Symbios, stream: ChunkStream) -> None:
+                async for chunk in stream:
+                    received.append(chunk)
+
+                done.set()
+
+            await symbios.listen_stream(
+                handler, queue=Queue('symbios_test'), prefetch_count=4
+            )
+
+            assert consuming_channel.qos['prefetch_count'] == 4
+
+            for seq, body in [(0, b'ab'), (2, b'e'), (1, b'cd')]:
+                await consuming_channel.deliver(
+                    body, chunk_props('s1', seq, seq == 2)
+                )
+
+            await asyncio.wait_for(done.wait(), 1)
+
+            await asyncio.sleep(0.05)
+
+            assert b''.join(received) == b'abcde'
+            assert consuming_channel.acked == [(3, True)]
+            assert not consuming_channel.rejected
+
+        run_async(test)
+
+    def test_redelivery(
+        self,
+        symbios: Symbios,
+        consuming_channel: MockConsumingChannel,
+        run_async: Callable,
+    ) -> None:
+        '''Test that the redelivered chunks are settled and dropped.
+        '''
+
+        async def test() -> None:
+            received: List[bytes] = []
+            done: asyncio.Event = asyncio.Event()
+
+            async def handler(symbios: Symbios, stream: ChunkStream) -> None:
+                async for chunk in stream:
+                    received.append(chunk)
+
+                done.set()
+
+            await symbios.listen_stream(handler, queue=Queue('symbios_test'))
+
+            for _ in range(2):
+                await consuming_channel.deliver(
+                    b'ab', chunk_props('s1', 0, False), redelivered=True
+                )
+
+            await asyncio.sleep(0.05)
+            await consuming_channel.deliver(
+                b'ab', chunk_props('s1', 0, False), redelivered=True
+            )
+            await consuming_channel.deliver(b'cd', chunk_props('s1', 1, True))
+            await asyncio.wait_for(done.wait(), 1)
+
+            await asyncio.sleep(0.05)
+
+            assert received == [b'ab', b'cd']
+            assert consuming_channel.acked[-1] == (4, True)
+            assert not consuming_channel.rejected
+
+        run_async(test)
+
+    def test_chunk_timeout(
+        self,
+        symbios: Symbios,
+        consuming_channel: MockConsumingChannel,
+        run_async: Callable,
+    ) -> None:
+        '''Test the timeout of a missing chunk.
+        '''
+
+        async def test() -> None:
+            errors: List[Exception] = []
+            done: asyncio.Event = asyncio.Event()
+
+            async def handler(symbios: Symbios, stream: ChunkStream) -> None:
+                try:
+                    async for _ in stream:
+                        pass
+                except StreamTimeoutError as e:
+                    errors.append(e)
+
+                done.set()
+
+            await symbios.listen_stream(
+                handler, queue=Queue('symbios_test'), chunk_timeout=0.05
+            )
+            await consuming_channel.deliver(b'ab', chunk_props('s1', 0, False))
+            await consuming_channel.deliver(b'cd', chunk_props('s1', 2, True))
+            await asyncio.wait_for(done.wait(), 1)
+
+            await asyncio.sleep(0.05)
+
+            assert len(errors) == 1
+            assert consuming_channel.acked == [(1, True)]
+            assert consuming_channel.rejected == [(2, False)]
+
+            await consuming_channel.deliver(b'e', chunk_props('s1', 1, False))
+
+            assert consuming_channel.rejected[-1] == (3, False)
+
+        run_async(test)
+
+    def test_close(
+        self,
+        symbios: Symbios,
+        consuming_channel: MockConsumingChannel,
+        run_async: Callable,
+    ) -> None:
+        '''Test the settlement of a chunk whose middleware failed, and
+        the closing of the streams being read.
+        '''
+
+        class FailingMiddleware(MiddlewareABC):
+            async def execute(
+                self, symbios: Symbios, message: IncomingMessage
+            ) -> None:
+                if message.body == b'fail':
+                    raise ValueError('lapin')
+
+        async def test() -> None:
+            received: List[bytes] = []
+
+            async def handler(symbios: Symbios, stream: ChunkStream) -> None:
+                async for chunk in stream:
+                    received.append(chunk)
+
+            symbios.use(FailingMiddleware(Event.ON_LISTEN))
+            await symbios.listen_stream(
+                handler, queue=Queue('symbios_test'), chunk_timeout=60
+            )
+            await consuming_channel.deliver(b'ab', chunk_props('s1', 0, False))
+
+            with pytest.raises(ValueError):
+                await consuming_channel.deliver(
+                    b'fail', chunk_props('s1', 1, False)
+                )
+
+            assert consuming_channel.nacked == [(2, False, True)]
+
+            await asyncio.wait_for(symbios.close(), 1)
+
+            assert received == [b'ab']
+            assert consuming_channel.closed
+
+        run_async(test)
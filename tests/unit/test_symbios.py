@@ -17,7 +17,6 @@ from symbios.exchange import Exchange
 from symbios.middleware import MiddlewareABC, Event
 from symbios.confirmation import ExchangeACK, QueueACK, EmitACK, ListenACK
 from symbios.message import SendingMessage, IncomingMessage
-from middlewares.deserializer_middleware import DeserializerMiddleware
 from middlewares.serializer_middleware import SerializerMiddleware
 
 
@@ -34,10 +33,7 @@ class TestSymbios:
             SerializerMiddleware,
         )
 
-        assert isinstance(
-            symbios._midd_library._library[Event.ON_LISTEN][0],
-            DeserializerMiddleware,
-        )
+        assert not symbios._midd_library._library[Event.ON_LISTEN]
 
     def test_declare_queue(self, symbios: Symbios, run_async) -> None:
         '''Test the queue declaration.
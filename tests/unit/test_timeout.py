@@ -8,11 +8,12 @@
 
 import asyncio
 from asyncio import CancelledError
+from functools import partial
 from time import time
 
 import pytest
 
-from symbios.timeout import Timeout, TimeoutElapsed
+from symbios.timeout import Timeout, TimeoutElapsed, TimerWheel, Timer
 
 
 class TestTimeout:
@@ -68,3 +69,81 @@ class TestTimeout:
                 await timeout._task
 
         run_async(test)
+
+
+class TestTimerWheel:
+    '''The TimerWheel tests class.
+    '''
+
+    def test_schedule(self, run_async) -> None:
+        '''Test the TimerWheel.schedule method.
+        '''
+
+        async def test() -> None:
+            wheel: TimerWheel = TimerWheel(resolution=0.01, slots=8)
+            loop = asyncio.get_event_loop()
+            fired = []
+            start: float = loop.time()
+
+            for delay in (0.15, 0.02, 0.05):
+                wheel.schedule(
+                    delay, lambda delay=delay: fired.append(
+                        (delay, loop.time() - start)
+                    )
+                )
+
+            assert len(wheel) == 3
+            await asyncio.sleep(0.25)
+
+            assert [delay for delay, _ in fired] == [0.02, 0.05, 0.15]
+            assert all(
+                delay <= elapsed < delay + 0.05 for delay, elapsed in fired
+            )
+            assert len(wheel) == 0
+            assert wheel._handle is None
+
+        run_async(test)
+
+    def test_cancel(self, run_async) -> None:
+        '''Test the Timer.cancel method.
+        '''
+
+        async def test() -> None:
+            wheel: TimerWheel = TimerWheel()
+            fired = []
+
+            timer: Timer = wheel.schedule(0.02, lambda: fired.append(1))
+            wheel.schedule(0.03, lambda: fired.append(2))
+            timer.cancel()
+            timer.cancel()
+
+            assert not timer.pending
+            assert len(wheel) == 1
+            await asyncio.sleep(0.06)
+
+            assert fired == [2]
+
+        run_async(test)
+
+    def test_load(self, run_async) -> None:
+        '''Test the TimerWheel with many outstanding timers.
+        '''
+
+        async def test() -> None:
+            wheel: TimerWheel = TimerWheel()
+            fired = []
+            timers = [
+                wheel.schedule(0.01 * (i % 20), partial(fired.append, i))
+                for i in range(100000)
+            ]
+
+            for timer in timers[::2]:
+                timer.cancel()
+
+            assert len(wheel) == 50000
+            await asyncio.sleep(0.3)
+
+            assert sorted(fired) == list(range(1, 100000, 2))
+            assert len(wheel) == 0
+
+        run_async(test)
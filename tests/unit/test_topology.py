@@ -0,0 +1,105 @@
+'''
+@desc    The TopologyCache test class.
+@author  arthuchaut <arthuchaut@gmail.com>
+@version 0.1.0
+@date    2026-10-18
+@note    0.1.0 Writing the first drafts.
+'''
+
+from typing import Any, Callable
+
+from symbios.queue import Queue
+from symbios.exchange import Exchange
+from symbios.topology import TopologyCache
+from symbios.confirmation import QueueACK, ExchangeACK
+from .mocks import MockChannel
+
+
+class CountingChannel(MockChannel):
+    '''A MockChannel counting the declarations.
+    '''
+
+    def __init__(self):
+        self.declarations: int = 0
+
+    async def queue_declare(self, **kwargs) -> Any:
+        self.declarations += 1
+        return await super().queue_declare(**kwargs)
+
+    async def exchange_declare(self, **kwargs) -> Any:
+        self.declarations += 1
+        return await super().exchange_declare(**kwargs)
+
+
+class TestTopologyCache:
+    '''The TopologyCache tests class.
+    '''
+
+    def test_declare_exchange(self, run_async: Callable) -> None:
+        '''Test that an exchange is declared only once.
+        '''
+
+        async def test() -> None:
+            cache: TopologyCache = TopologyCache()
+            chann: CountingChannel = CountingChannel()
+
+            for _ in range(3):
+                ack: ExchangeACK = await cache.declare_exchange(
+                    chann, Exchange('symbios_tests')
+                )
+
+            assert isinstance(ack, ExchangeACK)
+            assert chann.declarations == 1
+
+            await cache.declare_exchange(
+                chann, Exchange('symbios_tests', durable=True)
+            )
+            await cache.declare_exchange(
+                chann, Exchange('symbios_tests'), force=True
+            )
+
+            assert chann.declarations == 3
+
+        run_async(test)
+
+    def test_declare_queue(self, run_async: Callable) -> None:
+        '''Test that a named queue is declared only once.
+        '''
+
+        async def test() -> None:
+            cache: TopologyCache = TopologyCache()
+            chann: CountingChannel = CountingChannel()
+
+            for _ in range(3):
+                ack: QueueACK = await cache.declare_queue(
+                    chann, Queue('symbios_tests')
+                )
+
+            assert isinstance(ack, QueueACK)
+            assert chann.declarations == 1
+
+            for _ in range(2):
+                await cache.declare_queue(chann, Queue())
+                await cache.declare_queue(
+                    chann, Queue('symbios_tests', auto_delete=True)
+                )
+
+            assert chann.declarations == 5
+
+        run_async(test)
+
+    def test_clear(self, run_async: Callable) -> None:
+        '''Test that the declarations are forgotten after a clear.
+        '''
+
+        async def test() -> None:
+            cache: TopologyCache = TopologyCache()
+            chann: CountingChannel = CountingChannel()
+
+            await cache.declare_queue(chann, Queue('symbios_tests'))
+            cache.clear()
+            await cache.declare_queue(chann, Queue('symbios_tests'))
+
+            assert chann.declarations == 2
+
+        run_async(test)